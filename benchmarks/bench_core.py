@@ -0,0 +1,50 @@
+"""
+Бенчмарк ядра симуляции без pygame: шагов GameCore.step() в миллисекунду.
+
+Игрок-автомат отпускает блок, когда тот почти над верхом башни,
+партии перезапускаются до набора нужного числа шагов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_core
+"""
+import sys
+import time
+
+from src.core import GameCore
+
+STEPS = 200_000
+ROUNDS = 5
+
+
+def run(steps=STEPS):
+    """(секунды, партии, поставлено блоков) на steps шагов."""
+    core = GameCore()
+    games = 0
+    blocks = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        if core.game_over:
+            games += 1
+            blocks += core.blocks_placed
+            core.new_game()
+        block = core.block
+        if block.state == "ready":
+            tower = core.tower
+            target = tower.xlist[-1] if tower.size else 200
+            if abs(block.x - target) < 4:
+                core.drop()
+        core.step()
+    return time.perf_counter() - start, games, blocks + core.blocks_placed
+
+
+def main():
+    best = min(run()[0] for _ in range(ROUNDS))
+    _, games, blocks = run()
+    print(f"steps: {STEPS}, games: {games}, blocks: {blocks}")
+    print(f"best of {ROUNDS}: {best * 1000:.1f} ms, {STEPS / (best * 1000):.0f} steps/ms, "
+          f"{best / STEPS * 1e6:.2f} us/step")
+    print("pygame imported:", "pygame" in sys.modules)
+
+
+if __name__ == "__main__":
+    main()
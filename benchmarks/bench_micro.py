@@ -0,0 +1,374 @@
+"""
+Микробенчмарки горячих функций по отдельности: прогрев, серии замеров,
+статистика на один вызов и сравнение с сохранённым baseline.
+
+Каждый бенчмарк — setup() -> call: setup готовит состояние (не замеряется)
+и заново вызывается перед каждой серией, call замеряется number раз подряд.
+Так функции, меняющие состояние (unbuild, частицы), в каждой серии
+начинают с одного и того же.
+
+Серии бенчмарков идут по кругу, сравнение с baseline — по min: лучшей серии
+из repeats. p50 на неизменном коде гулял до +93%, min (4 прогона против свежего
+baseline, одноядерная VM) — от -18% до +13%, и рост больше 15% — только
+у субмикросекундных функций, его отсекает min_delta_us (1 мкс).
+Бенчмарки диска (запись сохранения с fsync, холодная загрузка PNG) упираются
+в файловую систему, а не в процессор: они только печатаются, в проверку
+попадают лишь с --io-threshold.
+
+Сохранённый baseline — benchmarks/micro_baseline.json; машина, на которой
+он снят, записана в его meta. На другой машине снимите свой (--out).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_micro --out micro.json
+    python -m benchmarks.bench_micro --baseline benchmarks/micro_baseline.json
+    python -m benchmarks.bench_micro --bench Tower.draw --bench Block.swing
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from benchmarks.bench_scenarios import Env, machine_info
+from src.asset_loader import AssetLoader, AssetCache
+from src.constants import (
+    WHITE,
+    COMBO_TIER_3,
+    SLOWMO_MEGA_FACTOR,
+    MAX_ONSCREEN_BLOCKS,
+    BLOCK_WIDTH,
+    DEFAULT_PRESENT_MODE,
+)
+from src.block import Block
+from src.core import BlockCore
+from src.particles import ParticleSystem
+from src.presenter import PRESENT_MODES
+from src.save_manager import SaveManager
+from src.tower import Tower
+
+REPEATS = 30    # серий на бенчмарк
+WARMUP = 3      # серий прогрева (не считаются)
+PARTICLES = 200
+METRICS = ("min", "p50", "mean", "p95", "stdev")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "micro_baseline.json")
+
+
+def build_tower(sprites, blocks=MAX_ONSCREEN_BLOCKS, step=9):
+    """Башня из blocks блоков «лесенкой»: каждый следующий сдвинут на step px."""
+    tower = Tower(sprites)
+    core = BlockCore()
+    for i in range(blocks):
+        core.set_sprite_for_block_number(i)
+        core.xlast = 200 + (i % 4) * step
+        tower.build(core)
+    return tower
+
+
+def particle_system(seed=0, count=PARTICLES):
+    particles = ParticleSystem(seed=seed)
+    particles.add_explosion(270, 480, count=count // 2)
+    particles.add_build_particles(270, 480, count=count - count // 2)
+    return particles
+
+
+# ---------- БЕНЧМАРКИ ----------
+# имя -> (setup(env, number) -> call, number вызовов в серии)
+
+def bench_tower_draw(env, number):
+    """Башня не менялась: draw отдаёт закэшированный subsurface слоя."""
+    tower = build_tower(env.sprites)
+    tower.draw()
+    return tower.draw
+
+
+def bench_tower_draw_redraw(env, number):
+    """Полная перерисовка слоя (после trim / reset)."""
+    tower = build_tower(env.sprites)
+    tower.draw()
+
+    def call():
+        tower.reset()
+        tower.draw()
+
+    return call
+
+
+def bench_tower_unbuild(env, number):
+    """Верхний блок отваливается; на каждый вызов своя башня и свой блок."""
+    pairs = []
+    for _ in range(number):
+        tower = build_tower(env.sprites)
+        block = BlockCore()
+        block.y = tower.y - 40
+        pairs.append((tower, block))
+    pairs.reverse()
+    pop = pairs.pop
+
+    def call():
+        tower, block = pop()
+        tower.unbuild(block)
+
+    return call
+
+
+def bench_particles_update(env, number):
+    particles = particle_system()
+    return particles.update
+
+
+def bench_particles_draw(env, number):
+    particles = particle_system()
+    for _ in range(10):
+        particles.update()
+    virtual = env.virtual
+    return lambda: particles.draw(virtual)
+
+
+def bench_show_score(env, number):
+    """HUD со всем сразу: счёт, промахи, MEGA-комбо и индикатор слоу-мо."""
+    game = env.new_game()
+    game.score = 1234
+    game.misses = 2
+    game.combo = COMBO_TIER_3
+    game.combo_timer = 10 ** 6
+    game.activate_slowmo(duration=10 ** 6, factor=SLOWMO_MEGA_FACTOR)
+    game.show_score()
+    return game.show_score
+
+
+def bench_block_swing(env, number):
+    block = Block(env.sprites)
+    block.game_force *= 4
+    return block.swing
+
+
+def bench_block_collided(env, number):
+    tower = build_tower(env.sprites, blocks=3)
+    block = Block(env.sprites)
+    block.xlast = tower.xlist[-1] + BLOCK_WIDTH * 0.25
+    block.y = tower.y - 70
+    return lambda: block.collided(tower)
+
+
+def bench_tower_sprites(env, number):
+    """Повторная загрузка: спрайты уже в общем кэше."""
+    loader = AssetLoader()
+    loader.load_tower_sprites(1)
+    return lambda: loader.load_tower_sprites(1)
+
+
+def bench_tower_sprites_cold(env, number):
+    """Первая загрузка: чтение PNG, обрезка и smoothscale пяти спрайтов."""
+    loader = AssetLoader(cache=AssetCache())
+
+    def call():
+        loader.cache.clear()
+        loader.load_tower_sprites(1)
+
+    return call
+
+
+def bench_save_data(env, number):
+    """
+    Запись одного изменения (json, под flock, temp -> fsync -> rename).
+    Фоновый поток сам не пишет: интервал и порог заведомо не наступят.
+    """
+    manager = env.micro_save_manager
+
+    def call():
+        manager.add_coins(1)
+        manager.save_data()
+
+    return call
+
+
+def bench_present(env, number):
+    """Шаг вывода из main(): Presenter.present + display.update, кадр каждый раз «новый»."""
+    presenter = env.presenter
+    virtual = env.virtual
+    virtual.fill(WHITE)
+
+    def call():
+        if presenter.present(virtual, changed=True):
+            pygame.display.update()
+
+    return call
+
+
+BENCHMARKS = {
+    "Tower.draw": (bench_tower_draw, 5_000),
+    "Tower.draw[redraw]": (bench_tower_draw_redraw, 200),
+    "Tower.unbuild": (bench_tower_unbuild, 5_000),
+    "ParticleSystem.update": (bench_particles_update, 30),   # меньше жизни частицы
+    "ParticleSystem.draw": (bench_particles_draw, 50),
+    "Game.show_score": (bench_show_score, 500),
+    "Block.swing": (bench_block_swing, 20_000),
+    "Block.collided": (bench_block_collided, 20_000),
+    "AssetLoader.load_tower_sprites": (bench_tower_sprites, 20_000),
+    "AssetLoader.load_tower_sprites[cold]": (bench_tower_sprites_cold, 5),
+    "SaveManager.save_data": (bench_save_data, 20),
+    "present": (bench_present, 20),
+}
+
+# упираются в диск (fsync, чтение PNG): их время — это файловая система машины
+IO_BENCHMARKS = {"AssetLoader.load_tower_sprites[cold]", "SaveManager.save_data"}
+
+
+class MicroEnv(Env):
+    """Env сценариев + спрайты башни и отдельный SaveManager для save_data."""
+
+    def __init__(self, present_mode):
+        super().__init__(present_mode)
+        self.sprites = self.asset_loader.load_tower_sprites(1)
+        self.micro_save_manager = SaveManager(
+            save_file=os.path.join(self.tmp.name, "micro_save.json"),
+            flush_interval=10 ** 6, flush_max_pending=10 ** 9,
+        )
+
+    def close(self):
+        self.micro_save_manager.close()
+        super().close()
+
+
+# ---------- ЗАМЕР ----------
+def run_series(env, name, scale=1.0):
+    """Одна серия: время одного вызова, мкс."""
+    setup, number = BENCHMARKS[name]
+    number = max(1, int(number * scale))
+    call = setup(env, number)
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(number):
+        call()
+    return (clock() - start) / number * 1e6
+
+
+def run_benches(env, names, repeats=REPEATS, warmup=WARMUP, scale=1.0):
+    """
+    Серии всех бенчмарков по кругу: {имя: np.array длины repeats}, мкс на вызов.
+    Медленная полоса машины (троттлинг, соседи по VM) задевает по серии
+    каждого бенчмарка, а минимум по сериям остаётся честным.
+    """
+    samples = {name: np.zeros(repeats) for name in names}
+    for r in range(warmup + repeats):
+        for name in names:
+            value = run_series(env, name, scale)
+            if r >= warmup:
+                samples[name][r - warmup] = value
+    return samples
+
+
+def summarize(samples):
+    return {
+        "min": float(samples.min()),
+        "p50": float(np.percentile(samples, 50)),
+        "mean": float(samples.mean()),
+        "p95": float(np.percentile(samples, 95)),
+        "stdev": float(samples.std(ddof=1)) if samples.size > 1 else 0.0,
+    }
+
+
+def format_results(results):
+    lines = [f"{'benchmark':<37} " + " ".join(f"{m:>10}" for m in METRICS) + "  (us/call)"]
+    for name, s in results.items():
+        lines.append(f"{name:<37} " + " ".join(f"{s[m]:>10.2f}" for m in METRICS))
+    return "\n".join(lines)
+
+
+def compare(results, baseline, threshold, min_delta_us, metric="min", io_threshold=None):
+    """
+    Регрессии относительно baseline: metric вызова выросла больше чем на threshold
+    (доля) и больше чем на min_delta_us (наносекундные функции не флапают на шуме).
+    Бенчмарки диска (IO_BENCHMARKS) — со своим io_threshold; None — не проверяются.
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if base is None:
+            continue
+        limit = threshold
+        if name in IO_BENCHMARKS:
+            if io_threshold is None:
+                continue
+            limit = io_threshold
+        old = base[metric]
+        new = stats[metric]
+        if new > old * (1 + limit) and new - old > min_delta_us:
+            regressions.append((name, old, new))
+    return regressions
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bench", action="append", choices=sorted(BENCHMARKS),
+                        help="только эти бенчмарки (по умолчанию все)")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="серий замера")
+    parser.add_argument("--warmup", type=int, default=WARMUP, help="серий прогрева (не считаются)")
+    parser.add_argument("--scale", type=float, default=1.0, help="множитель вызовов в серии")
+    parser.add_argument("--present", choices=PRESENT_MODES, default=DEFAULT_PRESENT_MODE)
+    parser.add_argument("--out", help="записать результаты в JSON")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE,
+                        help="сравнить с JSON прошлого прогона (без пути — с сохранённым baseline)")
+    parser.add_argument("--metric", choices=("min", "p50", "mean", "p95"), default="min",
+                        help="по какой метрике сравнивать с baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="допустимый рост, доля (0.15 = 15%%)")
+    parser.add_argument("--io-threshold", type=float, default=None,
+                        help="допустимый рост для бенчмарков диска (по умолчанию они не проверяются)")
+    parser.add_argument("--min-delta-us", type=float, default=1.0, help="меньший рост не считается регрессией")
+    args = parser.parse_args()
+    if args.repeats < 2:
+        parser.error("--repeats: нужно хотя бы 2 серии")
+
+    env = MicroEnv(args.present)
+    names = args.bench or list(BENCHMARKS)
+    try:
+        samples = run_benches(env, names, args.repeats, args.warmup, args.scale)
+    finally:
+        env.close()
+    results = {name: summarize(samples[name]) for name in names}
+
+    print(format_results(results))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "sdl": ".".join(map(str, pygame.get_sdl_version())),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+            "present": args.present,
+            "repeats": args.repeats,
+            "warmup": args.warmup,
+            "scale": args.scale,
+            **machine_info(),
+        },
+        "benchmarks": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_us, args.metric,
+                              args.io_threshold)
+        for name, old, new in regressions:
+            print(f"REGRESSION {name} {args.metric}: {old:.2f} -> {new:.2f} us ({new / old - 1:+.0%})")
+        if args.io_threshold is None:
+            print("not checked (disk-bound): " + ", ".join(sorted(IO_BENCHMARKS & set(results))))
+        if regressions:
+            sys.exit(1)
+        print(f"baseline ok ({args.metric}, threshold {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
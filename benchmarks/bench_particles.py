@@ -0,0 +1,39 @@
+"""
+Бенчмарк ParticleSystem.update: среднее время одного шага при 200 / 2k / 20k частиц.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_particles
+"""
+import time
+
+from src.particles import ParticleSystem
+
+COUNTS = (200, 2_000, 20_000)
+STEPS = 30     # меньше жизни частицы (40 кадров), популяция не убывает
+ROUNDS = 20
+
+
+def bench_update(count, steps=STEPS, rounds=ROUNDS):
+    """Среднее время update() в микросекундах при count живых частицах."""
+    total = 0.0
+    for r in range(rounds):
+        particles = ParticleSystem(max_particles=count, seed=r)
+        particles.add_explosion(270, 480, count=count // 2)
+        particles.add_build_particles(270, 480, count=count - count // 2)
+
+        start = time.perf_counter()
+        for _ in range(steps):
+            particles.update()
+        total += time.perf_counter() - start
+    return total / (rounds * steps) * 1e6
+
+
+def main():
+    print(f"{'particles':>10} | {'update, us':>10} | {'ns/particle':>11}")
+    for count in COUNTS:
+        us = bench_update(count)
+        print(f"{count:>10} | {us:>10.1f} | {us * 1000 / count:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
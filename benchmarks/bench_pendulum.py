@@ -0,0 +1,57 @@
+"""
+Бенчмарк векторного маятника (src/pendulum.py) против скалярного BlockCore:
+время на пакет блоков и сверка результатов (x броска, исход, шаги падения).
+Расхождение больше X_TOLERANCE или хоть один другой исход — выход с кодом 1.
+Эталон и сверка — src/pendulum_reference.py (на них же tests/test_pendulum.py).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_pendulum
+"""
+import sys
+import time
+
+from src import pendulum
+from src.pendulum_reference import (
+    X_TOLERANCE,
+    make_inputs,
+    scalar_swing_and_drop,
+    mismatches,
+    matches,
+)
+
+COUNTS = (1_000, 10_000)
+ROUNDS = 3
+
+
+def timed(fn, *args, rounds=ROUNDS):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    print(f"{'blocks':>7} | {'scalar, ms':>10} | {'numpy, ms':>9} | {'speedup':>7} | "
+          f"{'max |dx|':>9} | {'landed':>6} | {'golden':>6} | {'fall':>4}")
+    ok = True
+    for count in COUNTS:
+        args = make_inputs(count)
+        t_scalar, ref = timed(scalar_swing_and_drop, *args, rounds=1)
+        t_numpy, got = timed(pendulum.swing_and_drop, *args)
+
+        dx, landed_diff, golden_diff, fall_diff = mismatches(ref, got)
+        ok = ok and matches(ref, got)
+        print(f"{count:>7} | {t_scalar * 1000:>10.1f} | {t_numpy * 1000:>9.1f} | "
+              f"{t_scalar / t_numpy:>6.0f}x | {dx:>9.2e} | {landed_diff:>6} | {golden_diff:>6} | {fall_diff:>4}")
+
+    if not ok:
+        print(f"MISMATCH: numpy kernel differs from BlockCore (tolerance {X_TOLERANCE:g} px)")
+        sys.exit(1)
+    print(f"match ok (tolerance {X_TOLERANCE:g} px)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Сценарные замеры кадра: настоящие Game / Shop / MainMenu / SettingsMenu рисуют
+в virtual_screen под SDL dummy-драйвером, время кадра делится на
+update (события и шаги логики), draw (отрисовка в virtual_screen) и
+present (Presenter.present — smoothscale в окно — и display.update).
+
+Сценарии детерминированы: фиксированный seed партии, dt = 1 / FPS на кадр,
+партии строит оракул из src/sim.py, сохранения — во временной папке.
+
+Каждый сценарий прогоняется runs раз с нуля, прогоны сценариев идут по кругу.
+Сравнение с baseline — по p50_min: лучшей из медиан прогонов (total).
+p95 одного прогона для проверки не годится: на неизменном коде он гуляет
+на +17..39%. Шум p50_min на неизменном коде (одноядерная VM, SDL dummy,
+4 прогона против свежего baseline): меню и магазин — до +7% (0.1 мс),
+игровые сценарии — от -20% до +3% (до ~1 мс). Регрессия — рост больше
+threshold И больше min_delta_ms (по умолчанию 15% и 0.25 мс).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_scenarios --out bench.json
+    python -m benchmarks.bench_scenarios --baseline bench.json --threshold 0.15
+    python -m benchmarks.bench_scenarios --scenario tower_30 --scenario game_over
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pygame
+
+from src.asset_loader import AssetLoader
+from src.constants import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    FPS,
+    WHITE,
+    COMBO_TIER_3,
+    SLOWMO_MEGA_DURATION,
+    SLOWMO_MEGA_FACTOR,
+    DEFAULT_PRESENT_MODE,
+)
+from src.game import Game
+from src.presenter import Presenter, PRESENT_MODES
+from src.replay import INPUT_SPACE
+from src.save_manager import SaveManager
+from src.shop import Shop
+from src.sim import OraclePolicy
+from src.ui import MainMenu, SettingsMenu
+
+FRAMES = 300
+WARMUP = 30
+RUNS = 5
+SEED = 1
+PHASES = ("update", "draw", "present", "total")
+DT = 1 / FPS
+
+
+class Env:
+    """Общие для сценариев объекты: экран, ассеты, временные сохранения."""
+
+    def __init__(self, present_mode):
+        pygame.init()
+        pygame.mixer.init()
+        self.virtual = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.presenter = Presenter(present_mode, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.asset_loader = AssetLoader()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.save_manager = SaveManager(save_file=os.path.join(self.tmp.name, "save_data.json"))
+        self.backgrounds = self.asset_loader.load_backgrounds()
+        self.sounds = self.asset_loader.load_sounds()
+
+    def new_game(self):
+        return Game(self.virtual, self.save_manager, self.asset_loader, sound_muted=True,
+                    seed=SEED, persist=False)
+
+    def close(self):
+        self.save_manager.close()
+        self.tmp.cleanup()
+        pygame.quit()
+
+
+def motion(pos):
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+
+
+def sweep_positions(frames, step=(7, 13), top=0):
+    """Курсор «змейкой» по всему экрану — каждое наведение и уход с кнопок."""
+    return [((i * step[0]) % SCREEN_WIDTH, top + (i * step[1]) % (SCREEN_HEIGHT - top))
+            for i in range(frames)]
+
+
+def autoplay(game, policy, until, max_steps=100_000):
+    """Играть оракулом шаг за шагом, пока until(game) не станет истинным."""
+    for _ in range(max_steps):
+        if until(game):
+            return
+        play_step(game, policy)
+    raise RuntimeError("сценарий не достиг нужного состояния")
+
+
+def play_step(game, policy):
+    if game.block.get_state() == "ready" and policy.should_drop(game):
+        game.apply_input(INPUT_SPACE)
+    game.update()
+
+
+def play_frame(game, policy):
+    """Кадр живой игры: решение оракула + advance(1 / FPS), как в main()."""
+    if game.block.get_state() == "ready" and policy.should_drop(game):
+        game.apply_input(INPUT_SPACE)
+    game.advance(DT)
+
+
+# ---------- СЦЕНАРИИ ----------
+# сценарий(env, frames) -> (update(i), draw(i)); всё, что до них, — подготовка без замера
+
+def scenario_menu_idle(env, frames):
+    menu = MainMenu(env.virtual, click_sound=env.sounds["click"])
+    background = env.backgrounds[0]
+    return (lambda i: pygame.event.pump()), (lambda i: menu.draw(background))
+
+
+def scenario_menu_hover(env, frames):
+    menu = MainMenu(env.virtual, click_sound=env.sounds["click"])
+    background = env.backgrounds[0]
+    positions = sweep_positions(frames)
+    return (lambda i: menu.handle_event(motion(positions[i]))), (lambda i: menu.draw(background))
+
+
+def scenario_settings_hover(env, frames):
+    settings = SettingsMenu(env.virtual, click_sound=env.sounds["click"], asset_loader=env.asset_loader)
+    background = env.backgrounds[0]
+    positions = sweep_positions(frames)
+    return (lambda i: settings.handle_event(motion(positions[i]))), (lambda i: settings.draw(background))
+
+
+def scenario_shop_hover(env, frames):
+    shop = Shop(env.virtual, env.save_manager, env.asset_loader, click_sound=env.sounds["click"])
+    background = env.backgrounds[1]
+    positions = sweep_positions(frames)
+    return (lambda i: shop.handle_event(motion(positions[i]))), (lambda i: shop.draw(background))
+
+
+def scenario_tower_30(env, frames):
+    """Живая игра после 30 поставленных блоков (фон уже прокручен, человечки летают)."""
+    game = env.new_game()
+    policy = OraclePolicy()
+    autoplay(game, policy, lambda g: g.blocks_placed >= 30)
+    return (lambda i: play_frame(game, policy)), (lambda i: game.draw())
+
+
+def scenario_mega_combo(env, frames):
+    """MEGA-комбо: слоу-мо не гаснет, в воздухе не меньше 200 частиц."""
+    game = env.new_game()
+    policy = OraclePolicy()
+    autoplay(game, policy, lambda g: g.blocks_placed >= 10)
+
+    def update(i):
+        game.combo = max(game.combo, COMBO_TIER_3)
+        game.combo_timer = 180
+        if not game.slowmo_active:
+            game.activate_slowmo(duration=SLOWMO_MEGA_DURATION, factor=SLOWMO_MEGA_FACTOR)
+        missing = 200 - len(game.particles)
+        if missing > 0:
+            tower = game.tower
+            game.particles.add_explosion(tower.xlist[-1] + tower.x + 48, tower.y, count=missing)
+        play_frame(game, policy)
+
+    return update, (lambda i: game.draw())
+
+
+def _collapsing_game(env):
+    """Башня из 8 блоков, верхний съехал за предел ширины — следующий шаг её роняет."""
+    game = env.new_game()
+    policy = OraclePolicy()
+    autoplay(game, policy, lambda g: g.blocks_placed >= 8 and g.block.get_state() == "ready")
+    game.tower.xlist[-1] = game.tower.xbase + 150
+    return game
+
+
+def scenario_collapse(env, frames):
+    """Падение башни: кадры игры после обрушения (без переключения на GAME OVER)."""
+    game = _collapsing_game(env)
+
+    def update(i):
+        game.update()
+        game.alpha = 1.0
+
+    return update, (lambda i: game.draw())
+
+
+def scenario_game_over(env, frames):
+    game = _collapsing_game(env)
+    game.update()
+    positions = sweep_positions(frames, top=300)
+    return ((lambda i: game.handle_game_over_input(motion(positions[i]))),
+            (lambda i: game.draw_game_over_screen()))
+
+
+# сценарии живой партии: main() выводит их кадры с changed=True, без сравнения кадров
+LIVE_GAME = {"tower_30", "mega_combo", "collapse"}
+
+SCENARIOS = {
+    "menu_idle": scenario_menu_idle,
+    "menu_hover": scenario_menu_hover,
+    "settings_hover": scenario_settings_hover,
+    "shop_hover": scenario_shop_hover,
+    "tower_30": scenario_tower_30,
+    "mega_combo": scenario_mega_combo,
+    "collapse": scenario_collapse,
+    "game_over": scenario_game_over,
+}
+
+
+# ---------- ЗАМЕР ----------
+def run_scenario(env, name, frames=FRAMES, warmup=WARMUP):
+    """Время фаз по кадрам, мс: {phase: np.array}."""
+    update, draw = SCENARIOS[name](env, frames + warmup)
+    virtual = env.virtual
+    presenter = env.presenter
+    presenter.last_frame = None
+    changed = name in LIVE_GAME
+    clock = time.perf_counter
+
+    times = np.zeros((frames, 3))
+    for i in range(frames + warmup):
+        t0 = clock()
+        update(i)
+        t1 = clock()
+        virtual.fill(WHITE)
+        draw(i)
+        t2 = clock()
+        if presenter.present(virtual, changed=changed):
+            pygame.display.update()
+        t3 = clock()
+        if i >= warmup:
+            times[i - warmup] = (t1 - t0, t2 - t1, t3 - t2)
+
+    times *= 1000
+    return {
+        "update": times[:, 0],
+        "draw": times[:, 1],
+        "present": times[:, 2],
+        "total": times.sum(axis=1),
+    }
+
+
+def summarize(runs):
+    """
+    Статистика фаз по всем кадрам всех прогонов + p50_min — лучшая
+    из медиан отдельных прогонов (по ней сравнение с baseline).
+    """
+    summary = {}
+    for phase in PHASES:
+        values = np.concatenate([run[phase] for run in runs])
+        summary[phase] = {
+            "mean": float(values.mean()),
+            "p50": float(np.percentile(values, 50)),
+            "p95": float(np.percentile(values, 95)),
+            "p99": float(np.percentile(values, 99)),
+            "p50_min": float(min(np.percentile(run[phase], 50) for run in runs)),
+        }
+    return summary
+
+
+def format_results(results):
+    lines = [f"{'scenario':<15} {'phase':<8} {'mean':>7} {'p50':>7} {'p95':>7} {'p99':>7} "
+             f"{'p50_min':>7}  (ms)"]
+    for name, phases in results.items():
+        for phase in PHASES:
+            s = phases[phase]
+            label = name if phase == PHASES[0] else ""
+            lines.append(f"{label:<15} {phase:<8} {s['mean']:>7.3f} {s['p50']:>7.3f} "
+                         f"{s['p95']:>7.3f} {s['p99']:>7.3f} {s['p50_min']:>7.3f}")
+    return "\n".join(lines)
+
+
+def machine_info():
+    """Где сняты замеры: в meta результатов, чтобы baseline не сравнивали с чужой машиной."""
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold, min_delta_ms, metric="p50_min"):
+    """
+    Регрессии относительно baseline: metric фазы total выросла больше чем на threshold
+    (доля) и больше чем на min_delta_ms (шум на быстрых кадрах не считаем).
+    Сценарии, которых (или метрики которых) нет в baseline, пропускаются.
+    """
+    regressions = []
+    for name, phases in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None or metric not in base["total"]:
+            continue
+        old = base["total"][metric]
+        new = phases["total"][metric]
+        if new > old * (1 + threshold) and new - old > min_delta_ms:
+            regressions.append((name, metric, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="только эти сценарии (по умолчанию все)")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="кадров в замере")
+    parser.add_argument("--warmup", type=int, default=WARMUP, help="кадров прогрева (не считаются)")
+    parser.add_argument("--runs", type=int, default=RUNS, help="прогонов каждого сценария")
+    parser.add_argument("--present", choices=PRESENT_MODES, default=DEFAULT_PRESENT_MODE)
+    parser.add_argument("--out", help="записать результаты в JSON")
+    parser.add_argument("--baseline", help="сравнить с JSON прошлого прогона")
+    parser.add_argument("--metric", choices=("p50_min", "p50", "mean", "p95"), default="p50_min",
+                        help="по какой метрике total сравнивать с baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="допустимый рост, доля (0.15 = 15%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.25, help="меньший рост не считается регрессией")
+    args = parser.parse_args()
+    if args.runs < 1:
+        parser.error("--runs: нужен хотя бы один прогон")
+
+    env = Env(args.present)
+    names = args.scenario or list(SCENARIOS)
+    runs = {name: [] for name in names}
+    try:
+        # прогоны по кругу: медленная полоса машины (троттлинг, соседи по VM)
+        # задевает один прогон каждого сценария, а не все прогоны одного
+        for _ in range(args.runs):
+            for name in names:
+                runs[name].append(run_scenario(env, name, args.frames, args.warmup))
+    finally:
+        env.close()
+    results = {name: summarize(runs[name]) for name in names}
+
+    print(format_results(results))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "sdl": ".".join(map(str, pygame.get_sdl_version())),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+            "present": args.present,
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "runs": args.runs,
+            **machine_info(),
+        },
+        "scenarios": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms, args.metric)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name} total {metric}: {old:.3f} -> {new:.3f} ms ({new / old - 1:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"baseline ok (threshold {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
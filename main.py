@@ -1,3 +1,6 @@
+import argparse
+import time
+
 import pygame
 from pygame import mixer
 
@@ -7,25 +10,181 @@ from src.shop import Shop
 from src.particles import ParticleSystem 
 from src.ui import MainMenu, SettingsMenu
 from src.save_manager import SaveManager
+from src.history import GameHistory
 from src.asset_loader import AssetLoader
-from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, WHITE, MUSIC_PATH
+from src.presenter import Presenter, PRESENT_MODES
+from src.profiler import profiler, STAGES
+from src.alloc_stats import AllocTracker, GcPolicy
+from src.quality import governor, QUALITY_NAMES
+from src.dirty_rects import DirtyTracker, union_rect
+from src.sim import POLICIES, run as run_headless
+from src.replay import Replay, play_headless
+from src.constants import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    FPS,
+    WHITE,
+    MUSIC_PATH,
+    DEFAULT_PRESENT_MODE,
+    HEADLESS_FIXED_PERIOD,
+    HEADLESS_NOISE_SIGMA,
+    QUALITY_PINNED,
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tower Bloxx")
+    parser.add_argument(
+        "--present",
+        choices=PRESENT_MODES,
+        default=DEFAULT_PRESENT_MODE,
+        help="вывод кадра в окно: smooth / nearest / integer / native",
+    )
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="перерисовывать и выводить только изменившиеся области",
+    )
+    parser.add_argument(
+        "--debug-dirty",
+        action="store_true",
+        help="обводить грязные области (переключается F2)",
+    )
+
+    prof = parser.add_argument_group("profiling", "F3 — панель времени кадра, F4 — CSV")
+    prof.add_argument("--alloc-stats", action="store_true",
+                      help="считать новые Surface, память (tracemalloc) и паузы GC по этапам кадра")
+    prof.add_argument("--gc-policy", action="store_true",
+                      help="gc.freeze() после загрузки, полная сборка только вне игры")
+    prof.add_argument("--quality", choices=("auto",) + QUALITY_NAMES,
+                      default=QUALITY_PINNED or "auto",
+                      help="качество эффектов: auto — по времени кадра, иначе фиксированный уровень")
+
+    rec = parser.add_argument_group("replay", "запись и воспроизведение партий")
+    rec.add_argument("--record", metavar="FILE",
+                     help="писать реплей каждой партии в FILE (последняя партия перезаписывает)")
+    rec.add_argument("--replay", metavar="FILE",
+                     help="воспроизвести реплей (с --headless-sim — без окна)")
+    rec.add_argument("--uncapped", action="store_true",
+                     help="реплей без ограничения FPS (для замеров)")
+
+    sim = parser.add_argument_group("headless", "партии без окна, звука и сохранений")
+    sim.add_argument(
+        "--headless-sim",
+        action="store_true",
+        help="прогнать партии автоматом с максимальной скоростью и вывести статистику",
+    )
+    sim.add_argument("--policy", choices=sorted(POLICIES), default="noisy",
+                     help="когда отпускать блок: fixed / noisy / oracle")
+    sim.add_argument("--games", type=int, default=100, help="число партий")
+    sim.add_argument("--seed", type=int, default=0, help="seed для политики noisy")
+    sim.add_argument("--period", type=int, default=HEADLESS_FIXED_PERIOD,
+                     help="fixed: шагов от появления блока до броска")
+    sim.add_argument("--noise", type=float, default=HEADLESS_NOISE_SIGMA,
+                     help="noisy: разброс прицела, px")
+    return parser.parse_args(argv)
+
+
+def headless_sim(args):
+    policy_args = {}
+    if args.policy == "fixed":
+        policy_args["period"] = args.period
+    elif args.policy == "noisy":
+        policy_args["sigma"] = args.noise
+    run_headless(args.policy, args.games, seed=args.seed, **policy_args)
+
+
+
+def replay_session(args):
+    """Воспроизвести реплей шаг в шаг: один шаг симуляции на кадр."""
+    replay = Replay.load(args.replay)
+
+    if args.headless_sim:
+        start = time.perf_counter()
+        core = play_headless(replay)
+        elapsed = time.perf_counter() - start
+        status = "OK" if core.score == replay.score else "MISMATCH"
+        print(f"replay: {replay.frames} steps, {len(replay)} inputs, {elapsed * 1000:.1f} ms")
+        print(f"score: {core.score} (recorded {replay.score}) {status}")
+        return
+
+    pygame.init()
+    pygame.mixer.init()
+    virtual_screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    presenter = Presenter(args.present, (SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Tower Bloxx — replay")
+
+    asset_loader = AssetLoader()
+    save_manager = SaveManager()
+    game = Game(
+        virtual_screen,
+        save_manager,
+        asset_loader,
+        seed=replay.seed,
+        tower_id=replay.tower_id,
+        persist=False,
+    )
+    inputs = replay.schedule()
+    clock = pygame.time.Clock()
+    fps_cap = 0 if args.uncapped else FPS
+
+    start = time.perf_counter()
+    running = True
+    while running and game.frame < replay.frames and not game.game_over:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (
+                event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE
+            ):
+                running = False
+
+        for code in inputs.get(game.frame, ()):
+            game.apply_input(code)
+        game.update()
+
+        virtual_screen.fill(WHITE)
+        game.draw()
+        if presenter.present(virtual_screen, changed=True):
+            pygame.display.update()
+        clock.tick(fps_cap)
+    elapsed = time.perf_counter() - start
+
+    status = "OK" if game.score == replay.score else "MISMATCH"
+    if game.frame < replay.frames and not game.game_over:
+        status = "STOPPED"
+    print(f"replay: {game.frame}/{replay.frames} frames in {elapsed:.2f} s "
+          f"({game.frame / elapsed:.0f} fps)")
+    print(f"score: {game.score} (recorded {replay.score}) {status}")
+
+    save_manager.close()
+    pygame.quit()
 
 
+def main(argv=None):
+    args = parse_args(argv)
+    if args.replay:
+        replay_session(args)
+        return
+    if args.headless_sim:
+        headless_sim(args)
+        return
 
-def main():
     pygame.init()
     pygame.mixer.pre_init(44100, 16, 2, 4096)
     pygame.mixer.init()
 
+    alloc_tracker = None
+    if args.alloc_stats:
+        # до создания первых Surface и шрифтов: подменяются их конструкторы
+        alloc_tracker = AllocTracker(STAGES)
+        alloc_tracker.install()
+        profiler.attach(alloc_tracker)
 
     VIRTUAL_WIDTH = SCREEN_WIDTH
     VIRTUAL_HEIGHT = SCREEN_HEIGHT
     virtual_screen = pygame.Surface((VIRTUAL_WIDTH, VIRTUAL_HEIGHT))
 
 
-    WINDOW_WIDTH = 480
-    WINDOW_HEIGHT = 853
-    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    presenter = Presenter(args.present, (VIRTUAL_WIDTH, VIRTUAL_HEIGHT))
     pygame.display.set_caption("Tower Bloxx")
 
 
@@ -49,8 +208,14 @@ def main():
 
 
     save_manager = SaveManager()
+    history = GameHistory()
     clock = pygame.time.Clock()
 
+    gc_policy = None
+    if args.gc_policy:
+        gc_policy = GcPolicy()
+        gc_policy.freeze()
+
 
     music_muted = False
     sfx_muted = False
@@ -65,17 +230,39 @@ def main():
 
 
     main_menu = MainMenu(virtual_screen, click_sound=click_sound)
-    settings_menu = SettingsMenu(virtual_screen, click_sound=click_sound)
+    settings_menu = SettingsMenu(
+        virtual_screen, click_sound=click_sound, asset_loader=asset_loader
+    )
 
 
     current_bg_index = 0
 
+    dirty_tracker = None
+    if args.dirty_rects:
+        dirty_tracker = DirtyTracker(virtual_screen.get_rect(), debug=args.debug_dirty)
+
+    governor.pin(None if args.quality == "auto" else args.quality)
+    presenter.set_fast_scale(not governor.level.smooth_present)
+    profiler.attach_quality(governor)
+
 
     running = True
+    game_running = False
 
 
     while running:
-        clock.tick(FPS)
+        profiler.begin_frame(state)
+        dt = clock.tick(FPS) / 1000
+        profiler.mark("wait")
+
+        # 🎚️ прошлый кадр был игровым — по нему подстраиваем качество эффектов
+        if game_running and governor.observe(profiler.last_work_ms):
+            print(governor.format_change(governor.changes[-1]))
+            presenter.set_fast_scale(not governor.level.smooth_present)
+            if game:
+                game.apply_quality(governor.level)
+            if dirty_tracker:
+                dirty_tracker.invalidate()
 
 
         for event in pygame.event.get():
@@ -83,17 +270,15 @@ def main():
                 running = False
 
 
-            if event.type in (
-                pygame.MOUSEMOTION,
-                pygame.MOUSEBUTTONDOWN,
-                pygame.MOUSEBUTTONUP,
-            ):
-                real_x, real_y = event.pos
-                virtual_x = int(real_x * VIRTUAL_WIDTH / WINDOW_WIDTH)
-                virtual_y = int(real_y * VIRTUAL_HEIGHT / WINDOW_HEIGHT)
-                event.pos = (virtual_x, virtual_y)
-                if hasattr(event, "dict"):
-                    event.dict["pos"] = (virtual_x, virtual_y)
+            presenter.remap_event(event)
+
+            if dirty_tracker and event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                dirty_tracker.toggle_debug()
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                print(f"📊 Профиль кадров сохранён: {profiler.export_csv()}")
 
 
             if state == "menu":
@@ -105,6 +290,8 @@ def main():
                         save_manager,
                         asset_loader,
                         sound_muted=sfx_muted,
+                        history=history,
+                        record_to=args.record,
                     )
                 elif action == "shop":
                     previous_state = "menu"
@@ -123,6 +310,7 @@ def main():
                     settings_menu.sfx_muted = sfx_muted
                     settings_menu.bg_index = current_bg_index
                     settings_menu.music_index = current_track_index
+                    settings_menu.present_mode = presenter.mode
                 elif action == "quit":
                     running = False
 
@@ -149,6 +337,11 @@ def main():
                                 s.set_volume(0.0 if sfx_muted else 1.0)
                     elif action == "toggle_bg":
                         current_bg_index = settings_menu.bg_index
+                    elif action == "present_mode":
+                        presenter.set_mode(presenter.next_mode())
+                        settings_menu.present_mode = presenter.mode
+                        if dirty_tracker:
+                            dirty_tracker.invalidate()
                     elif action == "music_change":
                         current_track_index = settings_menu.music_index
                         pygame.mixer.music.load(
@@ -163,14 +356,18 @@ def main():
                     if not game.game_over:
                         action = game.handle_game_events(event)
                         if action == "confirm_exit":
+                            game.save_replay()
                             state = "menu"
                             game = None
                         elif action == "restart_game":
+                            game.save_replay()
                             game = Game(
                                 virtual_screen,
                                 save_manager,
                                 asset_loader,
                                 sound_muted=sfx_muted,
+                                history=history,
+                                record_to=args.record,
                             )
                     else:
                         result = game.handle_game_over_input(event)
@@ -194,6 +391,8 @@ def main():
                                 save_manager,
                                 asset_loader,
                                 sound_muted=sfx_muted,
+                                history=history,
+                                record_to=args.record,
                             )
 
 
@@ -213,8 +412,37 @@ def main():
                                 state = "menu"
 
 
-        virtual_screen.fill(WHITE)
+        profiler.mark("events")
 
+        game_running = state == "game" and game and not game.game_over
+        if gc_policy:
+            gc_policy.set_gameplay(bool(game_running))
+        if game_running:
+            game.advance(dt)
+        profiler.mark("update")
+
+        # dirty-rect: None — рисуем весь кадр, [] — ничего не изменилось
+        dirty = None
+        if dirty_tracker:
+            dirty_tracker.begin_frame((state, current_bg_index, game, shop, game_running))
+            if state == "menu":
+                main_menu.track_dirty(dirty_tracker)
+            elif state == "settings":
+                settings_menu.track_dirty(dirty_tracker)
+            elif state == "game" and game:
+                game.track_dirty(dirty_tracker)
+            elif state == "shop" and shop:
+                shop.track_dirty(dirty_tracker)
+            profiler.track_dirty(dirty_tracker)
+            dirty = dirty_tracker.collect()
+            profiler.mark("dirty")
+            if dirty == []:
+                continue
+            if dirty:
+                virtual_screen.set_clip(union_rect(dirty))
+
+        virtual_screen.fill(WHITE)
+        profiler.mark("draw")
 
         if state == "menu":
             main_menu.draw(backgrounds[current_bg_index])
@@ -222,23 +450,40 @@ def main():
             settings_menu.draw(backgrounds[current_bg_index])
         elif state == "game":
             if game:
-                if not game.game_over:
-                    game.update()
+                if game_running:
                     game.draw()
                 else:
                     game.draw_game_over_screen()
         elif state == "shop":
             if shop:
                 shop.draw(backgrounds[current_bg_index])
-
-
-        scaled = pygame.transform.smoothscale(
-            virtual_screen, (WINDOW_WIDTH, WINDOW_HEIGHT)
-        )
-        screen.blit(scaled, (0, 0))
-        pygame.display.update()
-
-
+        profiler.mark("draw")
+
+        profiler.draw(virtual_screen)
+        profiler.mark("profiler")
+
+
+        if dirty is None:
+            presented = presenter.present(virtual_screen, changed=bool(game_running))
+            profiler.mark("present")
+            if presented:
+                pygame.display.update()
+        else:
+            virtual_screen.set_clip(None)
+            dirty_tracker.draw_debug(virtual_screen, dirty)
+            window_rects = presenter.present_rects(virtual_screen, dirty)
+            profiler.mark("present")
+            pygame.display.update(window_rects)
+        profiler.mark("display")
+
+
+    if game and not game.game_over:
+        game.save_replay()
+    save_manager.close()
+    history.close()
+    if alloc_tracker:
+        print(alloc_tracker.format_report(profiler.recent_rows()))
+        alloc_tracker.uninstall()
     pygame.quit()
 
 
@@ -0,0 +1,278 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+import pygame
+
+from src.constants import (
+    PROFILER_HISTORY,
+    ALLOC_TOP_SITES,
+    GC_DEFERRED_THRESHOLD2,
+)
+
+
+# функции pygame, которые возвращают новый Surface; dest — аргумент «рисовать сюда»
+# (с ним новый Surface не создаётся). Surface.copy / convert / subsurface — методы
+# встроенного типа, их не подменить, поэтому они не считаются.
+SURFACE_FACTORIES = (
+    (pygame.transform, "rotate", None),
+    (pygame.transform, "rotozoom", None),
+    (pygame.transform, "flip", None),
+    (pygame.transform, "scale", "dest_surface"),
+    (pygame.transform, "smoothscale", "dest_surface"),
+    (pygame.image, "load", None),
+)
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _call_site(depth=2):
+    """'src/file.py:line function' вызывающего кода."""
+    frame = sys._getframe(depth)
+    path = os.path.relpath(frame.f_code.co_filename, _ROOT)
+    return f"{path}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+class AllocTracker:
+    """
+    Режим --alloc-stats: новые Surface по местам вызова, прирост памяти Python
+    (tracemalloc) и паузы сборщика мусора — по кадрам и этапам профайлера.
+
+    Подключается к FrameProfiler (profiler.attach): на каждой отметке этапа
+    прирост счётчиков с прошлой отметки записывается этому этапу. Вне кадров
+    (загрузка ассетов и т.п.) Surface считаются только по местам вызова.
+
+    tracemalloc замедляет игру в разы — это режим отладки, не для замеров FPS.
+    """
+
+    def __init__(self, stages, history=PROFILER_HISTORY):
+        self.stages = stages
+        self.history = history
+        self.surfaces = np.zeros((history, len(stages)), dtype=np.int32)  # новых Surface
+        self.alloc = np.zeros((history, len(stages)))                      # прирост памяти, КБ
+        self.gc_count = np.zeros(history, dtype=np.int32)
+        self.gc_ms = np.zeros(history)
+        self.gc_max_gen = np.full(history, -1, dtype=np.int8)
+
+        self.sites = Counter()        # место вызова -> Surface за всё время
+        self.frame_sites = Counter()  # то же, только внутри кадров
+        self.frames = 0
+
+        self.created = 0              # Surface всего (счётчик для отметок)
+        self.in_frame = False
+        self.last_created = 0
+        self.last_traced = 0
+        self.current_surfaces = [0] * len(stages)
+        self.current_alloc = [0.0] * len(stages)
+
+        self.gc_start = None
+        self.gc_pauses = []           # (generation, ms, собрано, во время кадра)
+        self.frame_gc = [0, 0.0, -1]  # число, мс, старшее поколение — в текущем кадре
+
+        self.originals = []
+        self.installed = False
+
+    # ---------- ПОДМЕНА ----------
+    def install(self):
+        """Подменить конструкторы Surface, включить tracemalloc и колбэк gc."""
+        if self.installed:
+            return
+        tracker = self
+
+        class CountingSurface(pygame.Surface):
+            def __init__(self, *args, **kwargs):
+                tracker._created(_call_site())
+                super().__init__(*args, **kwargs)
+
+        class CountingFont(pygame.font.Font):
+            def render(self, *args, **kwargs):
+                tracker._created(_call_site())
+                return super().render(*args, **kwargs)
+
+        self._patch(pygame, "Surface", CountingSurface)
+        self._patch(pygame.font, "Font", CountingFont)
+        for module, name, dest in SURFACE_FACTORIES:
+            self._patch(module, name, self._counting(getattr(module, name), dest))
+
+        tracemalloc.start()
+        gc.callbacks.append(self._gc_callback)
+        self.installed = True
+
+    def uninstall(self):
+        if not self.installed:
+            return
+        for module, name, original in reversed(self.originals):
+            setattr(module, name, original)
+        self.originals = []
+        gc.callbacks.remove(self._gc_callback)
+        tracemalloc.stop()
+        self.installed = False
+
+    def _patch(self, module, name, replacement):
+        self.originals.append((module, name, getattr(module, name)))
+        setattr(module, name, replacement)
+
+    def _counting(self, func, dest):
+        tracker = self
+
+        def wrapper(*args, **kwargs):
+            # scale(surface, size, dest) — пишет в готовый Surface, новых нет
+            if dest is None or (len(args) < 3 and kwargs.get(dest) is None):
+                tracker._created(_call_site())
+            return func(*args, **kwargs)
+
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    def _created(self, site):
+        self.created += 1
+        self.sites[site] += 1
+        if self.in_frame:
+            self.frame_sites[site] += 1
+
+    def _gc_callback(self, phase, info):
+        if phase == "start":
+            self.gc_start = time.perf_counter()
+            return
+        if self.gc_start is None:
+            return
+        ms = (time.perf_counter() - self.gc_start) * 1000
+        self.gc_start = None
+        generation = info["generation"]
+        self.gc_pauses.append((generation, ms, info["collected"], self.in_frame))
+        if self.in_frame:
+            self.frame_gc[0] += 1
+            self.frame_gc[1] += ms
+            self.frame_gc[2] = max(self.frame_gc[2], generation)
+
+    # ---------- КАДРЫ (вызывает FrameProfiler) ----------
+    def begin_frame(self):
+        self.in_frame = True
+        self.current_surfaces = [0] * len(self.stages)
+        self.current_alloc = [0.0] * len(self.stages)
+        self.frame_gc = [0, 0.0, -1]
+        self.last_created = self.created
+        self.last_traced = tracemalloc.get_traced_memory()[0]
+
+    def mark(self, index):
+        traced = tracemalloc.get_traced_memory()[0]
+        self.current_surfaces[index] += self.created - self.last_created
+        self.current_alloc[index] += (traced - self.last_traced) / 1024
+        self.last_created = self.created
+        self.last_traced = traced
+
+    def commit(self, row):
+        self.surfaces[row] = self.current_surfaces
+        self.alloc[row] = self.current_alloc
+        self.gc_count[row], self.gc_ms[row], self.gc_max_gen[row] = self.frame_gc
+        self.frames += 1
+
+    # ---------- ВЫВОД ----------
+    def summary(self, rows):
+        """Короткая строка для панели F3 по кадрам rows."""
+        if rows.size == 0:
+            return ""
+        surfaces = self.surfaces[rows].sum(axis=1)
+        alloc = self.alloc[rows].sum(axis=1)
+        gc_ms = self.gc_ms[rows]
+        return (f"Surface/кадр {surfaces.mean():.1f} (макс {surfaces.max()})   "
+                f"КБ/кадр {alloc.mean():+.1f}   GC {int(self.gc_count[rows].sum())} "
+                f"(макс {gc_ms.max():.2f} мс)")
+
+    def csv_header(self):
+        return (["surfaces", "alloc_kb", "gc_count", "gc_ms", "gc_gen"]
+                + [f"surfaces_{name}" for name in self.stages]
+                + [f"alloc_kb_{name}" for name in self.stages])
+
+    def csv_row(self, row):
+        return ([int(self.surfaces[row].sum()), f"{self.alloc[row].sum():.1f}",
+                 int(self.gc_count[row]), f"{self.gc_ms[row]:.3f}", int(self.gc_max_gen[row])]
+                + [int(v) for v in self.surfaces[row]]
+                + [f"{v:.1f}" for v in self.alloc[row]])
+
+    def format_report(self, rows):
+        """Отчёт при выходе: места создания Surface, этапы, паузы GC."""
+        lines = [f"--- alloc-stats: {self.frames} кадров, в отчёте последние {rows.size} ---"]
+        frames = max(self.frames, 1)
+
+        lines.append(f"Surface в кадрах по местам вызова (всего {sum(self.frame_sites.values())}):")
+        for site, count in self.frame_sites.most_common(ALLOC_TOP_SITES):
+            lines.append(f"  {count / frames:8.2f}/кадр  {count:>8}  {site}")
+        lines.append(f"Surface вне кадров (загрузка): {self.created - sum(self.frame_sites.values())}")
+
+        if rows.size:
+            surfaces = self.surfaces[rows].mean(axis=0)
+            alloc = self.alloc[rows].mean(axis=0)
+            lines.append(f"{'этап':<12} {'Surface/кадр':>12} {'КБ/кадр':>9}")
+            for i, name in enumerate(self.stages):
+                if surfaces[i] or abs(alloc[i]) >= 0.05:
+                    lines.append(f"{name:<12} {surfaces[i]:>12.2f} {alloc[i]:>+9.1f}")
+
+        if self.gc_pauses:
+            lines.append("GC:   поколение  сборок  в кадре  сумма мс  макс мс  собрано")
+            for generation in range(3):
+                pauses = [p for p in self.gc_pauses if p[0] == generation]
+                if not pauses:
+                    continue
+                ms = [p[1] for p in pauses]
+                lines.append(f"      {generation:>9}  {len(pauses):>6}  {sum(p[3] for p in pauses):>7}  "
+                             f"{sum(ms):>8.2f}  {max(ms):>7.2f}  {sum(p[2] for p in pauses):>7}")
+        else:
+            lines.append("GC: сборок не было")
+        return "\n".join(lines)
+
+
+class GcPolicy:
+    """
+    Режим --gc-policy: меньше пауз сборщика во время игры.
+
+    freeze() — после загрузки ассетов: всё загруженное уходит в «вечное»
+    поколение, и полные сборки его больше не обходят.
+    set_gameplay(True) — старшее поколение автоматически не собирается
+    (порог поколения 2 заведомо не достигается), при выходе из игры
+    (меню, GAME OVER, магазин) — обычные пороги и одна полная сборка сразу.
+    """
+
+    def __init__(self, deferred_threshold2=GC_DEFERRED_THRESHOLD2):
+        self.deferred_threshold2 = deferred_threshold2
+        self.gameplay = False
+        self.saved_threshold = None
+        self.frozen = 0
+        self.deferred_collections = 0
+        self.last_collect_ms = 0.0
+
+    def freeze(self):
+        gc.collect()
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+
+    def set_gameplay(self, playing):
+        if playing == self.gameplay:
+            return
+        self.gameplay = playing
+        if playing:
+            self.saved_threshold = gc.get_threshold()
+            threshold0, threshold1, _ = self.saved_threshold
+            gc.set_threshold(threshold0, threshold1, self.deferred_threshold2)
+            return
+
+        if self.saved_threshold is not None:
+            gc.set_threshold(*self.saved_threshold)
+        start = time.perf_counter()
+        gc.collect(2)
+        self.last_collect_ms = (time.perf_counter() - start) * 1000
+        self.deferred_collections += 1
+
+    def stats(self):
+        return {
+            "frozen": self.frozen,
+            "gameplay": self.gameplay,
+            "threshold": gc.get_threshold(),
+            "deferred_collections": self.deferred_collections,
+            "last_collect_ms": self.last_collect_ms,
+        }
@@ -1,4 +1,6 @@
 import os
+from collections import OrderedDict
+
 import pygame
 from pygame import mixer
 
@@ -9,17 +11,115 @@ from src.constants import (
     BLOCK_HEIGHT,
     UI_PATH,
     SFX_PATH,
+    CRANE_PATH,
+    ASSET_CACHE_BUDGET,
 )
 
 
+def surface_nbytes(surface):
+    """Сколько байт пикселей занимает Surface."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def sound_nbytes(sound):
+    """Оценка размера декодированного звука в байтах."""
+    init = mixer.get_init()
+    if not init:
+        return 0
+    frequency, size, channels = init
+    return int(sound.get_length() * frequency * channels * (abs(size) // 8))
+
+
+class AssetCache:
+    """
+    Общий для процесса кэш ассетов: ключ -> (значение, размер в байтах).
+    При превышении бюджета выбрасываются давно не использованные записи (LRU).
+    Выброшенные объекты остаются валидными у тех, кто их уже получил.
+    """
+
+    def __init__(self, budget_bytes=ASSET_CACHE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, factory, sizeof):
+        """Вернуть значение по ключу, при промахе создать через factory()."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        value = factory()
+        nbytes = sizeof(value)
+        self.entries[key] = (value, nbytes)
+        self.bytes_used += nbytes
+        self._evict()
+        return value
+
+    def _evict(self):
+        # самую свежую запись не трогаем, даже если она одна больше бюджета
+        while self.bytes_used > self.budget_bytes and len(self.entries) > 1:
+            _, (_, nbytes) = self.entries.popitem(last=False)
+            self.bytes_used -= nbytes
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.bytes_used,
+            "budget": self.budget_bytes,
+        }
+
+
+# один кэш на весь процесс: Game, Shop, меню и т.д. получают одни и те же объекты
+shared_cache = AssetCache()
+
+
 class AssetLoader:
-    def __init__(self):
-        pass
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else shared_cache
+
+    def stats(self):
+        """Счётчики кэша: hits / misses / evictions / bytes."""
+        return self.cache.stats()
+
+    # ---------- КАРТИНКИ ----------
+    def load_image(self, path, alpha=True, size=None):
+        """
+        Картинка из кэша. alpha=False -> convert() для непрозрачных фонов,
+        size=(w, h) -> один раз smoothscale при загрузке.
+        """
+        def factory():
+            img = pygame.image.load(path)
+            img = img.convert_alpha() if alpha else img.convert()
+            if size is not None:
+                img = pygame.transform.smoothscale(img, size)
+            return img
+
+        key = ("image", path, alpha, size)
+        return self.cache.get(key, factory, surface_nbytes)
 
     def load_icon(self):
         """Иконка окна игры."""
-        icon = pygame.image.load(f"{UI_PATH}icon.png").convert_alpha()
-        return icon
+        return self.load_image(f"{UI_PATH}icon.png")
+
+    def load_crane(self):
+        """Кран и верёвка с крюком."""
+        crane = self.load_image(f"{CRANE_PATH}crane.png")
+        rope_hook = self.load_image(f"{CRANE_PATH}rope_with_hook.png")
+        return crane, rope_hook
 
     # ---------- ФОНЫ ----------
     def load_backgrounds(self):
@@ -30,13 +130,20 @@ class AssetLoader:
             "bg_shop_1.png",  # тёмный фон вторым
         ]
         for name in names:
-            img = pygame.image.load(f"{ASSETS_PATH}bg/{name}").convert()
+            img = self.load_image(f"{ASSETS_PATH}bg/{name}", alpha=False)
             backgrounds.append(img)
         return backgrounds
 
     # ---------- ЗВУКИ ----------
+    def load_sound(self, path):
+        """Декодированный mixer.Sound из кэша."""
+        return self.cache.get(("sound", path), lambda: mixer.Sound(path), sound_nbytes)
+
     def load_sounds(self):
-        """Загружает все звуки игры."""
+        """
+        Загружает все звуки игры.
+        Словарь каждый раз новый, но объекты Sound общие для всех вызовов.
+        """
         sounds = {}
         sound_files = {
             'build': 'sfx_build.wav',
@@ -47,7 +154,7 @@ class AssetLoader:
             'error': 'sfx_error.mp3',
             'coin': 'sfx_coin.mp3',
         }
-        
+
         # 🎙️ ГОЛОСОВЫЕ ФРАЗЫ
         phrase_files = {
             'start': 'start.mp3',
@@ -63,14 +170,14 @@ class AssetLoader:
         # Загрузка обычных звуков из SFX_PATH
         for name, file in sound_files.items():
             try:
-                sounds[name] = mixer.Sound(f"{SFX_PATH}{file}")
+                sounds[name] = self.load_sound(f"{SFX_PATH}{file}")
             except pygame.error as e:
                 print(f"❌ Не удалось загрузить звук {file}: {e}")
-        
+
         # 🎙️ ЗАГРУЗКА ФРАЗ из assets/phrases/
         for name, file in phrase_files.items():
             try:
-                sounds[name] = mixer.Sound(f"{ASSETS_PATH}phrases/{file}")
+                sounds[name] = self.load_sound(f"{ASSETS_PATH}phrases/{file}")
             except pygame.error as e:
                 print(f"❌ Не удалось загрузить фразу {file}: {e}")
 
@@ -79,10 +186,18 @@ class AssetLoader:
     # ---------- СПРАЙТЫ БАШЕН ----------
     def load_tower_sprites(self, tower_id):
         """
-        Загружает спрайты одной башни по её id.
+        Загружает спрайты одной башни по её id (из кэша, если уже грузили).
         Исходный спрайт 96x48, полезная текстура ~72x48 (по 12px слева/справа пустота),
         вырезаем 72x48 и растягиваем в блок 72x72.
         """
+        return self.cache.get(
+            ("tower", tower_id),
+            lambda: self._build_tower_sprites(tower_id),
+            lambda sprites: surface_nbytes(sprites["bot"])
+            + sum(surface_nbytes(s) for s in sprites["mid"]),
+        )
+
+    def _build_tower_sprites(self, tower_id):
         base_path = f"{TOWERS_PATH}tower_{tower_id}/"
 
         def crop_and_scale(img: pygame.Surface) -> pygame.Surface:
@@ -95,7 +210,7 @@ class AssetLoader:
             )
             return scaled
 
-        # bot
+        # bot (сырые картинки не кэшируем: нужен только результат обрезки)
         bot_raw = pygame.image.load(
             base_path + f"tower_{tower_id}_bot.png"
         ).convert_alpha()
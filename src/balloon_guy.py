@@ -1,21 +1,25 @@
 import pygame
 import random
 from src.constants import ASSETS_PATH, SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+from src.asset_loader import AssetLoader
 
 
 class BalloonGuy(pygame.sprite.Sprite):
-    def __init__(self, person_id, start_x, speed_y, start_delay_frames=0):
+    def __init__(self, person_id, start_x, speed_y, start_delay_frames=0, asset_loader=None, rng=None):
         super().__init__()
 
+        # свой генератор у партии — для воспроизводимых реплеев
+        self.rng = rng or random
+
+        asset_loader = asset_loader or AssetLoader()
         self.frames = []
         base_path = f"{ASSETS_PATH}people/person_{person_id}/"
         target_size = (50, 100)
 
         for i in range(4):
-            img = pygame.image.load(
-                base_path + f"person_{person_id}_{i}.png"
-            ).convert_alpha()
-            img = pygame.transform.smoothscale(img, target_size)
+            img = asset_loader.load_image(
+                base_path + f"person_{person_id}_{i}.png", size=target_size
+            )
             self.frames.append(img)
 
         self.person_id = person_id
@@ -40,15 +44,15 @@ class BalloonGuy(pygame.sprite.Sprite):
     def reset_flight(self):
         """Новый вылет: слегка сместить по X и задать случайную задержку."""
         # небольшое хаотичное смещение по X (+-40px, но не выходим за экран)
-        shift = random.randint(-40, 40)
+        shift = self.rng.randint(-40, 40)
         new_x = max(20, min(SCREEN_WIDTH - 20, self.base_x + shift))
         self.rect.centerx = new_x
 
         # стартуем чуть ниже экрана
-        self.rect.top = SCREEN_HEIGHT + random.randint(40, 120)
+        self.rect.top = SCREEN_HEIGHT + self.rng.randint(40, 120)
 
         # новая задержка 0..2 секунд
-        self.start_delay = random.randint(0, 2 * FPS)
+        self.start_delay = self.rng.randint(0, 2 * FPS)
         self.age = 0
 
     def update(self):
@@ -72,3 +76,9 @@ class BalloonGuy(pygame.sprite.Sprite):
             self.anim_counter = 0
             self.frame_index = (self.frame_index + 1) % len(self.frames)
             self.image = self.frames[self.frame_index]
+
+    def track_dirty(self, tracker, visible=True):
+        if not visible:
+            tracker.track(self, None, None)
+            return
+        tracker.track(self, self.image, self.rect)
@@ -1,7 +1,25 @@
 # -------- Экран --------
 SCREEN_WIDTH = 540
 SCREEN_HEIGHT = 960
-FPS = 60
+FPS = 60  # ограничение частоты отрисовки
+
+# -------- Симуляция --------
+SIM_HZ = 60         # шагов логики в секунду, не зависит от FPS (все "кадровые" константы — в шагах)
+SIM_MAX_STEPS = 5   # шагов за кадр максимум: после долгого кадра догоняем не дальше этого
+
+# -------- Headless-прогоны (--headless-sim) --------
+HEADLESS_MAX_GAME_STEPS = SIM_HZ * 600  # партия дольше 10 минут игрового времени обрывается
+HEADLESS_FIXED_PERIOD = 44              # fixed: отпускать блок через столько шагов после появления (лучший по свипу)
+HEADLESS_NOISE_SIGMA = 12.0             # noisy: разброс прицела, px
+
+# -------- Окно --------
+WINDOW_WIDTH = 480
+WINDOW_HEIGHT = 853
+DEFAULT_PRESENT_MODE = "smooth"  # smooth / nearest / integer / native
+
+# -------- Dirty-rect отрисовка --------
+DIRTY_MAX_RECTS = 24     # больше областей — сливаем в одну
+DIRTY_FULL_RATIO = 0.6   # грязно больше 60% экрана — рисуем кадр целиком
 
 # -------- Размеры блока --------
 BLOCK_WIDTH = 96
@@ -29,7 +47,15 @@ HOOK_ATTACH_OFFSET_Y = 30
 GRAVITY = 0.4
 INITIAL_FORCE = -0.0015
 FORCE_ACCELERATION = 1.015  # +1.5% за блок (можно 1.01-1.03)
-COLLAPSE_THRESHOLD = 0.5
+COLLAPSE_THRESHOLD = 0.5  # верхний блок съехал больше чем на полблока — башня падает
+
+# -------- Частицы --------
+MAX_PARTICLES = 1000      # было 200, для праздничных взрывов
+PARTICLE_GRAVITY = 0.12
+PARTICLE_DRAG = 0.96
+PARTICLE_MAX_RADIUS = 8            # радиусы в атласе частиц: 1..8
+PARTICLE_ALPHA_BUCKETS = 16        # уровней прозрачности в атласе
+PARTICLE_ADDITIVE_EXPLOSIONS = True  # аддитивное смешивание для взрывов
 
 # -------- Шатание башни --------
 WOBBLE_SPEED = 0.5
@@ -38,6 +64,7 @@ WOBBLE_LIMIT = 10
 # -------- Ограничения --------
 MAX_MISSES = 3
 MAX_ONSCREEN_BLOCKS = 8
+TOWER_LAYER_WIDTH = 800  # ширина кэшированного слоя башни
 
 # -------- Цвета --------
 BLACK = (0, 0, 0)
@@ -55,6 +82,47 @@ UI_PATH     = ASSETS_PATH + "ui/"
 SFX_PATH    = ASSETS_PATH + "sfx/"
 CRANE_PATH  = ASSETS_PATH + "crane/"
 
+# -------- Сохранения --------
+SAVE_WRITE_BEHIND = True      # писать сохранение в фоновом потоке, а не на каждое изменение
+SAVE_FLUSH_INTERVAL = 2.0     # секунд от первого изменения до записи
+SAVE_FLUSH_MAX_PENDING = 50   # столько изменений подряд — пишем сразу
+SAVE_BACKEND = "json"         # "json" — весь файл целиком, "journal" — журнал изменений + снимок
+SAVE_JOURNAL_COMPACT_RECORDS = 500  # записей журнала до сжатия в снимок
+HISTORY_DB_PATH = DATA_PATH + "history.sqlite3"  # история партий (SQLite)
+
+# -------- Кэш поворотов --------
+ROTATION_STEP_DEG = 0.25                   # шаг квантования угла
+ROTATION_CACHE_BUDGET = 96 * 1024 * 1024   # байт; полный размах верёвки при 0.25° ~60 МБ
+
+# -------- Шрифты --------
+DEFAULT_FONT = "freesansbold.ttf"
+TEXT_CACHE_MAX_ENTRIES = 256  # отрисованных строк в кэше текста
+
+# -------- Оверлеи --------
+OVERLAY_TINT_CACHE_ENTRIES = 8  # полноэкранных тонировок (по одной на значение альфы)
+OVERLAY_FADE_FRAMES = 0         # кадров на появление/исчезание подсказок, 0 — сразу
+
+# -------- Профайлер кадра (F3 — показать, F4 — сохранить CSV) --------
+PROFILER_HISTORY = 600        # кадров в памяти (10 с при 60 FPS) — для перцентилей и CSV
+PROFILER_GRAPH_HEIGHT = 100   # px графика
+PROFILER_GRAPH_MS = 2000 / FPS  # верх графика — два бюджета кадра
+PROFILER_TEXT_INTERVAL = 15   # кадров между обновлениями цифр на панели
+ALLOC_TOP_SITES = 15          # --alloc-stats: мест создания Surface в отчёте
+GC_DEFERRED_THRESHOLD2 = 1_000_000  # --gc-policy: порог поколения 2 во время игры (не достигается)
+
+# -------- Адаптивное качество (src/quality.py) --------
+QUALITY_PINNED = None          # "high" / "medium" / "low" / "minimal" — без подстройки, None — авто
+QUALITY_WINDOW = 60            # кадров игры в одном окне оценки
+QUALITY_PERCENTILE = 90        # по какому перцентилю работы кадра судим об окне
+QUALITY_DOWNGRADE_RATIO = 0.9  # окно выше 90% бюджета кадра — ступенью ниже
+QUALITY_UPGRADE_RATIO = 0.5    # ниже 50% бюджета ...
+QUALITY_UPGRADE_WINDOWS = 5    # ... столько окон подряд — ступенью выше
+QUALITY_UPGRADE_MAX_WINDOWS = 40  # предел для окон до повышения после неудачных попыток
+QUALITY_COOLDOWN = 120         # кадров после смены уровня без замеров (новые Surface, прогрев)
+
+# -------- Кэш ассетов --------
+ASSET_CACHE_BUDGET = 64 * 1024 * 1024  # байт; сверх бюджета — LRU вытеснение
+
 
 
 # -------- Магазин --------
@@ -89,6 +157,8 @@ BG_SCROLL_DURATION = 60
 # Слоу-мо эффекты
 SLOWMO_DURATION = 30  # 0.5 сек при 60 FPS
 SLOWMO_FACTOR = 0.3   # 30% скорости
+SLOWMO_MEGA_DURATION = 45  # на COMBO_TIER_3
+SLOWMO_MEGA_FACTOR = 0.25
 
 # Комбо бонусы (НОВЫЕ!)
 COMBO_TIER_1 = 2  # x1.5 скорость (было 3)
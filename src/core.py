@@ -0,0 +1,545 @@
+"""
+Ядро симуляции без pygame: маятник и падение блока, башня, правила счёта и комбо.
+
+Классы хранят только числа и списки (__slots__), ничего не рисуют и не
+загружают, поэтому работают без окна и без pygame вообще (headless-прогоны,
+бенчмарки). Block, Tower и Game наследуют их и добавляют спрайты, звуки,
+частицы и сохранения через хуки on_*.
+"""
+from math import sin, cos
+
+from src.constants import *
+
+
+class BlockCore:
+    """Блок на верёвке: раскачка, падение, попадание на башню."""
+
+    __slots__ = (
+        "x", "y", "xlast", "xchange", "speed", "acceleration", "speedmultiplier",
+        "state", "angle", "game_force",
+        "block_number", "sprite_type", "sprite_index",
+        "prev_x", "prev_y", "prev_angle",
+    )
+
+    def __init__(self, block_number=0):
+        self.game_force = INITIAL_FORCE
+        self.set_sprite_for_block_number(block_number)
+
+        # стартовые координаты блока
+        self.x = ROPE_ORIGIN_X - BLOCK_WIDTH // 2
+        self.y = ROPE_ORIGIN_Y + ROPE_LENGTH
+        self.xlast = 0
+        self.xchange = 100
+        self.speed = 0
+        self.acceleration = 0
+        self.speedmultiplier = 1
+
+        self.state = "ready"
+        self.angle = 45
+
+        # состояние на начало шага симуляции — для интерполяции отрисовки
+        self.save_state()
+
+    def set_sprite_for_block_number(self, block_number):
+        self.block_number = block_number
+        if block_number == 0:
+            self.sprite_type = 'bot'
+            self.sprite_index = 0
+        else:
+            # Циклически все 4 варианта mid
+            self.sprite_type = 'mid'
+            self.sprite_index = (block_number - 1) % 4
+
+    def save_state(self):
+        """Запомнить позицию перед шагом симуляции."""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.prev_angle = self.angle
+
+    def lerp(self, alpha):
+        """(x, y, angle) между прошлым и текущим шагом, alpha = 0..1."""
+        return (
+            self.prev_x + (self.x - self.prev_x) * alpha,
+            self.prev_y + (self.y - self.prev_y) * alpha,
+            self.prev_angle + (self.angle - self.prev_angle) * alpha,
+        )
+
+    def swing(self):
+        angle = self.angle
+        if self.state == "ready":
+            hook_x = ROPE_ORIGIN_X + ROPE_LENGTH * sin(angle)
+            hook_y = ROPE_ORIGIN_Y + ROPE_LENGTH * cos(angle)
+            attach_y = hook_y + HOOK_BOTTOM_OFFSET
+            self.x = hook_x - HOOK_ATTACH_OFFSET_X
+            self.y = attach_y - HOOK_ATTACH_OFFSET_Y
+
+        angle += self.speed
+        self.angle = angle
+        self.acceleration = sin(angle) * self.game_force
+        self.speed += self.acceleration
+
+    def get_force(self):
+        return self.game_force
+
+    def drop(self, tower):
+        if self.state == "ready":
+            self.state = "dropped"
+            self.xlast = self.x
+            self.speed = 0
+
+        if self.state == "dropped":
+            self.speed += GRAVITY
+            self.y += self.speed
+
+            if tower.size == 0:
+                target_y = SCREEN_HEIGHT - 424
+            else:
+                target_y = tower.y - BLOCK_HEIGHT
+
+            if self.y >= target_y:
+                if tower.size == 0 or self.collided(tower):
+                    self.state = "landed"
+                else:
+                    if self.y >= SCREEN_HEIGHT + 100:
+                        self.state = "miss"
+
+    def get_state(self):
+        return self.state
+
+    def collided(self, tower):
+        if tower.size == 0:
+            return False
+
+        half = BLOCK_WIDTH * 0.5
+        x_ok = (self.xlast < tower.xlist[-1] + half) and \
+               (self.xlast > tower.xlist[-1] - half)
+
+        y_ok = (tower.y - self.y <= BLOCK_HEIGHT + 10)
+
+        if x_ok and y_ok:
+            if (self.xlast < tower.xlist[-1] + 5) and \
+               (self.xlast > tower.xlist[-1] - 5):
+                tower.golden = True
+            else:
+                tower.golden = False
+            return True
+        else:
+            tower.golden = False
+            return False
+
+    def to_build(self, tower):
+        self.state = "scroll"
+        if tower.size == 0 or self.collided(tower):
+            return True
+        return False
+
+    def collapse(self, tower):
+        if tower.size < 2:
+            return
+        if tower.size == 2:
+            prev_x = tower.xbase
+        else:
+            prev_x = tower.xlist[-2]
+        threshold = BLOCK_WIDTH * COLLAPSE_THRESHOLD
+
+        offset = abs(self.xlast - prev_x)
+        if offset >= threshold:
+            self.state = "over"
+            tower.collapse_reason = "offset"
+
+    def rotate(self, direction):
+        if direction == "l":
+            self.angle += 1
+        if direction == "r":
+            self.angle -= 1
+
+    def to_fall(self, tower):
+        self.y += 5
+        if (self.xlast < tower.xlist[-2] + 30):
+            self.x -= 2
+            self.rotate("l")
+        elif (self.xlast > tower.xlist[-2] - 30):
+            self.x += 2
+            self.rotate("r")
+
+    def respawn(self, tower):
+        if tower.size % 2 == 0:
+            self.angle = -45
+        else:
+            self.angle = 45
+
+        self.speed = 0
+        self.state = "ready"
+
+        hook_x = ROPE_ORIGIN_X + ROPE_LENGTH * sin(self.angle)
+        hook_y = ROPE_ORIGIN_Y + ROPE_LENGTH * cos(self.angle)
+        attach_y = hook_y + HOOK_BOTTOM_OFFSET
+
+        self.x = hook_x - HOOK_ATTACH_OFFSET_X
+        self.y = attach_y - HOOK_ATTACH_OFFSET_Y
+
+        self.set_sprite_for_block_number(tower.size)
+        # телепорт к крану: интерполировать не с чего
+        self.save_state()
+
+
+class TowerCore:
+    """Башня: позиции блоков, ширина, раскачка и обрушение."""
+
+    __slots__ = (
+        "size", "xbase", "y", "x", "height",
+        "xlist", "sprite_list", "golden_list", "onscreen",
+        "change", "prev_change", "speed", "wobbling", "scrolling", "golden",
+        "display_status", "collapse_reason",
+    )
+
+    def __init__(self):
+        self.size = 0
+
+        self.xbase = 0
+        self.y = SCREEN_HEIGHT
+        self.x = 0
+        self.height = 0
+
+        self.xlist = []
+        self.sprite_list = []
+        self.golden_list = []
+
+        self.onscreen = 0
+        self.change = 0
+        self.prev_change = 0
+        self.speed = WOBBLE_SPEED
+        self.wobbling = False
+        self.scrolling = False
+        self.golden = False
+        self.display_status = True
+        self.collapse_reason = None
+
+    def get_display(self):
+        return self.display_status
+
+    def is_scrolling(self):
+        return self.scrolling
+
+    def is_golden(self):
+        return self.golden
+
+    def get_top_y(self):
+        return self.y
+
+    def build(self, block):
+        # увеличиваем размер
+        self.size += 1
+        self.onscreen = self.size
+
+        if self.size == 1:
+            self.xbase = block.xlast
+            self.xlist = [self.xbase]
+            self.sprite_list = [('bot', 0)]
+            self.golden_list = [False]
+        else:
+            self.xlist.append(block.xlast)
+            self.sprite_list.append((block.sprite_type, block.sprite_index))
+            self.golden_list.append(self.golden)
+
+        # высота и позиция от земли, БЕЗ потолка по верёвке
+        self.height = self.size * BLOCK_HEIGHT
+        base_y = SCREEN_HEIGHT - BLOCK_HEIGHT
+        self.y = base_y - (self.height - BLOCK_HEIGHT)
+
+    def get_width(self):
+        width = BLOCK_WIDTH
+        if self.size <= 0:
+            return width
+
+        if self.xlist[-1] > self.xbase:
+            width = (self.xlist[-1] - self.xbase) + BLOCK_WIDTH
+        if self.xlist[-1] < self.xbase:
+            width = -((self.xbase - self.xlist[-1]) + BLOCK_WIDTH)
+
+        return width
+
+    def unbuild(self, block):
+        """Верхний блок отваливается: дальше он падает отдельно как block."""
+        self.display_status = False
+        if self.y > block.y:
+            block.y = self.y
+            self.size -= 1
+
+    def trim(self, keep):
+        """Оставить только keep верхних блоков (при скролле фона)."""
+        self.size = keep
+        self.onscreen = self.size
+        self.height = self.size * BLOCK_HEIGHT
+        base_y = SCREEN_HEIGHT - BLOCK_HEIGHT
+        self.y = base_y - (self.height - BLOCK_HEIGHT)
+        self.xlist = self.xlist[-self.size:]
+        self.sprite_list = self.sprite_list[-self.size:]
+        self.golden_list = self.golden_list[-self.size:]
+
+    def collapse(self, direction):
+        self.y += 5
+        if direction == "l":
+            self.x -= 5
+        elif direction == "r":
+            self.x += 5
+
+    def save_state(self):
+        """Запомнить смещение перед шагом симуляции (для интерполяции)."""
+        self.prev_change = self.change
+
+    def draw_change(self, alpha=1.0):
+        """Смещение раскачки между прошлым и текущим шагом."""
+        return self.prev_change + (self.change - self.prev_change) * alpha
+
+    def wobble(self, width=None):
+        """width — уже посчитанная get_width() (её же берёт GameCore.check_game_over)."""
+        if width is None:
+            width = self.get_width()
+        if ((width > 100 or width < -100) and self.size >= 5) or self.size >= 20:
+            self.wobbling = True
+
+        if self.wobbling:
+            self.change += self.speed
+
+        if self.change > WOBBLE_LIMIT:
+            self.speed = -WOBBLE_SPEED
+        elif self.change < -WOBBLE_LIMIT:
+            self.speed = WOBBLE_SPEED
+
+    def scroll(self):
+        self.scrolling = False
+
+
+class GameCore:
+    """
+    Правила партии: комбо, слоу-мо, счёт, монеты, промахи, скролл фона и
+    конец игры. step() — один шаг симуляции (1 / SIM_HZ секунды игрового
+    времени). Всё, что слышно и видно, делают наследники в хуках on_* и end_game.
+    """
+
+    __slots__ = (
+        "block", "tower",
+        "score", "misses", "force", "coins_earned",
+        "blocks_placed", "golden_count", "max_combo",
+        "combo", "combo_timer",
+        "slowmo_active", "slowmo_timer", "slowmo_intensity",
+        "game_over", "game_over_reason",
+        "bg_y", "bg_min_y", "bg_anim_active", "bg_anim_progress", "bg_anim_target_y",
+        "people_enabled",
+    )
+
+    def __init__(self, block=None, tower=None, bg_min_y=0):
+        # самая верхняя позиция фона (SCREEN_HEIGHT - высота картинки)
+        self.bg_min_y = bg_min_y
+        self.new_game(block, tower)
+
+    def new_game(self, block=None, tower=None):
+        """Начать партию заново с новыми блоком и башней."""
+        self.block = block if block is not None else BlockCore(block_number=0)
+        self.tower = tower if tower is not None else TowerCore()
+
+        self.score = 0
+        self.misses = 0
+        self.force = INITIAL_FORCE
+        self.coins_earned = 0
+
+        self.blocks_placed = 0
+        self.golden_count = 0
+        self.max_combo = 0
+
+        self.combo = 0
+        self.combo_timer = 0
+
+        self.slowmo_active = False
+        self.slowmo_timer = 0
+        self.slowmo_intensity = 1.0
+
+        self.game_over = False
+        self.game_over_reason = None
+
+        self.bg_y = self.bg_min_y
+        self.bg_anim_active = False
+        self.bg_anim_progress = 0
+        self.bg_anim_target_y = 0
+        self.people_enabled = False
+
+    # ---------- ХУКИ ----------
+    def on_build(self, golden, x, y, coins):
+        """Блок поставлен: центр блока (x, y) на экране, coins — монеты за него."""
+
+    def on_miss(self):
+        """Блок пролетел мимо башни (вызывается до увеличения self.misses)."""
+
+    def on_collapse(self, falling):
+        """Башня рушится; falling — верхний блок соскользнул и падает."""
+
+    def end_game(self):
+        self.game_over = True
+
+    # ---------- ПРАВИЛА ----------
+    def activate_slowmo(self, duration=SLOWMO_DURATION, factor=SLOWMO_FACTOR):
+        """🎬 Активировать эффект замедления"""
+        self.slowmo_active = True
+        self.slowmo_timer = duration
+        self.slowmo_intensity = factor
+
+    def time_scale(self):
+        """Скорость игровых часов: слоу-мо замедляет всю симуляцию."""
+        return self.slowmo_intensity if self.slowmo_active else 1.0
+
+    def combo_speed_boost(self):
+        """Комбо ускоряет раскачку маятника."""
+        if self.combo >= COMBO_TIER_3:
+            return 2.5
+        elif self.combo >= COMBO_TIER_2:
+            return 2.0
+        elif self.combo >= COMBO_TIER_1:
+            return 1.5
+        return 1.0
+
+    def drop(self):
+        """Игрок отпустил блок (SPACE)."""
+        if self.block.state == "ready":
+            self.block.drop(self.tower)
+
+    def step(self):
+        """Один шаг симуляции."""
+        block = self.block
+        tower = self.tower
+        # save_state() блока и башни без вызовов: step — самое горячее место ядра
+        block.prev_x = block.x
+        block.prev_y = block.y
+        block.prev_angle = block.angle
+        tower.prev_change = tower.change
+
+        # 🎬 ОБНОВЛЕНИЕ СЛОУ-МО: длительность — в шагах реального времени,
+        # а один шаг при замедлении занимает 1 / time_scale реальных
+        if self.slowmo_active:
+            self.slowmo_timer -= 1 / self.slowmo_intensity
+            if self.slowmo_timer <= 0:
+                self.slowmo_active = False
+                self.slowmo_intensity = 1.0
+
+        state = block.state
+
+        if state == "ready":
+            block.game_force = self.force * self.combo_speed_boost()
+            block.swing()
+
+        elif state == "dropped":
+            block.drop(tower)
+
+        elif state == "landed":
+            if block.to_build(tower):
+                self._build()
+
+            if tower.size >= 2:
+                block.collapse(tower)
+
+        elif state == "over":
+            tower.unbuild(block)
+            block.to_fall(tower)
+
+            if not self.game_over_reason:
+                self.on_collapse(True)
+                self.game_over_reason = "collapse"
+                self.end_game()
+
+        elif state == "scroll" and not tower.is_scrolling():
+            block.respawn(tower)
+
+        elif state == "miss":
+            self.on_miss()
+            self.misses += 1
+
+            if self.misses >= MAX_MISSES:
+                self.game_over_reason = "misses"
+                self.end_game()
+            else:
+                block.respawn(tower)
+
+        if self.bg_anim_active or tower.size >= TOWER_BLOCKS_PER_STEP:
+            self._scroll_background()
+
+        # ширина одна на wobble и проверку обрушения: между ними башня не меняется
+        width = tower.get_width()
+        tower.wobble(width)
+
+        if self.combo_timer > 0:
+            self.combo_timer -= 1
+
+        if width < -140 or width > 140:
+            self.check_game_over(width)
+
+    def _build(self):
+        """Блок встал на башню: счёт, монеты, комбо и слоу-мо."""
+        tower = self.tower
+        tower.build(self.block)
+        self.force *= FORCE_ACCELERATION
+        self.blocks_placed += 1
+
+        golden = tower.is_golden()
+        if golden:
+            self.combo += 1
+            self.combo_timer = 180
+            self.golden_count += 1
+            self.max_combo = max(self.max_combo, self.combo)
+            score_mult = 1 + min(self.combo * 0.3, 2.5)
+
+            if self.combo >= COMBO_TIER_3:
+                self.activate_slowmo(duration=SLOWMO_MEGA_DURATION, factor=SLOWMO_MEGA_FACTOR)
+            elif self.combo >= COMBO_TIER_2:
+                self.activate_slowmo(duration=SLOWMO_DURATION, factor=SLOWMO_FACTOR)
+
+            self.score += int(2 * score_mult)
+            coins = int(10 * score_mult)
+        else:
+            self.combo = 0
+            self.score += 1
+            coins = 5
+        self.coins_earned += coins
+
+        x = tower.xlist[-1] + BLOCK_WIDTH // 2 + tower.x + tower.change
+        y = tower.y + BLOCK_HEIGHT * (tower.size - 1) - BLOCK_HEIGHT // 2
+        self.on_build(golden, x, y, coins)
+
+    def _scroll_background(self):
+        if self.bg_anim_active:
+            self.bg_anim_progress += 1
+            progress_ratio = self.bg_anim_progress / BG_SCROLL_DURATION
+            self.bg_y = self.bg_anim_target_y * progress_ratio + self.bg_y * (1 - progress_ratio)
+
+            if self.bg_anim_progress >= BG_SCROLL_DURATION:
+                self.bg_y = self.bg_anim_target_y
+                self.bg_anim_active = False
+                self.bg_anim_progress = 0
+        elif self.tower.size >= TOWER_BLOCKS_PER_STEP:
+            self.tower.trim(BASE_ONSCREEN_BLOCKS)
+
+            self.bg_anim_active = True
+            self.bg_anim_progress = 0
+            self.bg_anim_target_y = self.bg_y + BG_SCROLL_STEP
+
+            if self.bg_anim_target_y < self.bg_min_y:
+                self.bg_anim_target_y = self.bg_min_y
+
+            if not self.people_enabled:
+                self.people_enabled = True
+
+    def check_game_over(self, width=None):
+        if width is None:
+            width = self.tower.get_width()
+
+        if width < -140:
+            direction = "l"
+        elif width > 140:
+            direction = "r"
+        else:
+            return
+
+        self.tower.collapse(direction)
+        if not self.game_over_reason:
+            self.on_collapse(False)
+            self.game_over_reason = "collapse"
+            self.end_game()
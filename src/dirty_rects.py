@@ -0,0 +1,152 @@
+import pygame
+
+from src.constants import DIRTY_MAX_RECTS, DIRTY_FULL_RATIO
+
+
+DEBUG_OUTLINE_COLOR = (255, 0, 255)
+
+
+class DirtyTracker:
+    """
+    Сбор изменённых областей кадра для режима dirty-rect.
+
+    Виджеты в track_dirty(tracker) сообщают своё состояние и прямоугольник:
+    если что-то из них поменялось с прошлого кадра, грязными становятся
+    и старый, и новый прямоугольник. collect() возвращает None, когда
+    дешевле перерисовать весь экран.
+
+    atomic=True — элемент с закруглённой рамкой (pygame.draw.rect с border_radius
+    рисуется по-разному, если clip режет фигуру), поэтому при пересечении
+    с областью перерисовки он всегда добавляется в неё целиком.
+    """
+
+    def __init__(self, bounds, debug=False):
+        self.bounds = pygame.Rect(bounds)
+        self.prev = {}
+        self.atomic = {}
+        self.watched = {}
+        self.rects = []
+        self.full = True
+        self.screen_key = None
+
+        # отладка: обводим грязные области, на следующем кадре стираем обводку
+        self.debug = debug
+        self.debug_rects = []
+
+        self.frames = 0
+        self.full_frames = 0
+        self.dirty_pixels = 0
+
+    def begin_frame(self, screen_key):
+        """Смена экрана (меню -> игра и т.п.) перерисовывает всё."""
+        if screen_key != self.screen_key:
+            self.screen_key = screen_key
+            self.invalidate()
+
+    def invalidate(self):
+        self.full = True
+        self.prev.clear()
+        self.atomic.clear()
+        self.watched.clear()
+
+    def toggle_debug(self):
+        self.debug = not self.debug
+        self.full = True
+
+    def add(self, rect):
+        self.rects.append(pygame.Rect(rect))
+
+    def watch(self, key, state):
+        """Изменилось состояние, влияющее на весь экран (фон, оверлей) -> полная перерисовка."""
+        if key in self.watched and self.watched[key] != state:
+            self.full = True
+        self.watched[key] = state
+
+    def track(self, key, state, rect, atomic=False):
+        """
+        Элемент key нарисован в rect с состоянием state.
+        rect=None — элемент сейчас не рисуется (стираем его старое место).
+        """
+        old = self.prev.get(key)
+        if rect is None:
+            if old is not None:
+                self.rects.append(old[1])
+                del self.prev[key]
+            self.atomic.pop(key, None)
+            return
+
+        rect = pygame.Rect(rect)
+        if atomic:
+            self.atomic[key] = rect
+        if old is None or old[0] != state or old[1] != rect:
+            if old is not None:
+                self.rects.append(old[1])
+            self.rects.append(rect)
+            self.prev[key] = (state, rect)
+
+    def collect(self):
+        """Список грязных прямоугольников кадра или None (перерисовать всё)."""
+        rects = self.rects + self.debug_rects
+        self.rects = []
+        self.debug_rects = []
+        self.frames += 1
+
+        if self.full:
+            self.full = False
+            self.full_frames += 1
+            self.dirty_pixels += self.bounds.width * self.bounds.height
+            return None
+
+        clipped = []
+        for rect in rects:
+            rect = rect.clip(self.bounds)
+            if rect.width and rect.height:
+                clipped.append(rect)
+
+        if clipped:
+            self._include_atomic(clipped)
+
+        if len(clipped) > DIRTY_MAX_RECTS:
+            clipped = [clipped[0].unionall(clipped[1:])]
+
+        area = sum(r.width * r.height for r in clipped)
+        if area > self.bounds.width * self.bounds.height * DIRTY_FULL_RATIO:
+            self.full_frames += 1
+            self.dirty_pixels += self.bounds.width * self.bounds.height
+            return None
+
+        self.dirty_pixels += area
+        return clipped
+
+    def _include_atomic(self, rects):
+        """Расширить область перерисовки целыми atomic-элементами, которые она задевает."""
+        clip = union_rect(rects)
+        changed = True
+        while changed:
+            changed = False
+            for rect in self.atomic.values():
+                rect = rect.clip(self.bounds)
+                if clip.colliderect(rect) and not clip.contains(rect):
+                    rects.append(rect)
+                    clip.union_ip(rect)
+                    changed = True
+
+    def draw_debug(self, surface, rects):
+        """Обвести грязные области (их же сотрём на следующем кадре)."""
+        if not self.debug or not rects:
+            return
+        for rect in rects:
+            pygame.draw.rect(surface, DEBUG_OUTLINE_COLOR, rect, 1)
+        self.debug_rects = [r.copy() for r in rects]
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "dirty_pixels": self.dirty_pixels,
+        }
+
+
+def union_rect(rects):
+    """Общий прямоугольник для set_clip на время отрисовки."""
+    return rects[0].unionall(rects[1:])
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+
+import pygame
+
+from src.constants import DEFAULT_FONT, TEXT_CACHE_MAX_ENTRIES
+
+
+_fonts = {}
+
+
+def get_font(size, path=DEFAULT_FONT):
+    """Общий объект Font для (path, size): создаётся один раз на процесс."""
+    key = (path, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(path, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """
+    Кэш отрисованного текста: (font, text, color, antialias) -> Surface.
+    Ограничен по числу записей, старые выбрасываются (LRU).
+    render_calls считает реальные вызовы font.render.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.render_calls = 0
+        self.evictions = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.render_calls += 1
+        surf = font.render(text, antialias, color)
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    # ---------- БЫСТРЫЙ ПУТЬ ДЛЯ ЧИСЕЛ ----------
+    def number_size(self, font, number, color, prefix=""):
+        """Размер строки prefix + число, собранной из готовых глифов."""
+        width = self.render(font, prefix, color).get_width() if prefix else 0
+        height = font.get_height()
+        for ch in str(number):
+            width += self.render(font, ch, color).get_width()
+        return width, height
+
+    def blit_number(self, screen, font, number, color, topleft, prefix=""):
+        """
+        Рисует prefix + число по одному глифу на цифру: новое значение счёта
+        не требует font.render, только несколько blit из кэша.
+        """
+        x, y = topleft
+        if prefix:
+            surf = self.render(font, prefix, color)
+            screen.blit(surf, (x, y))
+            x += surf.get_width()
+        for ch in str(number):
+            surf = self.render(font, ch, color)
+            screen.blit(surf, (x, y))
+            x += surf.get_width()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "render_calls": self.render_calls,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "fonts": len(_fonts),
+        }
+
+
+# общий кэш для меню, магазина и HUD
+text_cache = TextCache()
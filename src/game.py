@@ -1,35 +1,65 @@
 import math
+import random
+
 import pygame
 from pygame import mixer
 
 from src.block import Block
 from src.tower import Tower
+from src.core import GameCore
 from src.constants import *
 from src.balloon_guy import BalloonGuy
 from src.particles import ParticleSystem
+from src.asset_loader import AssetLoader
+from src.fonts import get_font, text_cache
+from src.rotation_cache import rotation_cache
+from src.ui import StaticLayer
+from src.overlays import OverlayManager
+from src.profiler import profiler
+from src.quality import governor
+from src.timestep import FixedTimestep
+from src.replay import Replay, INPUT_SPACE
+
+
+# чёрная обводка комбо-надписи: сначала диагонали (при 4 проходах обводка ещё читается)
+COMBO_OUTLINE_OFFSETS = ((-2, -2), (2, -2), (-2, 2), (2, 2), (-2, 0), (2, 0), (0, -2), (0, 2))
 
 
 class ImageButton:
     """Кнопка с картинкой и фоном как в настройках."""
-    def __init__(self, x, y, image_path, size=(60, 60), click_sound=None):
-        raw_image = pygame.image.load(image_path).convert_alpha()
+    def __init__(self, x, y, image_path, size=(60, 60), click_sound=None, asset_loader=None):
+        asset_loader = asset_loader or AssetLoader()
         sprite_size = (size[0] - 2, size[1] - 2)
-        self.image = pygame.transform.smoothscale(raw_image, sprite_size)
+        self.image = asset_loader.load_image(image_path, size=sprite_size)
         self.size = size
         self.rect = pygame.Rect(x - size[0] // 2, y - size[1] // 2, size[0], size[1])
         self.is_hovered = False
         self.click_sound = click_sound
+        self.surfaces = {}
 
-    def draw(self, screen):
-        base_color = (180, 200, 230)
+    def _render(self, hovered):
+        """Готовая картинка кнопки для обычного/наведённого состояния, кэшируется."""
+        surf = self.surfaces.get(hovered)
+        if surf is not None:
+            return surf
+
+        base_color = (140, 160, 190) if hovered else (180, 200, 230)
         border_color = (20, 20, 20)
-        if self.is_hovered:
-            base_color = (140, 160, 190)
-        pygame.draw.rect(screen, base_color, self.rect, border_radius=8)
-        pygame.draw.rect(screen, border_color, self.rect, 2, border_radius=8)
-        img_x = self.rect.x + 1
-        img_y = self.rect.y + 1
-        screen.blit(self.image, (img_x, img_y))
+        surf = pygame.Surface(self.size, pygame.SRCALPHA)
+        rect = surf.get_rect()
+        pygame.draw.rect(surf, base_color, rect, border_radius=8)
+        pygame.draw.rect(surf, border_color, rect, 2, border_radius=8)
+        surf.blit(self.image, (1, 1))
+        self.surfaces[hovered] = surf
+        return surf
+
+    def draw(self, screen, hovered=None):
+        if hovered is None:
+            hovered = self.is_hovered
+        screen.blit(self._render(hovered), self.rect.topleft)
+
+    def track_dirty(self, tracker):
+        tracker.track(self, self.is_hovered, self.rect, atomic=True)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -42,88 +72,115 @@ class ImageButton:
         return False
 
 
-class Game:
-    def __init__(self, screen, save_manager, asset_loader, sound_muted=False):
+class Game(GameCore):
+    """
+    Игровой экран: правила и физика — в GameCore, здесь отрисовка, звуки,
+    частицы, голосовые фразы, сохранения и история.
+    """
+
+    def __init__(self, screen, save_manager, asset_loader, sound_muted=False, history=None,
+                 seed=None, tower_id=None, persist=True, record_to=None):
         self.screen = screen
         self.save_manager = save_manager
+        self.history = history
         self.asset_loader = asset_loader
         self.sound_muted = sound_muted
 
-        self.crane_image = pygame.image.load(f"{CRANE_PATH}crane.png").convert_alpha()
-        self.rope_hook_image = pygame.image.load(f"{CRANE_PATH}rope_with_hook.png").convert_alpha()
+        # persist=False — реплей: монеты, рекорд и история не трогаются
+        self.persist = persist
+        # record_to — путь файла реплея, пишется в конце партии
+        self.record_to = record_to
+
+        self.crane_image, self.rope_hook_image = asset_loader.load_crane()
 
-        self.bg_big = pygame.image.load(f"{ASSETS_PATH}bg/bg_group.png").convert()
-        self.bg_y = SCREEN_HEIGHT - self.bg_big.get_height()
-        self.bg_end = pygame.image.load(f"{ASSETS_PATH}bg/bg_end.png").convert()
+        self.bg_big = asset_loader.load_image(f"{ASSETS_PATH}bg/bg_group.png", alpha=False)
+        self.bg_end = asset_loader.load_image(f"{ASSETS_PATH}bg/bg_end.png", alpha=False)
 
+        # звуки общие с меню (один и тот же Sound), поэтому громкость ставим явно
         self.sounds = asset_loader.load_sounds()
-        if self.sound_muted:
-            for sound in self.sounds.values():
-                sound.set_volume(0.0)
+        for sound in self.sounds.values():
+            sound.set_volume(0.0 if self.sound_muted else 1.0)
 
-        self.current_tower_id = save_manager.get_selected_tower()
+        self.current_tower_id = tower_id or save_manager.get_selected_tower()
         self.tower_sprites = asset_loader.load_tower_sprites(self.current_tower_id)
 
-        self.block = Block(self.tower_sprites, block_number=0)
-        self.tower = Tower(self.tower_sprites)
+        # 🎲 вся случайность партии (частицы, человечки) — из одного seed
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.rng = random.Random(self.seed)
+        self.frame = 0
+        self.replay = Replay(self.seed, self.current_tower_id) if record_to else None
+
+        GameCore.__init__(
+            self,
+            Block(self.tower_sprites, block_number=0),
+            Tower(self.tower_sprites),
+            bg_min_y=SCREEN_HEIGHT - self.bg_big.get_height(),
+        )
 
         self.balloon_guys = pygame.sprite.Group()
         self._create_balloon_guys()
 
-        # КОМБО + ЧАСТИЦЫ + СЛОУ-МО
-        self.particles = ParticleSystem()
-        self.combo = 0
-        self.combo_timer = 0
-        
-        # 🎬 СЛОУ-МО СИСТЕМА
-        self.slowmo_active = False
-        self.slowmo_timer = 0
-        self.slowmo_intensity = 1.0
+        # ✨ ЧАСТИЦЫ
+        self.particles = ParticleSystem(seed=self.seed)
+
+        # 🎚️ КАЧЕСТВО ЭФФЕКТОВ (меняет QualityGovernor из main)
+        self.apply_quality(governor.level)
+
+        # ⏱️ ЛОГИКА ФИКСИРОВАННЫМ ШАГОМ, отрисовка — между шагами
+        self.clock = FixedTimestep()
+        self.alpha = 1.0
         
         # 🎙️ СИСТЕМА ГОЛОСОВЫХ ФРАЗ
         self.last_action_time = 0
-        self.blocks_placed = 0
         self.milestone_cycle = 0
         self.start_phrase_played = False
 
-        self.score = 0
-        self.misses = 0
-        self.force = INITIAL_FORCE
-        self.coins_earned = 0
-
-        self.bg_anim_active = False
-        self.bg_anim_progress = 0
-        self.bg_anim_target_y = 0
-
-        self.score_font = pygame.font.Font("freesansbold.ttf", 32)
-        self.miss_font = pygame.font.Font("freesansbold.ttf", 24)
-        self.over_font = pygame.font.Font("freesansbold.ttf", 64)
-        self.mini_font = pygame.font.Font("freesansbold.ttf", 16)
-        self.reason_font = pygame.font.Font("freesansbold.ttf", 24)
-        self.coins_font = pygame.font.Font("freesansbold.ttf", 24)
-        self.hint_font = pygame.font.Font("freesansbold.ttf", 18)
-        self.hint_title_font = pygame.font.Font("freesansbold.ttf", 40)
-        self.hint_text_font = pygame.font.Font("freesansbold.ttf", 28)
-        self.confirm_font = pygame.font.Font("freesansbold.ttf", 24)
-        self.confirm_small_font = pygame.font.Font("freesansbold.ttf", 18)
+        # 📊 длительность партии (для истории)
+        self.started_at = pygame.time.get_ticks()
+
+        self.score_font = get_font(32)
+        self.miss_font = get_font(24)
+        self.over_font = get_font(64)
+        self.mini_font = get_font(16)
+        self.reason_font = get_font(24)
+        self.coins_font = get_font(24)
+        self.hint_font = get_font(18)
+        self.hint_title_font = get_font(40)
+        self.hint_text_font = get_font(28)
+        self.confirm_font = get_font(24)
+        self.confirm_small_font = get_font(18)
+        self.combo_font = get_font(48)
 
         self.BLINK_EVENT = pygame.USEREVENT + 1
         pygame.time.set_timer(self.BLINK_EVENT, 800)
 
-        self.game_over = False
-        self.game_over_reason = None
         self.show_start_hint = True
         self.show_exit_confirm = False
-        self.people_enabled = False
 
         cx = SCREEN_WIDTH // 2
         btn_y = 430
         spacing = 100
         click_sound = self.sounds['click']
-        self.btn_back = ImageButton(cx - spacing, btn_y, f"{UI_PATH}arrow_back.png", size=(60, 60), click_sound=click_sound)
-        self.btn_shop = ImageButton(cx, btn_y, f"{UI_PATH}store.png", size=(60, 60), click_sound=click_sound)
-        self.btn_restart = ImageButton(cx + spacing, btn_y, f"{UI_PATH}restart.png", size=(60, 60), click_sound=click_sound)
-        self.btn_restart_game = ImageButton(SCREEN_WIDTH - 40, 35, f"{UI_PATH}restart.png", size=(50, 50), click_sound=click_sound)
+        self.btn_back = ImageButton(cx - spacing, btn_y, f"{UI_PATH}arrow_back.png", size=(60, 60), click_sound=click_sound, asset_loader=asset_loader)
+        self.btn_shop = ImageButton(cx, btn_y, f"{UI_PATH}store.png", size=(60, 60), click_sound=click_sound, asset_loader=asset_loader)
+        self.btn_restart = ImageButton(cx + spacing, btn_y, f"{UI_PATH}restart.png", size=(60, 60), click_sound=click_sound, asset_loader=asset_loader)
+        self.btn_restart_game = ImageButton(SCREEN_WIDTH - 40, 35, f"{UI_PATH}restart.png", size=(50, 50), click_sound=click_sound, asset_loader=asset_loader)
+
+        # экран GAME OVER меняется только вместе со счётом — держим его готовым слоем
+        self.game_over_layer = StaticLayer(screen)
+
+        # полноэкранные оверлеи строятся один раз и выводятся одним blit
+        self.overlays = OverlayManager(screen.get_size())
+        self.overlays.register("start_hint", self._build_start_hint)
+        self.overlays.register("exit_confirm", self._build_exit_confirm, dim=(0, 0, 0, 150))
+
+    def apply_quality(self, level):
+        """Применить уровень качества (src/quality.py) к эффектам партии."""
+        self.quality = level
+        self.particles.set_quality(level.particle_cap, level.particle_scale)
+        self.outline_offsets = COMBO_OUTLINE_OFFSETS[:level.outline_passes]
+        self.people_visible = level.people
+        self.slowmo_tint = level.slowmo_tint
 
     def _create_balloon_guys(self):
         xs = [80, 180, 300, 420]
@@ -136,18 +193,40 @@ class Game:
                 start_x=xs[idx],
                 speed_y=speed_y,
                 start_delay_frames=delay_frames,
+                asset_loader=self.asset_loader,
+                rng=self.rng,
             )
             self.balloon_guys.add(guy)
 
-    def show_score(self):
-        score_text = self.score_font.render(f"Score: {self.score}", True, BLACK)
-        misses_text = self.miss_font.render(f"Промахи: {self.misses}/{MAX_MISSES}", True, BLACK)
+    def _hud_layout(self):
+        """Панель счёта: (panel_rect, размер строки счёта, surface промахов)."""
+        # счёт собирается из закэшированных глифов цифр, без font.render
+        score_size = text_cache.number_size(self.score_font, self.score, BLACK, prefix="Score: ")
+        misses_text = text_cache.render(self.miss_font, f"Промахи: {self.misses}/{MAX_MISSES}", BLACK)
 
         padding_x = 10
         padding_y = 10
-        w = max(score_text.get_width(), misses_text.get_width()) + padding_x * 2
-        h = score_text.get_height() + misses_text.get_height() + padding_y * 3
-        panel_rect = pygame.Rect(8, 8, w, h)
+        w = max(score_size[0], misses_text.get_width()) + padding_x * 2
+        h = score_size[1] + misses_text.get_height() + padding_y * 3
+        return pygame.Rect(8, 8, w, h), score_size, misses_text
+
+    def _combo_label(self):
+        """Текст и цвет комбо-надписи или None, если её не видно."""
+        if not (self.combo > 0 and self.combo_timer > 0):
+            return None
+        combo_mult = 1 + min(self.combo * 0.3, 2.5)
+
+        if self.combo >= COMBO_TIER_3:
+            return f"⚡ MEGA x{combo_mult:.1f}! ⚡", (255, 50, 255)
+        elif self.combo >= COMBO_TIER_2:
+            return f"🔥 SUPER x{combo_mult:.1f}! 🔥", (255, 100, 0)
+        elif self.combo >= COMBO_TIER_1:
+            return f"✨ COMBO x{combo_mult:.1f}! ✨", (255, 215, 0)
+        return f"COMBO x{combo_mult:.1f}!", (255, 215, 0)
+
+    def show_score(self):
+        panel_rect, (score_w, score_h), misses_text = self._hud_layout()
+        padding_y = 10
 
         base_color = (180, 200, 230)
         border_color = (20, 20, 20)
@@ -156,118 +235,144 @@ class Game:
         pygame.draw.rect(self.screen, border_color, panel_rect, 2, border_radius=10)
 
         x_center = panel_rect.centerx
-        y = panel_rect.top + padding_y + score_text.get_height() // 2
+        y = panel_rect.top + padding_y + score_h // 2
 
-        score_rect = score_text.get_rect(center=(x_center, y))
-        self.screen.blit(score_text, score_rect)
+        score_rect = pygame.Rect(0, 0, score_w, score_h)
+        score_rect.center = (x_center, y)
+        text_cache.blit_number(self.screen, self.score_font, self.score, BLACK, score_rect.topleft, prefix="Score: ")
 
-        y += score_text.get_height() + padding_y
+        y += score_h + padding_y
         misses_rect = misses_text.get_rect(center=(x_center, y))
         self.screen.blit(misses_text, misses_rect)
 
         # 🎯 ЭПИЧНЫЙ КОМБО ТЕКСТ
-        if self.combo > 0 and self.combo_timer > 0:
-            combo_mult = 1 + min(self.combo * 0.3, 2.5)
-            
-            combo_font = pygame.font.Font("freesansbold.ttf", 48)
-            
-            if self.combo >= COMBO_TIER_3:
-                combo_color = (255, 50, 255)
-                combo_text = f"⚡ MEGA x{combo_mult:.1f}! ⚡"
-            elif self.combo >= COMBO_TIER_2:
-                combo_color = (255, 100, 0)
-                combo_text = f"🔥 SUPER x{combo_mult:.1f}! 🔥"
-            elif self.combo >= COMBO_TIER_1:
-                combo_color = (255, 215, 0)
-                combo_text = f"✨ COMBO x{combo_mult:.1f}! ✨"
-            else:
-                combo_color = (255, 215, 0)
-                combo_text = f"COMBO x{combo_mult:.1f}!"
-            
+        combo_label = self._combo_label()
+        if combo_label:
+            combo_text, combo_color = combo_label
+            combo_font = self.combo_font
+
             # 🖤 ЧЕРНАЯ ОБВОДКА
-            outline_surf = combo_font.render(combo_text, True, BLACK)
+            outline_surf = text_cache.render(combo_font, combo_text, BLACK)
             outline_rect = outline_surf.get_rect(center=(SCREEN_WIDTH // 2, 120))
             
-            for dx in [-2, 0, 2]:
-                for dy in [-2, 0, 2]:
-                    if dx != 0 or dy != 0:
-                        self.screen.blit(outline_surf, (outline_rect.x + dx, outline_rect.y + dy))
+            for dx, dy in self.outline_offsets:
+                self.screen.blit(outline_surf, (outline_rect.x + dx, outline_rect.y + dy))
             
-            combo_surf = combo_font.render(combo_text, True, combo_color)
+            combo_surf = text_cache.render(combo_font, combo_text, combo_color)
             combo_rect = combo_surf.get_rect(center=(SCREEN_WIDTH // 2, 120))
             self.screen.blit(combo_surf, combo_rect)
 
         # 🎬 СЛОУ-МО ИНДИКАТОР
         if self.slowmo_active:
-            slowmo_text = self.miss_font.render("⏰ SLOW-MOTION", True, (100, 200, 255))
+            slowmo_text = text_cache.render(self.miss_font, "⏰ SLOW-MOTION", (100, 200, 255))
             slowmo_rect = slowmo_text.get_rect(center=(SCREEN_WIDTH // 2, 160))
             self.screen.blit(slowmo_text, slowmo_rect)
 
     def draw_background(self):
         self.screen.blit(self.bg_big, (0, self.bg_y))
         
-        if self.slowmo_active:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        if self.slowmo_active and self.slowmo_tint:
             alpha = int(30 * (1.0 - self.slowmo_intensity))
-            overlay.fill((0, 0, 50, alpha))
-            self.screen.blit(overlay, (0, 0))
+            self.overlays.tint(self.screen, (0, 0, 50), alpha)
+
+    def _rope_hook_sprite(self):
+        """Повёрнутая верёвка с крюком и её rect с центром посередине верёвки."""
+        _, _, angle = self.block.lerp(self.alpha)
+        rope_end_x = ROPE_ORIGIN_X + ROPE_LENGTH * math.sin(angle)
+        rope_end_y = ROPE_ORIGIN_Y + ROPE_LENGTH * math.cos(angle)
+
+        angle_deg = math.degrees(angle)
+        rot_rope_hook, rope_hook_rect = rotation_cache.get(self.rope_hook_image, angle_deg)
+        rope_hook_rect = rope_hook_rect.copy()
+
+        mid_x = (ROPE_ORIGIN_X + rope_end_x) / 2
+        mid_y = (ROPE_ORIGIN_Y + rope_end_y) / 2
+        rope_hook_rect.center = (mid_x, mid_y)
+        return rot_rope_hook, rope_hook_rect
+
+    def track_dirty(self, tracker):
+        """Сообщить изменённые области кадра (режим dirty-rect)."""
+        if self.game_over:
+            tracker.watch("game_over", (self.score, self.game_over_reason, self.coins_earned))
+            for btn in (self.btn_back, self.btn_shop, self.btn_restart):
+                btn.track_dirty(tracker)
+            return
+
+        # фон, тонировка слоу-мо и полноэкранные подсказки меняют весь кадр
+        tracker.watch(
+            "game_bg",
+            (int(self.bg_y), self.slowmo_active and self.slowmo_tint, self.slowmo_intensity,
+             self.show_start_hint, self.show_exit_confirm, self.overlays.levels()),
+        )
+
+        self.particles.track_dirty(tracker)
+        for guy in self.balloon_guys:
+            guy.track_dirty(tracker, visible=self.people_enabled and self.people_visible)
+
+        rot_rope_hook, rope_hook_rect = self._rope_hook_sprite()
+        tracker.track("rope", rot_rope_hook, rope_hook_rect)
+
+        panel_rect, _, _ = self._hud_layout()
+        tracker.track("hud", (self.score, self.misses), panel_rect, atomic=True)
+
+        combo_label = self._combo_label()
+        if combo_label:
+            combo_surf = text_cache.render(self.combo_font, combo_label[0], combo_label[1])
+            combo_rect = combo_surf.get_rect(center=(SCREEN_WIDTH // 2, 120)).inflate(4, 4)
+            tracker.track("combo", combo_label, combo_rect)
+        else:
+            tracker.track("combo", None, None)
+
+        self.btn_restart_game.track_dirty(tracker)
+        self.tower.track_dirty(tracker, self.alpha)
+        self.block.track_dirty(tracker, self.tower, self.alpha)
 
     def draw(self):
+        # profiler.mark — конец этапа для панели F3 (без открытого кадра ничего не делает)
         self.draw_background()
+        profiler.mark("background")
         self.screen.blit(self.crane_image, (0, 0))
+        profiler.mark("crane")
         self.particles.draw(self.screen)
+        profiler.mark("particles")
 
-        if self.people_enabled:
+        if self.people_enabled and self.people_visible:
             self.balloon_guys.draw(self.screen)
+        profiler.mark("people")
 
-        rope_end_x = ROPE_ORIGIN_X + ROPE_LENGTH * math.sin(self.block.angle)
-        rope_end_y = ROPE_ORIGIN_Y + ROPE_LENGTH * math.cos(self.block.angle)
-
-        angle_deg = math.degrees(self.block.angle)
-        rot_rope_hook = pygame.transform.rotate(self.rope_hook_image, angle_deg)
-        rope_hook_rect = rot_rope_hook.get_rect()
-
-        mid_x = (ROPE_ORIGIN_X + rope_end_x) / 2
-        mid_y = (ROPE_ORIGIN_Y + rope_end_y) / 2
-        rope_hook_rect.center = (mid_x, mid_y)
-
+        rot_rope_hook, rope_hook_rect = self._rope_hook_sprite()
         self.screen.blit(rot_rope_hook, rope_hook_rect)
+        profiler.mark("crane")
 
         self.show_score()
         self.btn_restart_game.draw(self.screen)
-        self.tower.wobble()
+        profiler.mark("hud")
 
         if self.tower.get_display():
-            self.tower.display(self.screen, scroll_y=0)
-        self.block.display(self.screen, self.tower, scroll_y=0)
-
-        if self.show_start_hint:
-            self.draw_start_hint()
-        if self.show_exit_confirm:
-            self.draw_exit_confirm()
+            self.tower.display(self.screen, scroll_y=0, alpha=self.alpha)
+        profiler.mark("tower")
+        self.block.display(self.screen, self.tower, scroll_y=0, alpha=self.alpha)
+        profiler.mark("block")
 
-    def draw_start_hint(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 120))
-        self.screen.blit(overlay, (0, 0))
+        self.overlays.draw(self.screen, "start_hint", self.show_start_hint)
+        self.overlays.draw(self.screen, "exit_confirm", self.show_exit_confirm)
+        profiler.mark("overlays")
 
-        title = self.hint_title_font.render("Подсказка", True, WHITE)
-        line1 = self.hint_text_font.render("Нажмите SPACE,", True, WHITE)
-        line2 = self.hint_text_font.render("чтобы поставить блок", True, WHITE)
+    def _build_start_hint(self, surface):
+        title = text_cache.render(self.hint_title_font, "Подсказка", WHITE)
+        line1 = text_cache.render(self.hint_text_font, "Нажмите SPACE,", WHITE)
+        line2 = text_cache.render(self.hint_text_font, "чтобы поставить блок", WHITE)
 
         cx = SCREEN_WIDTH // 2
         title_rect = title.get_rect(center=(cx, 260))
         line1_rect = line1.get_rect(center=(cx, 310))
         line2_rect = line2.get_rect(center=(cx, 350))
 
-        self.screen.blit(title, title_rect)
-        self.screen.blit(line1, line1_rect)
-        self.screen.blit(line2, line2_rect)
+        surface.blit(title, title_rect)
+        surface.blit(line1, line1_rect)
+        surface.blit(line2, line2_rect)
 
-    def draw_exit_confirm(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
+    def _build_exit_confirm(self, surface):
 
         panel_width = 450
         panel_height = 220
@@ -277,23 +382,23 @@ class Game:
         base_color = (180, 200, 230)
         border_color = (20, 20, 20)
 
-        pygame.draw.rect(self.screen, base_color, panel_rect, border_radius=16)
-        pygame.draw.rect(self.screen, border_color, panel_rect, 3, border_radius=16)
+        pygame.draw.rect(surface, base_color, panel_rect, border_radius=16)
+        pygame.draw.rect(surface, border_color, panel_rect, 3, border_radius=16)
 
-        title1 = self.confirm_font.render("Вы уверены что", True, BLACK)
-        title2 = self.confirm_font.render("хотите выйти?", True, BLACK)
-        line1 = self.confirm_small_font.render("ENTER - подтвердить", True, BLACK)
-        line2 = self.confirm_small_font.render("ESC - отменить", True, BLACK)
+        title1 = text_cache.render(self.confirm_font, "Вы уверены что", BLACK)
+        title2 = text_cache.render(self.confirm_font, "хотите выйти?", BLACK)
+        line1 = text_cache.render(self.confirm_small_font, "ENTER - подтвердить", BLACK)
+        line2 = text_cache.render(self.confirm_small_font, "ESC - отменить", BLACK)
 
         title1_rect = title1.get_rect(center=(cx, cy - 50))
         title2_rect = title2.get_rect(center=(cx, cy - 20))
         line1_rect = line1.get_rect(center=(cx, cy + 30))
         line2_rect = line2.get_rect(center=(cx, cy + 60))
 
-        self.screen.blit(title1, title1_rect)
-        self.screen.blit(title2, title2_rect)
-        self.screen.blit(line1, line1_rect)
-        self.screen.blit(line2, line2_rect)
+        surface.blit(title1, title1_rect)
+        surface.blit(title2, title2_rect)
+        surface.blit(line1, line1_rect)
+        surface.blit(line2, line2_rect)
 
     def handle_game_events(self, event):
         if self.show_exit_confirm:
@@ -311,36 +416,50 @@ class Game:
             if event.key == pygame.K_ESCAPE:
                 self.show_exit_confirm = True
             elif event.key == pygame.K_SPACE:
-                if self.show_start_hint:
-                    self.show_start_hint = False
-                    
-                    # 🎙️ START при первом нажатии
-                    if not self.start_phrase_played and not self.sound_muted:
-                        self.sounds['start'].play()
-                        self.start_phrase_played = True
-                    
-                if self.block.get_state() == "ready":
-                    self.block.drop(self.tower)
+                self.apply_input(INPUT_SPACE)
         return None
 
-    def activate_slowmo(self, duration=SLOWMO_DURATION, factor=SLOWMO_FACTOR):
-        """🎬 Активировать эффект замедления"""
-        self.slowmo_active = True
-        self.slowmo_timer = duration
-        self.slowmo_intensity = factor
+    def apply_input(self, code):
+        """Игровой ввод перед следующим шагом (живой или из реплея)."""
+        if self.replay is not None:
+            self.replay.record(self.frame, code)
+
+        if code == INPUT_SPACE:
+            if self.show_start_hint:
+                self.show_start_hint = False
+                
+                # 🎙️ START при первом нажатии
+                if not self.start_phrase_played and not self.sound_muted:
+                    self.sounds['start'].play()
+                    self.start_phrase_played = True
+                
+            self.drop()
+
+    def save_replay(self):
+        """Записать реплей текущей партии (если запись включена)."""
+        if self.replay is None:
+            return
+        self.replay.finish(self.frame, self.score)
+        self.replay.save(self.record_to)
+
+    def advance(self, dt):
+        """
+        Прошло dt секунд реального времени: выполнить нужное число шагов update()
+        (SIM_HZ в секунду игрового времени) и запомнить alpha для отрисовки.
+        """
+        self.clock.time_scale = self.time_scale()
+        for _ in range(self.clock.advance(dt)):
+            self.update()
+            if self.game_over:
+                break
+        self.alpha = self.clock.alpha
 
     def update(self):
-        # 🎬 ОБНОВЛЕНИЕ СЛОУ-МО
-        if self.slowmo_active:
-            self.slowmo_timer -= 1
-            if self.slowmo_timer <= 0:
-                self.slowmo_active = False
-                self.slowmo_intensity = 1.0
-        
-        time_scale = self.slowmo_intensity if self.slowmo_active else 1.0
-        
+        """Один шаг симуляции (1 / SIM_HZ секунды игрового времени)."""
+        state = self.block.get_state()
+
         # 🎙️ ТАЙМЕР БЕЗДЕЙСТВИЯ (4 секунды)
-        if self.block.get_state() == "ready":
+        if state == "ready":
             if self.last_action_time == 0:
                 self.last_action_time = pygame.time.get_ticks()
             
@@ -348,155 +467,56 @@ class Game:
                 if not self.sound_muted:
                     self.sounds['go'].play()
                 self.last_action_time = pygame.time.get_ticks()
-        
-        state = self.block.get_state()
-
-        if state == "ready":
-            combo_speed_boost = 1.0
-            if self.combo >= COMBO_TIER_3:
-                combo_speed_boost = 2.5
-            elif self.combo >= COMBO_TIER_2:
-                combo_speed_boost = 2.0
-            elif self.combo >= COMBO_TIER_1:
-                combo_speed_boost = 1.5
-            
-            self.block.game_force = self.force * combo_speed_boost * time_scale
-            self.block.swing()
-
-        elif state == "dropped":
-            self.block.drop(self.tower)
-
         elif state == "landed":
             # 🎙️ СБРОС ТАЙМЕРА
             self.last_action_time = pygame.time.get_ticks()
-            
-            if self.block.to_build(self.tower):
-                self.tower.build(self.block)
-                self.force *= 1.015
-                
-                # 🎙️ СЧЁТЧИК БЛОКОВ
-                self.blocks_placed += 1
-
-                block_screen_x = self.tower.xlist[-1] + BLOCK_WIDTH // 2 + self.tower.x + self.tower.change
-                block_screen_y = self.tower.y + BLOCK_HEIGHT * (self.tower.size - 1) - BLOCK_HEIGHT // 2
-
-                if self.tower.is_golden():
-                    # 🎙️ PERFECT при золотом
-                    if not self.sound_muted:
-                        self.sounds['perfect'].play()
-                        self.sounds['gold'].play()
-                    
-                    self.particles.add_explosion(block_screen_x, block_screen_y, count=50)
-                    
-                    self.combo += 1
-                    self.combo_timer = 180
-                    score_mult = 1 + min(self.combo * 0.3, 2.5)
-                    
-                    if self.combo >= COMBO_TIER_3:
-                        self.activate_slowmo(duration=45, factor=0.25)
-                    elif self.combo >= COMBO_TIER_2:
-                        self.activate_slowmo(duration=30, factor=0.3)
-                    
-                    self.score += int(2 * score_mult)
-                    self.save_manager.add_coins(int(10 * score_mult))
-                    self.coins_earned += int(10 * score_mult)
-                    
-                    # 🎙️ ВЕХИ
-                    self._play_milestone_phrase(is_golden=True)
-                else:
-                    self.particles.add_build_particles(block_screen_x, block_screen_y, count=30)
-                    self.combo = 0
-                    
-                    if not self.sound_muted:
-                        self.sounds['build'].play()
-                    self.score += 1
-                    self.save_manager.add_coins(5)
-                    self.coins_earned += 5
-                    
-                    # 🎙️ ВЕХИ
-                    self._play_milestone_phrase(is_golden=False)
-
-            if self.tower.size >= 2:
-                self.block.collapse(self.tower)
-
-        elif state == "over":
-            surf = self.tower.unbuild(self.block)
-            self.screen.blit(surf, (self.tower.x + self.tower.change, self.tower.y + 64))
-            self.block.to_fall(self.tower)
-
-            if not self.game_over_reason:
-                if not self.sound_muted:
-                    self.sounds['fall'].play()
-                    self.sounds['over'].play()
-                self.game_over_reason = "collapse"
-                self.end_game()
-
-        elif state == "scroll" and not self.tower.is_scrolling():
-            self.block.respawn(self.tower)
-            if self.tower.size >= 5:
-                self.tower.reset()
-
-            # 🎙️ NICE TRY
-        elif state == "miss":
-            self.misses += 1
-            self.last_action_time = pygame.time.get_ticks()
-            # 🎯 ПРОВЕРКА РЕКОРДА ПЕРЕД NICE_TRY
-            old_high_score = self.save_manager.get_high_score()
-            is_new_record = self.score > old_high_score
-            
-            # 🎙️ NICE TRY (только если НЕ новый рекорд)
-            if not self.sound_muted:
-                if not is_new_record:
-                    self.sounds['nice_try'].play()
-                self.sounds['fall'].play()
 
-            if self.misses >= MAX_MISSES:
-                self.game_over_reason = "misses"
-                self.end_game()
-            else:
-                self.block.respawn(self.tower)
-
-        if self.bg_anim_active:
-            self.bg_anim_progress += 1
-            progress_ratio = self.bg_anim_progress / BG_SCROLL_DURATION
-            self.bg_y = self.bg_anim_target_y * progress_ratio + self.bg_y * (1 - progress_ratio)
-
-            if self.bg_anim_progress >= BG_SCROLL_DURATION:
-                self.bg_y = self.bg_anim_target_y
-                self.bg_anim_active = False
-                self.bg_anim_progress = 0
-        else:
-            if self.tower.size >= TOWER_BLOCKS_PER_STEP:
-                self.tower.size = BASE_ONSCREEN_BLOCKS
-                self.tower.onscreen = self.tower.size
-                self.tower.height = self.tower.size * BLOCK_HEIGHT
-                base_y = SCREEN_HEIGHT - BLOCK_HEIGHT
-                self.tower.y = base_y - (self.tower.height - BLOCK_HEIGHT)
-                self.tower.xlist = self.tower.xlist[-self.tower.size:]
-                self.tower.sprite_list = self.tower.sprite_list[-self.tower.size:]
-                self.tower.golden_list = self.tower.golden_list[-self.tower.size:]
-
-                self.bg_anim_active = True
-                self.bg_anim_progress = 0
-                self.bg_anim_target_y = self.bg_y + BG_SCROLL_STEP
-
-                min_bg_y = SCREEN_HEIGHT - self.bg_big.get_height()
-                if self.bg_anim_target_y < min_bg_y:
-                    self.bg_anim_target_y = min_bg_y
-
-                if not self.people_enabled:
-                    self.people_enabled = True
+        # frame — число шагов вместе с текущим (end_game внутри step пишет его в реплей)
+        self.frame += 1
+        self.step()
 
+        # 🎈 обновляем и на низком качестве (оно только прячет отрисовку): self.rng общий,
+        # пропуск update сдвинул бы его и реплей разошёлся бы
         if self.people_enabled:
             self.balloon_guys.update()
 
-        for _ in range(int(1 * time_scale)):
-            self.particles.update()
-        
-        if self.combo_timer > 0:
-            self.combo_timer -= 1
+        self.particles.update()
+
+    def on_build(self, golden, x, y, coins):
+        if golden:
+            # 🎙️ PERFECT при золотом
+            if not self.sound_muted:
+                self.sounds['perfect'].play()
+                self.sounds['gold'].play()
+            self.particles.add_explosion(x, y, count=50)
+        else:
+            self.particles.add_build_particles(x, y, count=30)
+            if not self.sound_muted:
+                self.sounds['build'].play()
+
+        if self.persist:
+            self.save_manager.add_coins(coins)
+
+        # 🎙️ ВЕХИ
+        self._play_milestone_phrase(is_golden=golden)
+
+    def on_miss(self):
+        self.last_action_time = pygame.time.get_ticks()
+        # 🎯 ПРОВЕРКА РЕКОРДА ПЕРЕД NICE_TRY
+        old_high_score = self.save_manager.get_high_score()
+        is_new_record = self.score > old_high_score
 
-        self.check_game_over()
+        # 🎙️ NICE TRY (только если НЕ новый рекорд)
+        if not self.sound_muted:
+            if not is_new_record:
+                self.sounds['nice_try'].play()
+            self.sounds['fall'].play()
+
+    def on_collapse(self, falling):
+        if not self.sound_muted:
+            if falling:
+                self.sounds['fall'].play()
+            self.sounds['over'].play()
 
     def _play_milestone_phrase(self, is_golden=False):
         """🎙️ Фразы по вехам (пропускаются если золотой блок)"""
@@ -523,83 +543,78 @@ class Game:
                 self.milestone_cycle += 1
 
 
-    def check_game_over(self):
-        width = self.tower.get_width()
-
-        if width < -140:
-            self.tower.collapse("l")
-            if not self.game_over_reason:
-                if not self.sound_muted:
-                    self.sounds['over'].play()
-                self.game_over_reason = "collapse"
-                self.end_game()
-        elif width > 140:
-            self.tower.collapse("r")
-            if not self.game_over_reason:
-                if not self.sound_muted:
-                    self.sounds['over'].play()
-                self.game_over_reason = "collapse"
-                self.end_game()
-
     def end_game(self):
-        self.game_over = True
+        GameCore.end_game(self)
+        self.save_replay()
+        self.show_start_hint = False
+        if not self.persist:
+            return
         
         # 🎙️ TOP SCORE
         old_high_score = self.save_manager.get_high_score()
         self.save_manager.update_high_score(self.score)
+        self.save_manager.add_game()
+        if self.history is not None:
+            self.history.record(
+                tower_id=self.current_tower_id,
+                score=self.score,
+                blocks=self.blocks_placed,
+                golden=self.golden_count,
+                max_combo=self.max_combo,
+                misses=self.misses,
+                reason=self.game_over_reason,
+                duration=(pygame.time.get_ticks() - self.started_at) / 1000,
+            )
+        # монеты за партию и рекорд — на диск сейчас, но в фоновом потоке
+        self.save_manager.flush(wait=False)
         
         if self.score > old_high_score and not self.sound_muted:
             self.sounds['top_score'].play()
-        
-        self.show_start_hint = False
 
     def reset(self):
+        # недоигранную партию тоже сохраняем в реплей
+        if not self.game_over:
+            self.save_replay()
+
         self.current_tower_id = self.save_manager.get_selected_tower()
         self.tower_sprites = self.asset_loader.load_tower_sprites(self.current_tower_id)
 
-        self.block = Block(self.tower_sprites, block_number=0)
-        self.tower = Tower(self.tower_sprites)
+        self.new_game(Block(self.tower_sprites, block_number=0), Tower(self.tower_sprites))
 
-        self.particles = ParticleSystem()
-        self.combo = 0
-        self.combo_timer = 0
-        self.slowmo_active = False
-        self.slowmo_timer = 0
-        self.slowmo_intensity = 1.0
+        self.seed = random.getrandbits(63)
+        self.rng = random.Random(self.seed)
+        self.frame = 0
+        if self.replay is not None:
+            self.replay = Replay(self.seed, self.current_tower_id)
+
+        self.particles = ParticleSystem(seed=self.seed)
+        self.balloon_guys.empty()
+        self._create_balloon_guys()
         
         # 🎙️ СБРОС
         self.last_action_time = 0
-        self.blocks_placed = 0
         self.milestone_cycle = 0
         self.start_phrase_played = False
 
-        self.misses = 0
-        self.score = 0
-        self.bg_y = SCREEN_HEIGHT - self.bg_big.get_height()
-        self.bg_anim_active = False
-        self.bg_anim_progress = 0
-        self.force = INITIAL_FORCE
-        self.game_over = False
-        self.game_over_reason = None
-        self.coins_earned = 0
+        self.started_at = pygame.time.get_ticks()
+
         self.show_start_hint = True
         self.show_exit_confirm = False
-        self.people_enabled = False
 
-    def draw_game_over_screen(self):
-        self.screen.blit(self.bg_end, (0, 0))
+    def _build_game_over(self, surface):
+        surface.blit(self.bg_end, (0, 0))
 
-        title = self.over_font.render("GAME OVER", True, BLACK)
-        score_text = self.score_font.render(f"SCORE: {self.score}", True, BLACK)
+        title = text_cache.render(self.over_font, "GAME OVER", BLACK)
+        score_text = text_cache.render(self.score_font, f"SCORE: {self.score}", BLACK)
 
         if self.game_over_reason == "misses":
             reason_str = f"Слишком много промахов ({MAX_MISSES})"
         else:
             reason_str = "Башня обрушилась"
 
-        reason_text = self.reason_font.render(reason_str, True, (200, 0, 0))
+        reason_text = text_cache.render(self.reason_font, reason_str, (200, 0, 0))
         coins_str = f"+{self.coins_earned} монет"
-        coins_text = self.coins_font.render(coins_str, True, BLACK)
+        coins_text = text_cache.render(self.coins_font, coins_str, BLACK)
 
         cx = SCREEN_WIDTH // 2
         panel_width = SCREEN_WIDTH - 80
@@ -612,38 +627,44 @@ class Game:
         shadow_rect.x += 4
         shadow_rect.y += 4
 
-        pygame.draw.rect(self.screen, (0, 0, 0, 80), shadow_rect, border_radius=16)
-        pygame.draw.rect(self.screen, base_color, panel_rect, border_radius=16)
-        pygame.draw.rect(self.screen, border_color, panel_rect, 3, border_radius=16)
+        pygame.draw.rect(surface, (0, 0, 0, 80), shadow_rect, border_radius=16)
+        pygame.draw.rect(surface, base_color, panel_rect, border_radius=16)
+        pygame.draw.rect(surface, border_color, panel_rect, 3, border_radius=16)
 
         y = panel_rect.top + 40
         title_rect = title.get_rect(center=(cx, y))
-        self.screen.blit(title, title_rect)
+        surface.blit(title, title_rect)
 
         y += 60
         score_rect = score_text.get_rect(center=(cx, y))
-        self.screen.blit(score_text, score_rect)
+        surface.blit(score_text, score_rect)
 
         y += 45
         reason_rect = reason_text.get_rect(center=(cx, y))
-        self.screen.blit(reason_text, reason_rect)
+        surface.blit(reason_text, reason_rect)
 
         y += 40
         coins_rect = coins_text.get_rect(center=(cx, y))
-        self.screen.blit(coins_text, coins_rect)
+        surface.blit(coins_text, coins_rect)
 
-        self.btn_back.draw(self.screen)
-        self.btn_shop.draw(self.screen)
-        self.btn_restart.draw(self.screen)
+        for btn in (self.btn_back, self.btn_shop, self.btn_restart):
+            btn.draw(surface, hovered=False)
 
         hint_y = 500
-        hint1 = self.hint_font.render("ESC", True, BLACK)
-        hint2 = self.hint_font.render("S", True, BLACK)
-        hint3 = self.hint_font.render("R", True, BLACK)
+        hint1 = text_cache.render(self.hint_font, "ESC", BLACK)
+        hint2 = text_cache.render(self.hint_font, "S", BLACK)
+        hint3 = text_cache.render(self.hint_font, "R", BLACK)
         btn_spacing = 100
-        self.screen.blit(hint1, hint1.get_rect(center=(cx - btn_spacing, hint_y)))
-        self.screen.blit(hint2, hint2.get_rect(center=(cx, hint_y)))
-        self.screen.blit(hint3, hint3.get_rect(center=(cx + btn_spacing, hint_y)))
+        surface.blit(hint1, hint1.get_rect(center=(cx - btn_spacing, hint_y)))
+        surface.blit(hint2, hint2.get_rect(center=(cx, hint_y)))
+        surface.blit(hint3, hint3.get_rect(center=(cx + btn_spacing, hint_y)))
+
+    def draw_game_over_screen(self):
+        key = (self.score, self.game_over_reason, self.coins_earned)
+        self.screen.blit(self.game_over_layer.get(key, self._build_game_over), (0, 0))
+        for btn in (self.btn_back, self.btn_shop, self.btn_restart):
+            if btn.is_hovered:
+                btn.draw(self.screen)
 
     def handle_game_over_input(self, event):
         if self.btn_back.handle_event(event):
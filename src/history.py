@@ -0,0 +1,150 @@
+import queue
+import sqlite3
+import threading
+import time
+
+from src.constants import HISTORY_DB_PATH
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id        INTEGER PRIMARY KEY,
+    played_at REAL    NOT NULL,
+    tower_id  INTEGER NOT NULL,
+    score     INTEGER NOT NULL,
+    blocks    INTEGER NOT NULL,
+    golden    INTEGER NOT NULL,
+    max_combo INTEGER NOT NULL,
+    misses    INTEGER NOT NULL,
+    reason    TEXT,
+    duration  REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_tower_score ON games (tower_id, score DESC);
+CREATE INDEX IF NOT EXISTS games_score ON games (score DESC);
+"""
+
+COLUMNS = ("played_at", "tower_id", "score", "blocks", "golden",
+           "max_combo", "misses", "reason", "duration")
+
+# сигнал фоновому потоку: дописать очередь и выйти
+_STOP = object()
+
+
+class GameHistory:
+    """
+    История сыгранных партий в SQLite.
+
+    record() только кладёт партию в очередь — вставляет фоновый поток
+    (своё соединение, все накопившиеся партии одной транзакцией), так что
+    кадр на диск не ждёт. Запросы идут через отдельное соединение;
+    WAL позволяет читать, пока поток пишет.
+    id растёт с каждой партией, поэтому "последние N" — это ORDER BY id DESC
+    по первичному ключу, а топ по башне — по индексу (tower_id, score).
+    """
+
+    def __init__(self, db_path=HISTORY_DB_PATH):
+        self.db_path = db_path
+        self.queue = queue.Queue()
+        self.thread = None
+        self.inserted = 0
+        self.batches = 0
+
+        self.conn = self._connect()
+        self.conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ---------- ЗАПИСЬ ----------
+    def record(self, tower_id, score, blocks, golden, max_combo, misses, reason, duration):
+        """Добавить законченную партию (не блокирует)."""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._writer, name="history-writer", daemon=True)
+            self.thread.start()
+        self.queue.put((time.time(), tower_id, score, blocks, golden,
+                        max_combo, misses, reason, duration))
+
+    def _writer(self):
+        conn = self._connect()
+        sql = f"INSERT INTO games ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+        while True:
+            rows = [self.queue.get()]
+            # всё, что успело накопиться, — одной транзакцией
+            while True:
+                try:
+                    rows.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = _STOP in rows
+            batch = [row for row in rows if row is not _STOP]
+            if batch:
+                try:
+                    with conn:
+                        conn.executemany(sql, batch)
+                    self.inserted += len(batch)
+                    self.batches += 1
+                except sqlite3.Error as e:
+                    print(f"Ошибка записи истории: {e}")
+            for _ in rows:
+                self.queue.task_done()
+            if stop:
+                conn.close()
+                return
+
+    def flush(self):
+        """Дождаться, пока всё из очереди попадёт в базу."""
+        self.queue.join()
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(_STOP)
+            self.thread.join()
+            self.thread = None
+        self.conn.close()
+
+    # ---------- ЗАПРОСЫ ----------
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def top_scores(self, tower_id=None, limit=10):
+        """Лучшие партии: [(score, tower_id, blocks, played_at)], по башне или по всем."""
+        if tower_id is None:
+            return self.conn.execute(
+                "SELECT score, tower_id, blocks, played_at FROM games "
+                "ORDER BY score DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return self.conn.execute(
+            "SELECT score, tower_id, blocks, played_at FROM games "
+            "WHERE tower_id = ? ORDER BY score DESC LIMIT ?", (tower_id, limit)
+        ).fetchall()
+
+    def average_score(self, last=100):
+        """Средний счёт последних last партий (None, если партий нет)."""
+        return self.conn.execute(
+            "SELECT AVG(score) FROM (SELECT score FROM games ORDER BY id DESC LIMIT ?)", (last,)
+        ).fetchone()[0]
+
+    def golden_rate_trend(self, bucket=20, buckets=10):
+        """
+        Доля золотых блоков по группам из bucket партий, от старых к новым
+        (последние bucket * buckets партий).
+        """
+        rows = self.conn.execute(
+            "SELECT SUM(golden), SUM(blocks) FROM ("
+            "  SELECT golden, blocks, ROW_NUMBER() OVER (ORDER BY id DESC) - 1 AS n"
+            "  FROM games ORDER BY id DESC LIMIT ?"
+            ") GROUP BY n / ? ORDER BY n / ? DESC",
+            (bucket * buckets, bucket, bucket),
+        ).fetchall()
+        return [golden / blocks if blocks else 0.0 for golden, blocks in rows]
+
+    def stats(self):
+        return {
+            "inserted": self.inserted,
+            "batches": self.batches,
+            "queued": self.queue.qsize(),
+        }
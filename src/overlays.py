@@ -0,0 +1,120 @@
+from collections import OrderedDict
+
+import pygame
+
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, OVERLAY_TINT_CACHE_ENTRIES, OVERLAY_FADE_FRAMES
+
+
+class Overlay:
+    """
+    Готовый оверлей: затемнение экрана + слой с содержимым на прозрачном фоне
+    (текст на уже затемнённом SRCALPHA-слое смешивался бы иначе, чем на экране).
+    level — текущая видимость 0..1 для плавного появления.
+    """
+
+    def __init__(self, build, dim, fade_frames):
+        self.build = build
+        self.dim = dim
+        self.fade_frames = fade_frames
+        self.dim_surface = None
+        self.surface = None
+        self.level = 0.0
+
+    def step(self, visible):
+        target = 1.0 if visible else 0.0
+        if self.fade_frames <= 0:
+            self.level = target
+        elif self.level < target:
+            self.level = min(target, self.level + 1.0 / self.fade_frames)
+        elif self.level > target:
+            self.level = max(target, self.level - 1.0 / self.fade_frames)
+
+
+class OverlayManager:
+    """
+    Полноэкранные оверлеи (подсказка, подтверждение выхода, тонировка слоу-мо).
+    Каждый оверлей рисуется один раз и дальше выводится готовыми Surface (затемнение + содержимое).
+    Плавное появление — через set_alpha на том же Surface, без новых Surface в кадре.
+    """
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT), fade_frames=OVERLAY_FADE_FRAMES,
+                 tint_entries=OVERLAY_TINT_CACHE_ENTRIES):
+        self.size = size
+        self.fade_frames = fade_frames
+        self.overlays = {}
+
+        self.tint_entries = tint_entries
+        self.tints = OrderedDict()
+
+        self.builds = 0
+        self.blits = 0
+
+    # ---------- ОВЕРЛЕИ С СОДЕРЖИМЫМ ----------
+    def register(self, name, build, dim=(0, 0, 0, 120), fade_frames=None):
+        """
+        build(surface) рисует содержимое оверлея в прозрачный Surface размера экрана,
+        dim — RGBA затемнения под ним.
+        """
+        if fade_frames is None:
+            fade_frames = self.fade_frames
+        self.overlays[name] = Overlay(build, dim, fade_frames)
+
+    def _prepare(self, overlay):
+        if overlay.surface is None:
+            overlay.dim_surface = pygame.Surface(self.size, pygame.SRCALPHA)
+            overlay.dim_surface.fill(overlay.dim)
+            overlay.surface = pygame.Surface(self.size, pygame.SRCALPHA)
+            overlay.build(overlay.surface)
+            self.builds += 1
+
+    def draw(self, screen, name, visible):
+        """Сдвинуть видимость к visible и вывести оверлей, если он хоть немного виден."""
+        overlay = self.overlays[name]
+        overlay.step(visible)
+        if overlay.level <= 0.0:
+            return
+        self._prepare(overlay)
+        alpha = round(255 * overlay.level)
+        for surface in (overlay.dim_surface, overlay.surface):
+            surface.set_alpha(alpha)
+            screen.blit(surface, (0, 0))
+        self.blits += 1
+
+    def levels(self):
+        """Текущая видимость всех оверлеев (для dirty-rect: меняется во время фейда)."""
+        return tuple(overlay.level for overlay in self.overlays.values())
+
+    def invalidate(self, name=None):
+        """Перестроить оверлей(и) при следующем показе."""
+        targets = self.overlays.values() if name is None else (self.overlays[name],)
+        for overlay in targets:
+            overlay.dim_surface = None
+            overlay.surface = None
+
+    # ---------- ТОНИРОВКА ----------
+    def tint(self, screen, color, alpha):
+        """Залить экран полупрозрачным цветом: один Surface на каждое значение альфы."""
+        alpha = int(alpha)
+        if alpha <= 0:
+            return
+        key = (tuple(color), alpha)
+        surface = self.tints.get(key)
+        if surface is None:
+            surface = pygame.Surface(self.size, pygame.SRCALPHA)
+            surface.fill((*color, alpha))
+            self.tints[key] = surface
+            self.builds += 1
+            if len(self.tints) > self.tint_entries:
+                self.tints.popitem(last=False)
+        else:
+            self.tints.move_to_end(key)
+        screen.blit(surface, (0, 0))
+        self.blits += 1
+
+    def stats(self):
+        return {
+            "builds": self.builds,
+            "blits": self.blits,
+            "overlays": len(self.overlays),
+            "tints": len(self.tints),
+        }
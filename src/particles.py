@@ -1,62 +1,211 @@
 import pygame
-import math
-import random
+import numpy as np
 from src.constants import *
 
+
+class ParticleAtlas:
+    """
+    Заранее нарисованные круги частиц в одном Surface.
+    Строка атласа = (цвет палитры, корзина прозрачности), столбец = радиус.
+    Для аддитивного режима цвет заранее умножен на альфу (BLEND_RGB_ADD её не учитывает).
+    Перестраивается только когда в палитре появился новый цвет.
+    """
+
+    def __init__(self, max_radius=PARTICLE_MAX_RADIUS, alpha_buckets=PARTICLE_ALPHA_BUCKETS):
+        self.max_radius = max_radius
+        self.alpha_buckets = alpha_buckets
+        self.cell = max_radius * 4
+        self.palette_size = 0
+        self.surface = None
+
+    def bucket_alpha(self, bucket):
+        return round(bucket * 255 / (self.alpha_buckets - 1))
+
+    def rows_per_color(self):
+        # обычные + аддитивные варианты
+        return self.alpha_buckets * 2
+
+    def ensure(self, palette):
+        if self.surface is not None and self.palette_size == len(palette):
+            return
+        cell = self.cell
+        rows = len(palette) * self.rows_per_color()
+        surf = pygame.Surface((self.max_radius * cell, rows * cell), pygame.SRCALPHA)
+
+        for color_index, color in enumerate(palette):
+            for bucket in range(self.alpha_buckets):
+                alpha = self.bucket_alpha(bucket)
+                premultiplied = tuple(c * alpha // 255 for c in color)
+                variants = ((0, (*color, alpha)), (1, (*premultiplied, 255)))
+                for additive, draw_color in variants:
+                    row = self.row(color_index, bucket, additive)
+                    for radius in range(1, self.max_radius + 1):
+                        center = ((radius - 1) * cell + cell // 2, row * cell + cell // 2)
+                        pygame.draw.circle(surf, draw_color, center, radius)
+
+        self.surface = surf
+        self.palette_size = len(palette)
+
+    def row(self, color_index, bucket, additive):
+        return (color_index * 2 + additive) * self.alpha_buckets + bucket
+
+
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
-        self.max_particles = 200  # УВЕЛИЧИЛИ!
-        
+    """
+    Частицы в виде structure-of-arrays: позиции, скорости, жизнь, размер и
+    индекс цвета лежат в numpy-массивах на max_particles элементов,
+    живые частицы — первые self.count. Обновление векторное,
+    мёртвые частицы выкидываются маской (порядок живых сохраняется).
+    """
+
+    def __init__(self, max_particles=MAX_PARTICLES, seed=None,
+                 additive_explosions=PARTICLE_ADDITIVE_EXPLOSIONS):
+        self.max_particles = max_particles
+        # взрывы складываются с фоном (BLEND_RGB_ADD) и остаются яркими
+        self.additive_explosions = additive_explosions
+        self.rng = np.random.default_rng(seed)
+        self.count = 0
+
+        # качество (src/quality.py): сколько частиц живёт одновременно и множитель count
+        self.limit = max_particles
+        self.count_scale = 1.0
+
+        self.pos = np.zeros((max_particles, 2), dtype=np.float64)
+        self.vel = np.zeros((max_particles, 2), dtype=np.float64)
+        self.life = np.zeros(max_particles, dtype=np.int32)
+        self.max_life = np.ones(max_particles, dtype=np.int32)
+        self.size = np.zeros(max_particles, dtype=np.float64)
+        self.color_index = np.zeros(max_particles, dtype=np.int32)
+        self.additive = np.zeros(max_particles, dtype=np.int32)
+
+        # палитра: индекс -> RGB, чтобы не хранить кортежи на каждую частицу
+        self.palette = []
+        self.palette_lookup = {}
+        self.atlas = ParticleAtlas()
+
+    def __len__(self):
+        return self.count
+
+    def _color_index(self, color):
+        color = tuple(color[:3])
+        index = self.palette_lookup.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.palette_lookup[color] = index
+        return index
+
+    def set_quality(self, limit, count_scale):
+        """Уменьшить эффекты: не больше limit частиц, новых — count * count_scale."""
+        self.limit = min(limit, self.max_particles)
+        self.count_scale = count_scale
+
+    def _spawn(self, x, y, count, vx_range, vy_range, life, color, size_range, additive=False):
+        # 🎲 rng всегда тянет полный count, лишнее отбрасываем после: поток случайных
+        # чисел не зависит от качества и заполненности, реплей повторяется при любом уровне
+        vx = self.rng.uniform(vx_range[0], vx_range[1], count)
+        vy = self.rng.uniform(vy_range[0], vy_range[1], count)
+        size = self.rng.uniform(size_range[0], size_range[1], count)
+        n = min(int(count * self.count_scale), self.limit - self.count)
+        if n <= 0:
+            return
+        s = slice(self.count, self.count + n)
+        self.pos[s, 0] = x
+        self.pos[s, 1] = y - BLOCK_HEIGHT // 4  # ↑ НА 1/4 БЛОКА ВЫШЕ
+        self.vel[s, 0] = vx[:n]
+        self.vel[s, 1] = vy[:n]
+        self.life[s] = life
+        self.max_life[s] = life
+        self.size[s] = size[:n]
+        self.color_index[s] = self._color_index(color)
+        self.additive[s] = int(additive)
+        self.count += n
+
     def add_explosion(self, x, y, color=(255, 255, 200), count=40):  # БЫЛО 25
         """🔥 ВЗРЫВ при золотом блоке"""
-        for _ in range(count):
-            if len(self.particles) < self.max_particles:
-                particle = {
-                    'x': x, 'y': y - BLOCK_HEIGHT//4,  # ↑ НА 1/4 БЛОКА ВЫШЕ
-                    'vx': random.uniform(-6, 6),
-                    'vy': random.uniform(-5, 1),
-                    'life': 60,  # Дольше живут
-                    'max_life': 60,
-                    'color': color,
-                    'size': random.uniform(4, 8)  # Больше
-                }
-                self.particles.append(particle)
-    
+        # Дольше живут, больше размер
+        self._spawn(x, y, count, (-6, 6), (-5, 1), 60, color, (4, 8),
+                    additive=self.additive_explosions)
+
     def add_build_particles(self, x, y, count=25):  # БЫЛО 15
         """💨 Пыль при обычном строительстве"""
-        for _ in range(count):
-            if len(self.particles) < self.max_particles:
-                particle = {
-                    'x': x, 'y': y - BLOCK_HEIGHT//4,  # ↑ НА 1/4 БЛОКА ВЫШЕ
-                    'vx': random.uniform(-4, 4),
-                    'vy': random.uniform(-1, 2),
-                    'life': 40,
-                    'max_life': 40,
-                    'color': (230, 210, 170),
-                    'size': random.uniform(2, 5)
-                }
-                self.particles.append(particle)
-    
+        self._spawn(x, y, count, (-4, 4), (-1, 2), 40, (230, 210, 170), (2, 5))
+
     def update(self):
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['vy'] += 0.12  # Меньше гравитация
-            particle['vx'] *= 0.96  # Медленнее затухает
-            particle['life'] -= 1
-            
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-    
+        n = self.count
+        if n == 0:
+            return
+
+        pos = self.pos[:n]
+        vel = self.vel[:n]
+        pos += vel
+        vel[:, 1] += PARTICLE_GRAVITY  # Меньше гравитация
+        vel[:, 0] *= PARTICLE_DRAG     # Медленнее затухает
+
+        life = self.life[:n]
+        life -= 1
+        alive = life > 0
+        if not alive.all():
+            self._compact(alive)
+
+    def _compact(self, alive):
+        n = self.count
+        k = int(np.count_nonzero(alive))
+        for arr in (self.pos, self.vel, self.life, self.max_life, self.size, self.color_index,
+                    self.additive):
+            arr[:k] = arr[:n][alive]
+        self.count = k
+
     def draw(self, screen):
-        for particle in self.particles:
-            alpha_ratio = particle['life'] / particle['max_life']
-            size = int(particle['size'] * alpha_ratio)
-            alpha = int(255 * alpha_ratio ** 0.7)  # Плавнее угасание
-            
-            if size > 0:
-                # БОЛЬШЕ И ЯРЧЕ
-                surf = pygame.Surface((size*4, size*4), pygame.SRCALPHA)
-                pygame.draw.circle(surf, (*particle['color'][:3], alpha), (size*2, size*2), max(1, size))
-                screen.blit(surf, (int(particle['x'] - size*2), int(particle['y'] - size*2)))
+        """Все частицы одним Surface.blits из атласа, без новых Surface."""
+        n = self.count
+        if n == 0:
+            return
+
+        alpha_ratio = self.life[:n] / self.max_life[:n]
+        sizes = (self.size[:n] * alpha_ratio).astype(np.int32)
+        alphas = 255 * alpha_ratio ** 0.7  # Плавнее угасание
+
+        visible = np.flatnonzero(sizes > 0)
+        if visible.size == 0:
+            return
+
+        atlas = self.atlas
+        atlas.ensure(self.palette)
+        cell = atlas.cell
+
+        sizes = np.minimum(sizes[visible], atlas.max_radius)
+        buckets = np.rint(alphas[visible] * (atlas.alpha_buckets - 1) / 255).astype(np.int32)
+        additive = self.additive[:n][visible]
+        rows = (self.color_index[:n][visible] * 2 + additive) * atlas.alpha_buckets + buckets
+
+        # БОЛЬШЕ И ЯРЧЕ: круг радиуса size в квадрате size*4, как раньше
+        half = sizes * 2
+        dest_x = (self.pos[:n, 0][visible] - half).astype(np.int32)
+        dest_y = (self.pos[:n, 1][visible] - half).astype(np.int32)
+        area_x = (sizes - 1) * cell + cell // 2 - half
+        area_y = rows * cell + cell // 2 - half
+        side = sizes * 4
+
+        dests = np.stack((dest_x, dest_y), axis=1).tolist()
+        areas = np.stack((area_x, area_y, side, side), axis=1).tolist()
+        flags = np.where(additive, pygame.BLEND_RGB_ADD, 0).tolist()
+
+        source = atlas.surface
+        screen.blits(
+            [(source, d, a, f) for d, a, f in zip(dests, areas, flags)],
+            doreturn=False,
+        )
+
+    def track_dirty(self, tracker):
+        n = self.count
+        if n == 0:
+            tracker.track(self, None, None)
+            return
+        # круг радиуса size лежит в квадрате size*4 вокруг позиции
+        reach = 2 * self.atlas.max_radius + 1
+        x0, y0 = self.pos[:n].min(axis=0)
+        x1, y1 = self.pos[:n].max(axis=0)
+        rect = pygame.Rect(int(x0) - reach, int(y0) - reach,
+                           int(x1 - x0) + 2 * reach + 1, int(y1 - y0) + 2 * reach + 1)
+        tracker.track(self, (n, int(self.life[:n].sum())), rect)
@@ -0,0 +1,89 @@
+"""
+Эталон для src/pendulum.py: тот же расчёт скалярным BlockCore/TowerCore
+по одному блоку, генератор входов и сверка результатов. Общий для
+tests/test_pendulum.py и benchmarks/bench_pendulum.py.
+"""
+from math import sin, cos
+
+import numpy as np
+
+from src.core import BlockCore, TowerCore
+from src.constants import (
+    INITIAL_FORCE,
+    FORCE_ACCELERATION,
+    ROPE_ORIGIN_X,
+    ROPE_ORIGIN_Y,
+    ROPE_LENGTH,
+    HOOK_BOTTOM_OFFSET,
+    HOOK_ATTACH_OFFSET_X,
+    HOOK_ATTACH_OFFSET_Y,
+    SCREEN_HEIGHT,
+    BLOCK_HEIGHT,
+)
+
+MAX_SWING_STEPS = 300
+X_TOLERANCE = 1e-6   # px: np.sin против math.sin за сотни шагов раскачки
+
+
+def make_inputs(count, seed=0):
+    """Блоки как после respawn: угол ±45, скорость 0, сила растёт с высотой башни и комбо."""
+    rng = np.random.default_rng(seed)
+    angle = rng.choice([-45.0, 45.0], count)
+    speed = np.zeros(count)
+    blocks = rng.integers(0, 60, count)
+    boost = rng.choice([1.0, 1.5, 2.0, 2.5], count)
+    force = INITIAL_FORCE * FORCE_ACCELERATION ** blocks * boost
+    steps = rng.integers(0, MAX_SWING_STEPS, count)
+    tower_x = rng.uniform(150, 300, count)
+    tower_y = SCREEN_HEIGHT - BLOCK_HEIGHT * rng.integers(1, 6, count)
+    return angle, speed, force, steps, tower_x, tower_y
+
+
+def scalar_swing_and_drop(angle, speed, force, steps, tower_x, tower_y):
+    """Тот же расчёт через BlockCore/TowerCore по одному блоку."""
+    n = len(angle)
+    x = np.empty(n)
+    landed = np.empty(n, dtype=bool)
+    golden = np.empty(n, dtype=bool)
+    fall_steps = np.empty(n, dtype=np.int64)
+    tower = TowerCore()
+    tower.size = 1
+    for i in range(n):
+        block = BlockCore()
+        a = float(angle[i])
+        block.angle = a
+        block.speed = float(speed[i])
+        block.game_force = float(force[i])
+        block.x = ROPE_ORIGIN_X + ROPE_LENGTH * sin(a) - HOOK_ATTACH_OFFSET_X
+        block.y = ROPE_ORIGIN_Y + ROPE_LENGTH * cos(a) + HOOK_BOTTOM_OFFSET - HOOK_ATTACH_OFFSET_Y
+        for _ in range(int(steps[i])):
+            block.swing()
+
+        tower.xlist = [float(tower_x[i])]
+        tower.y = float(tower_y[i])
+        target = tower.y - BLOCK_HEIGHT
+        calls = 0
+        while True:
+            block.drop(tower)
+            calls += 1
+            if block.state != "dropped" or block.y >= target:
+                break
+        x[i] = block.xlast
+        landed[i] = block.state == "landed"
+        golden[i] = landed[i] and tower.golden
+        fall_steps[i] = calls
+    return {"x": x, "landed": landed, "golden": golden, "fall_steps": fall_steps}
+
+
+def mismatches(ref, got):
+    """(max |dx|, расхождений landed, golden, fall_steps) векторного результата со скалярным."""
+    dx = float(np.abs(got["x"] - ref["x"]).max())
+    landed_diff = int((got["landed"] != ref["landed"]).sum())
+    golden_diff = int((got["golden"] != ref["golden"]).sum())
+    fall_diff = int((got["fall_steps"] != ref["fall_steps"])[ref["landed"]].sum())
+    return dx, landed_diff, golden_diff, fall_diff
+
+
+def matches(ref, got, tolerance=X_TOLERANCE):
+    dx, *diffs = mismatches(ref, got)
+    return dx <= tolerance and not any(diffs)
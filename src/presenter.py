@@ -0,0 +1,191 @@
+import math
+
+import pygame
+
+from src.constants import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    WINDOW_WIDTH,
+    WINDOW_HEIGHT,
+    DEFAULT_PRESENT_MODE,
+)
+
+
+# smooth  — smoothscale в окно 480x853, пропускается если кадр не изменился
+# nearest — быстрый scale без фильтрации в то же окно
+# integer — окно в целое число раз больше виртуального экрана, scale без фильтрации
+# native  — окно 540x960, кадр копируется одним blit без масштабирования
+PRESENT_MODES = ("smooth", "nearest", "integer", "native")
+
+PRESENT_MODE_LABELS = {
+    "smooth": "HQ",
+    "nearest": "NN",
+    "integer": "xN",
+    "native": "1:1",
+}
+
+MOUSE_EVENTS = (
+    pygame.MOUSEMOTION,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+)
+
+
+class Presenter:
+    """
+    Вывод виртуального экрана (540x960) в окно и обратный пересчёт координат мыши.
+    Окно создаётся здесь же: его размер зависит от режима.
+    """
+
+    def __init__(self, mode=DEFAULT_PRESENT_MODE, virtual_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.virtual_size = virtual_size
+        self.mode = None
+        self.screen = None
+        self.window_size = None
+        self.scaled = None
+        self.last_frame = None
+        # качество (src/quality.py): в режиме smooth масштабировать быстрым scale
+        self.fast_scale = False
+
+        self.presented = 0
+        self.skipped = 0
+
+        self.set_mode(mode)
+
+    def set_mode(self, mode):
+        if mode not in PRESENT_MODES:
+            raise ValueError(f"Неизвестный режим вывода: {mode}")
+        if mode == self.mode:
+            return
+
+        self.mode = mode
+        self.window_size = self._window_size_for(mode)
+        self.screen = pygame.display.set_mode(self.window_size)
+        self.scaled = None
+        self.last_frame = None
+
+    def set_fast_scale(self, fast):
+        if fast != self.fast_scale:
+            self.fast_scale = fast
+            self.last_frame = None
+
+    def next_mode(self, mode=None):
+        """Следующий режим по кругу (для кнопки в настройках)."""
+        mode = mode or self.mode
+        return PRESENT_MODES[(PRESENT_MODES.index(mode) + 1) % len(PRESENT_MODES)]
+
+    def _window_size_for(self, mode):
+        vw, vh = self.virtual_size
+        if mode == "native":
+            return (vw, vh)
+        if mode == "integer":
+            k = self.integer_factor()
+            return (vw * k, vh * k)
+        return (WINDOW_WIDTH, WINDOW_HEIGHT)
+
+    def integer_factor(self):
+        """Наибольший целый масштаб, при котором окно помещается на экран (минимум 1)."""
+        vw, vh = self.virtual_size
+        try:
+            desktop_w, desktop_h = pygame.display.get_desktop_sizes()[0]
+        except (pygame.error, IndexError):
+            return 1
+        return max(1, min(desktop_w // vw, desktop_h // vh))
+
+    # ---------- КООРДИНАТЫ МЫШИ ----------
+    def to_virtual(self, pos):
+        real_x, real_y = pos
+        vw, vh = self.virtual_size
+        ww, wh = self.window_size
+        return int(real_x * vw / ww), int(real_y * vh / wh)
+
+    def remap_event(self, event):
+        """Переводит pos мышиных событий из координат окна в виртуальные."""
+        if event.type in MOUSE_EVENTS:
+            virtual_pos = self.to_virtual(event.pos)
+            event.pos = virtual_pos
+            if hasattr(event, "dict"):
+                event.dict["pos"] = virtual_pos
+        return event
+
+    # ---------- ВЫВОД КАДРА ----------
+    def present(self, virtual, changed=False):
+        """
+        Выводит кадр в окно. Возвращает False, если окно не изменилось
+        (тогда display.update можно не вызывать).
+
+        changed=True — вызывающий знает, что кадр новый (идёт партия):
+        копия кадра для сравнения не снимается.
+        """
+        if self.mode == "native" or self.window_size == self.virtual_size:
+            self.screen.blit(virtual, (0, 0))
+            self.presented += 1
+            return True
+
+        # масштабирование дороже сравнения кадров: одинаковый кадр не пересчитываем
+        if changed:
+            self.last_frame = None
+        else:
+            frame = virtual.get_buffer().raw
+            if frame == self.last_frame:
+                self.skipped += 1
+                return False
+            self.last_frame = frame
+
+        if self.scaled is None:
+            self.scaled = pygame.Surface(self.window_size, 0, virtual)
+
+        if self.mode == "smooth" and not self.fast_scale:
+            pygame.transform.smoothscale(virtual, self.window_size, self.scaled)
+        else:
+            pygame.transform.scale(virtual, self.window_size, self.scaled)
+
+        self.screen.blit(self.scaled, (0, 0))
+        self.presented += 1
+        return True
+
+    def to_window_rect(self, rect):
+        """Прямоугольник виртуального экрана -> покрывающий его прямоугольник окна."""
+        vw, vh = self.virtual_size
+        ww, wh = self.window_size
+        x0 = math.floor(rect.left * ww / vw)
+        y0 = math.floor(rect.top * wh / vh)
+        x1 = math.ceil(rect.right * ww / vw)
+        y1 = math.ceil(rect.bottom * wh / vh)
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def present_rects(self, virtual, rects):
+        """
+        Выводит только грязные области кадра (режим dirty-rect).
+        Возвращает прямоугольники окна для display.update(rects).
+        """
+        self.last_frame = None
+        window_rects = []
+        for rect in rects:
+            if self.mode == "native" or self.window_size == self.virtual_size:
+                self.screen.blit(virtual, rect.topleft, rect)
+                window_rects.append(rect)
+                continue
+
+            win_rect = self.to_window_rect(rect)
+            if not win_rect.width or not win_rect.height:
+                continue
+            part = virtual.subsurface(rect)
+            if self.mode == "smooth" and not self.fast_scale:
+                part = pygame.transform.smoothscale(part, win_rect.size)
+            else:
+                part = pygame.transform.scale(part, win_rect.size)
+            self.screen.blit(part, win_rect.topleft)
+            window_rects.append(win_rect)
+
+        self.presented += 1
+        return window_rects
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "fast_scale": self.fast_scale,
+            "window": self.window_size,
+            "presented": self.presented,
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,329 @@
+import csv
+import time
+
+import numpy as np
+import pygame
+
+from src.constants import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    FPS,
+    WHITE,
+    DATA_PATH,
+    PROFILER_HISTORY,
+    PROFILER_GRAPH_HEIGHT,
+    PROFILER_GRAPH_MS,
+    PROFILER_TEXT_INTERVAL,
+)
+from src.fonts import get_font
+
+
+# этапы кадра в порядке выполнения; wait — сон в clock.tick, в «работу» кадра не входит
+STAGES = (
+    "wait",
+    "events",
+    "update",
+    "dirty",
+    "draw",
+    "background",
+    "crane",
+    "particles",
+    "people",
+    "hud",
+    "tower",
+    "block",
+    "overlays",
+    "profiler",
+    "present",
+    "display",
+)
+
+STAGE_COLORS = {
+    "wait": (60, 60, 60),
+    "events": (255, 220, 0),
+    "update": (255, 140, 0),
+    "dirty": (160, 160, 160),
+    "draw": (200, 200, 255),
+    "background": (70, 130, 255),
+    "crane": (0, 200, 200),
+    "particles": (255, 90, 200),
+    "people": (180, 120, 255),
+    "hud": (120, 255, 120),
+    "tower": (200, 120, 60),
+    "block": (255, 255, 160),
+    "overlays": (100, 100, 200),
+    "profiler": (90, 90, 90),
+    "present": (255, 70, 70),
+    "display": (150, 0, 0),
+}
+
+HITCH_COLOR = (255, 0, 0)
+BUDGET_COLOR = (255, 255, 255)
+PANEL_COLOR = (0, 0, 0, 180)
+GRAPH_COLOR = (20, 20, 20)
+
+
+class FrameProfiler:
+    """
+    Время этапов кадра: main() открывает кадр begin_frame(), код кадра
+    отмечает конец каждого этапа mark(stage) — время с прошлой отметки
+    прибавляется к этапу. Пока кадр не открыт (бенчмарки, headless), mark
+    ничего не делает.
+
+    Последние history кадров лежат в кольцевом буфере: из него считаются
+    перцентили, график панели (F3) и CSV для баг-репортов (F4).
+    Рывок — кадр, «работа» которого (всё, кроме wait) не влезла в бюджет 1 / FPS.
+    """
+
+    def __init__(self, history=PROFILER_HISTORY, budget_ms=1000 / FPS):
+        self.history = history
+        self.budget_ms = budget_ms
+        self.stage_index = {name: i for i, name in enumerate(STAGES)}
+        self.work_stages = np.array([name != "wait" for name in STAGES])
+
+        self.samples = np.zeros((history, len(STAGES)))  # мс по этапам
+        self.intervals = np.zeros(history)                # мс от начала кадра до следующего
+        self.labels = [""] * history                      # экран игры (menu / game / ...)
+        self.count = 0                                    # кадров записано всего
+        self.hitches = 0
+
+        self.current = [0.0] * len(STAGES)
+        self.label = ""
+        self.frame_start = None
+        self.last = None
+        self.active = False
+
+        self.last_work_ms = 0.0                           # работа последнего записанного кадра
+
+        # AllocTracker (--alloc-stats): считает Surface / память / GC по тем же отметкам
+        self.alloc = None
+        # QualityGovernor: уровень качества — строкой на панели и колонкой CSV
+        self.quality = None
+        self.quality_levels = np.zeros(history, dtype=np.int8)
+
+        # панель
+        self.visible = False
+        self.font = None
+        self.rect = None
+        self.panel = None
+        self.graph = None
+        self.graph_count = 0
+        self.text_frame = None
+
+    # ---------- ЗАМЕР ----------
+    def attach(self, alloc):
+        """Подключить AllocTracker: его счётчики идут в панель и CSV рядом с временем."""
+        self.alloc = alloc
+        self.panel = None
+
+    def attach_quality(self, governor):
+        self.quality = governor
+        self.panel = None
+
+    def begin_frame(self, label=""):
+        """Начало кадра; предыдущий кадр (если был) записывается в буфер."""
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self._commit((now - self.frame_start) * 1000)
+        self.current = [0.0] * len(STAGES)
+        self.label = label
+        self.frame_start = now
+        if self.alloc is not None:
+            self.alloc.begin_frame()
+        self.last = time.perf_counter()
+        self.active = True
+
+    def mark(self, stage):
+        """Этап stage закончился: время с прошлой отметки — его."""
+        if not self.active:
+            return
+        now = time.perf_counter()
+        index = self.stage_index[stage]
+        self.current[index] += (now - self.last) * 1000
+        if self.alloc is not None:
+            self.alloc.mark(index)
+            now = time.perf_counter()
+        self.last = now
+
+    def _commit(self, interval_ms):
+        row = self.count % self.history
+        self.samples[row] = self.current
+        self.intervals[row] = interval_ms
+        self.labels[row] = self.label
+        if self.alloc is not None:
+            self.alloc.commit(row)
+        if self.quality is not None:
+            self.quality_levels[row] = self.quality.index
+        self.count += 1
+        self.last_work_ms = float(self.samples[row][self.work_stages].sum())
+        if self.last_work_ms > self.budget_ms:
+            self.hitches += 1
+
+    def recent_rows(self, last=None):
+        """Индексы записанных кадров буфера от старых к новым (не больше last)."""
+        n = min(self.count, self.history)
+        if last is not None:
+            n = min(n, last)
+        return (np.arange(self.count - n, self.count) % self.history) if n else np.zeros(0, dtype=np.int64)
+
+    def stats(self):
+        """FPS и перцентили p50/p95/p99 (мс) по этапам и по работе кадра."""
+        rows = self.recent_rows()
+        if rows.size == 0:
+            return None
+        samples = self.samples[rows]
+        work = samples[:, self.work_stages].sum(axis=1)
+        stages = np.percentile(samples, (50, 95, 99), axis=0)
+        recent = self.intervals[self.recent_rows(FPS)]
+        return {
+            "frames": int(rows.size),
+            "fps": 1000 / recent.mean() if recent.mean() > 0 else 0.0,
+            "work": np.percentile(work, (50, 95, 99)).tolist(),
+            "stages": {name: stages[:, i].tolist() for i, name in enumerate(STAGES)},
+            "hitches": int((work > self.budget_ms).sum()),
+        }
+
+    # ---------- CSV ----------
+    def export_csv(self, path=None):
+        """Записать кадры буфера в CSV (по строке на кадр). Возвращает путь."""
+        if path is None:
+            path = f"{DATA_PATH}profile_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+        rows = self.recent_rows()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            extra = self.alloc.csv_header() if self.alloc is not None else []
+            if self.quality is not None:
+                extra.append("quality")
+            writer.writerow(["frame", "screen", "interval_ms", "work_ms", "hitch", *STAGES, *extra])
+            first = self.count - rows.size
+            for n, row in enumerate(rows):
+                values = self.samples[row]
+                work = values[self.work_stages].sum()
+                writer.writerow([
+                    first + n, self.labels[row], f"{self.intervals[row]:.3f}", f"{work:.3f}",
+                    int(work > self.budget_ms), *(f"{v:.3f}" for v in values),
+                    *(self.alloc.csv_row(row) if self.alloc is not None else []),
+                    *([self.quality.levels[self.quality_levels[row]].name] if self.quality is not None else []),
+                ])
+        return path
+
+    # ---------- ПАНЕЛЬ ----------
+    def toggle(self):
+        self.visible = not self.visible
+        self.graph_count = 0
+        self.text_frame = None
+
+    def _prepare(self):
+        if self.panel is not None:
+            return
+        self.font = get_font(13)
+        line = self.font.get_linesize()
+        stages = len(STAGES) - 1  # wait в легенде не нужен
+        legend_rows = (stages + 1) // 2 + 1  # + строка заголовков p50 / p95 / p99
+        height = self._legend_top() + legend_rows * line + 10
+        self.rect = pygame.Rect(0, SCREEN_HEIGHT - height, SCREEN_WIDTH, height)
+        self.panel = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.graph = pygame.Surface((SCREEN_WIDTH - 20, PROFILER_GRAPH_HEIGHT))
+
+    def _legend_top(self):
+        """y легенды в панели: под строками заголовка и графиком."""
+        header_lines = 1 + (self.quality is not None) + (self.alloc is not None)
+        return 10 + header_lines * self.font.get_linesize() + 6 + PROFILER_GRAPH_HEIGHT + 6
+
+    def _graph_column(self, x, row):
+        """Столбик кадра row: этапы работы друг на друге, рывок — красная метка сверху."""
+        scale = PROFILER_GRAPH_HEIGHT / PROFILER_GRAPH_MS
+        bottom = PROFILER_GRAPH_HEIGHT
+        values = self.samples[row]
+        for i, name in enumerate(STAGES):
+            if not self.work_stages[i] or values[i] <= 0:
+                continue
+            top = bottom - values[i] * scale
+            if bottom >= 0 and int(top) < int(bottom):
+                pygame.draw.line(self.graph, STAGE_COLORS[name], (x, max(int(top), 0)), (x, int(bottom) - 1))
+            bottom = top
+        if values[self.work_stages].sum() > self.budget_ms:
+            pygame.draw.line(self.graph, HITCH_COLOR, (x, 0), (x, 3))
+
+    def _update_graph(self):
+        """Дорисовать кадры, записанные с прошлого раза: график сдвигается влево."""
+        width = self.graph.get_width()
+        new = self.count - self.graph_count
+        if new <= 0:
+            return
+        if new >= width or self.graph_count == 0:
+            self.graph.fill(GRAPH_COLOR)
+            new = min(self.count, self.history, width)
+        else:
+            self.graph.scroll(-new, 0)
+            self.graph.fill(GRAPH_COLOR, (width - new, 0, new, PROFILER_GRAPH_HEIGHT))
+        for x, row in zip(range(width - new, width), self.recent_rows(new)):
+            self._graph_column(x, row)
+        self.graph_count = self.count
+
+    def _update_text(self):
+        """Перерисовать панель целиком (цифры меняются раз в PROFILER_TEXT_INTERVAL кадров)."""
+        panel = self.panel
+        panel.fill(PANEL_COLOR)
+        stats = self.stats()
+        font = self.font
+        line = font.get_linesize()
+        if stats is None:
+            panel.blit(font.render("профайлер: ждём кадров...", True, WHITE), (10, 10))
+            return
+
+        p50, p95, p99 = stats["work"]
+        header = (f"FPS {stats['fps']:5.1f}   кадр p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f} мс   "
+                  f"рывков {stats['hitches']}/{stats['frames']}   F4 — CSV")
+        lines = [header]
+        if self.quality is not None:
+            lines.append(self.quality.describe())
+        if self.alloc is not None:
+            lines.append(self.alloc.summary(self.recent_rows()))
+        for n, text in enumerate(lines):
+            panel.blit(font.render(text, True, WHITE), (10, 10 + n * line))
+
+        top = self._legend_top()
+        column_width = (SCREEN_WIDTH - 20) // 2
+        for column in range(2):
+            for k, title in enumerate(("p50", "p95", "p99")):
+                text = font.render(title, True, WHITE)
+                panel.blit(text, (10 + column * column_width + 120 + k * 45 - text.get_width(), top))
+        top += line
+        for n, name in enumerate(STAGES[1:]):
+            x = 10 + (n % 2) * column_width
+            y = top + (n // 2) * line
+            pygame.draw.rect(panel, STAGE_COLORS[name], (x, y + 3, 8, 8))
+            panel.blit(font.render(name, True, WHITE), (x + 12, y))
+            for k, value in enumerate(stats["stages"][name]):
+                text = font.render(f"{value:.2f}", True, WHITE)
+                panel.blit(text, (x + 120 + k * 45 - text.get_width(), y))
+        self.text_frame = self.count
+
+    def draw(self, screen):
+        """Панель внизу экрана: заголовок, график этапов с линией бюджета, легенда с p50/p95/p99."""
+        if not self.visible:
+            return
+        self._prepare()
+        if self.text_frame is None or self.count - self.text_frame >= PROFILER_TEXT_INTERVAL:
+            self._update_text()
+        self._update_graph()
+
+        screen.blit(self.panel, self.rect.topleft)
+        graph_pos = (self.rect.left + 10, self.rect.top + self._legend_top() - PROFILER_GRAPH_HEIGHT - 6)
+        screen.blit(self.graph, graph_pos)
+        budget_y = graph_pos[1] + PROFILER_GRAPH_HEIGHT - int(self.budget_ms * PROFILER_GRAPH_HEIGHT / PROFILER_GRAPH_MS)
+        pygame.draw.line(screen, BUDGET_COLOR, (graph_pos[0], budget_y),
+                         (graph_pos[0] + self.graph.get_width() - 1, budget_y))
+
+    def track_dirty(self, tracker):
+        if not self.visible:
+            tracker.track(self, None, None)
+            return
+        self._prepare()
+        # панель меняется каждый кадр
+        tracker.track(self, self.count, self.rect)
+
+
+# один профайлер на процесс: main() открывает кадры, Game отмечает этапы отрисовки
+profiler = FrameProfiler()
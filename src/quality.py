@@ -0,0 +1,160 @@
+import numpy as np
+
+from src.constants import (
+    FPS,
+    MAX_PARTICLES,
+    QUALITY_PINNED,
+    QUALITY_WINDOW,
+    QUALITY_PERCENTILE,
+    QUALITY_DOWNGRADE_RATIO,
+    QUALITY_UPGRADE_RATIO,
+    QUALITY_UPGRADE_WINDOWS,
+    QUALITY_UPGRADE_MAX_WINDOWS,
+    QUALITY_COOLDOWN,
+)
+
+
+class QualityLevel:
+    """Набор настроек эффектов одного уровня качества."""
+
+    def __init__(self, name, particle_cap, particle_scale, outline_passes, people, slowmo_tint,
+                 smooth_present):
+        self.name = name
+        self.particle_cap = particle_cap        # частиц одновременно
+        self.particle_scale = particle_scale    # множитель count в add_explosion / add_build_particles
+        self.outline_passes = outline_passes    # blit-ов чёрной обводки комбо-надписи (8 / 4 / 0)
+        self.people = people                    # человечки на шариках (только отрисовка)
+        self.slowmo_tint = slowmo_tint          # синяя тонировка экрана в слоу-мо
+        self.smooth_present = smooth_present    # smoothscale в окно (иначе быстрый scale)
+
+
+# от лучшего к худшему; первым уходит то, что дешевле всего заметить
+QUALITY_LEVELS = (
+    QualityLevel("high", MAX_PARTICLES, 1.0, 8, True, True, True),
+    QualityLevel("medium", 500, 0.6, 4, True, True, True),
+    QualityLevel("low", 250, 0.4, 4, False, True, False),
+    QualityLevel("minimal", 120, 0.25, 0, False, False, False),
+)
+
+QUALITY_NAMES = tuple(level.name for level in QUALITY_LEVELS)
+
+
+class QualityGovernor:
+    """
+    Подстройка качества по времени кадра во время игры.
+
+    main() отдаёт observe() «работу» каждого игрового кадра (всё, кроме сна
+    в clock.tick). Кадры копятся окнами по window; по перцентилю окна:
+      - выше downgrade_ratio бюджета — ступенью ниже сразу;
+      - ниже upgrade_ratio бюджета upgrade_windows окон подряд — ступенью выше.
+    Разные пороги, разная длительность и пауза cooldown после смены — гистерезис:
+    на границе бюджета уровень не скачет. Если после повышения пришлось сразу
+    вернуться вниз, следующего повышения ждём вдвое дольше.
+
+    pin(name) фиксирует уровень (без подстройки), pin(None) — снова авто.
+    """
+
+    def __init__(self, levels=QUALITY_LEVELS, pinned=QUALITY_PINNED, budget_ms=1000 / FPS,
+                 window=QUALITY_WINDOW, percentile=QUALITY_PERCENTILE,
+                 downgrade_ratio=QUALITY_DOWNGRADE_RATIO, upgrade_ratio=QUALITY_UPGRADE_RATIO,
+                 upgrade_windows=QUALITY_UPGRADE_WINDOWS, cooldown=QUALITY_COOLDOWN):
+        self.levels = levels
+        self.budget_ms = budget_ms
+        self.window = window
+        self.percentile = percentile
+        self.downgrade_ms = budget_ms * downgrade_ratio
+        self.upgrade_ms = budget_ms * upgrade_ratio
+        self.upgrade_windows = upgrade_windows
+        self.cooldown = cooldown
+
+        self.index = 0
+        self.pinned = False
+        self.samples = []
+        self.calm_windows = 0     # окон подряд ниже порога повышения
+        self.cooldown_left = 0
+        self.frames = 0           # игровых кадров всего
+        self.last_upgrade = None  # кадр последнего повышения
+        self.last_window_ms = None
+        self.changes = []         # (кадр, старый уровень, новый уровень, перцентиль окна в мс)
+
+        if pinned is not None:
+            self.pin(pinned)
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def pin(self, name):
+        """Зафиксировать уровень по имени; None — вернуть автоподстройку."""
+        if name is None:
+            self.pinned = False
+            return
+        names = [level.name for level in self.levels]
+        if name not in names:
+            raise ValueError(f"Неизвестный уровень качества: {name}")
+        self.index = names.index(name)
+        self.pinned = True
+
+    def observe(self, work_ms):
+        """Игровой кадр занял work_ms. Возвращает True, если уровень сменился."""
+        self.frames += 1
+        if self.pinned:
+            return False
+        if self.cooldown_left > 0:
+            self.cooldown_left -= 1
+            return False
+
+        self.samples.append(work_ms)
+        if len(self.samples) < self.window:
+            return False
+        value = float(np.percentile(self.samples, self.percentile))
+        self.samples = []
+        self.last_window_ms = value
+
+        if value > self.downgrade_ms:
+            self.calm_windows = 0
+            if self.index + 1 >= len(self.levels):
+                return False
+            recent_upgrade = (self.last_upgrade is not None
+                              and self.frames - self.last_upgrade <= 2 * (self.cooldown + self.window))
+            if recent_upgrade:
+                # повышение не выдержали: следующее — после вдвое большего затишья
+                self.upgrade_windows = min(self.upgrade_windows * 2, QUALITY_UPGRADE_MAX_WINDOWS)
+                self.last_upgrade = None
+            return self._set(self.index + 1, value)
+
+        if value < self.upgrade_ms and self.index > 0:
+            self.calm_windows += 1
+            if self.calm_windows >= self.upgrade_windows:
+                self.calm_windows = 0
+                self.last_upgrade = self.frames
+                return self._set(self.index - 1, value)
+        else:
+            self.calm_windows = 0
+        return False
+
+    def _set(self, index, value):
+        self.changes.append((self.frames, self.level.name, self.levels[index].name, value))
+        self.index = index
+        self.cooldown_left = self.cooldown
+        self.samples = []
+        return True
+
+    # ---------- ВЫВОД ----------
+    def describe(self):
+        """Строка для панели F3."""
+        mode = "фикс." if self.pinned else "авто"
+        text = f"качество {self.level.name} ({mode})"
+        if not self.pinned and self.last_window_ms is not None:
+            text += (f"   окно p{self.percentile} {self.last_window_ms:.2f} мс "
+                     f"(↓ >{self.downgrade_ms:.1f}, ↑ <{self.upgrade_ms:.1f} x{self.upgrade_windows})")
+        return text
+
+    def format_change(self, change):
+        frame, old, new, value = change
+        return (f"🎚️ Качество: {old} -> {new} (игровой кадр {frame}, "
+                f"p{self.percentile} работы кадра {value:.2f} мс, бюджет {self.budget_ms:.1f} мс)")
+
+
+# один на процесс: main() подстраивает, Game берёт текущий уровень при создании
+governor = QualityGovernor()
@@ -0,0 +1,143 @@
+"""
+Реплеи партий: номер шага симуляции каждого ввода + seed случайности.
+
+Физика и правила (src/core.py) детерминированы, случайны только частицы и
+человечки на шариках — их генераторы создаются из seed партии. Поэтому
+для точного повтора хватает списка (шаг, ввод): тот же шаг, то же нажатие —
+та же башня, те же комбо и взрывы.
+
+Формат файла (little-endian):
+    заголовок  "<4sBBHQIIi": b"TBRP", версия, id башни, SIM_HZ, seed,
+               шагов в партии, число событий, итоговый счёт
+    события    по varint на событие: (шагов с прошлого события << 2) | код ввода
+"""
+import os
+import struct
+
+from src.core import GameCore
+from src.constants import SIM_HZ
+
+
+REPLAY_MAGIC = b"TBRP"
+REPLAY_VERSION = 1
+_HEADER = struct.Struct("<4sBBHQIIi")
+
+# коды ввода (2 бита)
+INPUT_SPACE = 1
+INPUT_CODES = (INPUT_SPACE,)
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Реплей обрезан: событие не дочитано")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    """Запись одной партии: seed, башня и вводы по шагам симуляции."""
+
+    def __init__(self, seed, tower_id=1, sim_hz=SIM_HZ):
+        self.seed = seed
+        self.tower_id = tower_id
+        self.sim_hz = sim_hz
+        self.events = []   # (шаг, код ввода), шаги не убывают
+        self.frames = 0    # сколько шагов длилась партия
+        self.score = 0     # итог — для проверки при воспроизведении
+
+    def __len__(self):
+        return len(self.events)
+
+    def record(self, frame, code=INPUT_SPACE):
+        """Ввод code перед шагом frame (frame = сколько шагов уже сделано)."""
+        if code not in INPUT_CODES:
+            raise ValueError(f"Неизвестный код ввода: {code}")
+        self.events.append((frame, code))
+
+    def finish(self, frames, score):
+        self.frames = frames
+        self.score = score
+
+    def schedule(self):
+        """{шаг: [коды ввода]} для воспроизведения."""
+        inputs = {}
+        for frame, code in self.events:
+            inputs.setdefault(frame, []).append(code)
+        return inputs
+
+    # ---------- ФАЙЛ ----------
+    def to_bytes(self):
+        out = bytearray(_HEADER.pack(
+            REPLAY_MAGIC, REPLAY_VERSION, self.tower_id, self.sim_hz,
+            self.seed, self.frames, len(self.events), self.score,
+        ))
+        last = 0
+        for frame, code in self.events:
+            _write_varint(out, (frame - last) << 2 | code)
+            last = frame
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < _HEADER.size:
+            raise ValueError("Реплей обрезан: нет заголовка")
+        magic, version, tower_id, sim_hz, seed, frames, count, score = _HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("Это не файл реплея")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"Неподдерживаемая версия реплея: {version}")
+
+        replay = cls(seed, tower_id, sim_hz)
+        replay.finish(frames, score)
+        pos = _HEADER.size
+        frame = 0
+        for _ in range(count):
+            value, pos = _read_varint(data, pos)
+            frame += value >> 2
+            replay.record(frame, value & 0b11)
+        return replay
+
+    def save(self, path):
+        """Записать файл целиком через временный (как сохранения)."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def play_headless(replay):
+    """
+    Прогнать реплей на GameCore без pygame. Возвращает ядро в конце партии
+    (core.score можно сверить с replay.score).
+    """
+    if replay.sim_hz != SIM_HZ:
+        raise ValueError(f"Реплей записан при SIM_HZ={replay.sim_hz}, сейчас {SIM_HZ}")
+    inputs = replay.schedule()
+    core = GameCore()
+    for frame in range(replay.frames):
+        for code in inputs.get(frame, ()):
+            if code == INPUT_SPACE:
+                core.drop()
+        core.step()
+        if core.game_over:
+            break
+    return core
@@ -0,0 +1,68 @@
+from collections import OrderedDict
+
+import pygame
+
+from src.asset_loader import surface_nbytes
+from src.constants import ROTATION_STEP_DEG, ROTATION_CACHE_BUDGET
+
+
+class RotationCache:
+    """
+    Повёрнутые варианты спрайтов: (surface, индекс угла) -> (Surface, Rect).
+    Угол квантуется с шагом step_deg (по умолчанию 0.25°) и берётся по модулю 360,
+    варианты создаются лениво при первом запросе.
+    Память ограничена budget_bytes, лишнее выбрасывается по LRU.
+    """
+
+    def __init__(self, step_deg=ROTATION_STEP_DEG, budget_bytes=ROTATION_CACHE_BUDGET):
+        self.step_deg = step_deg
+        self.steps = max(1, round(360 / step_deg))
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, angle_deg):
+        """Индекс угла в кэше (0 .. steps-1)."""
+        return round(angle_deg / self.step_deg) % self.steps
+
+    def get(self, image, angle_deg):
+        """Повёрнутый image и его ограничивающий Rect (с topleft = 0, 0)."""
+        key = (image, self.quantize(angle_deg))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        rotated = pygame.transform.rotate(image, key[1] * self.step_deg)
+        entry = (rotated, rotated.get_rect())
+        self.entries[key] = entry
+        self.bytes_used += surface_nbytes(rotated)
+        while self.bytes_used > self.budget_bytes and len(self.entries) > 1:
+            _, (old, _) = self.entries.popitem(last=False)
+            self.bytes_used -= surface_nbytes(old)
+            self.evictions += 1
+        return entry
+
+    def rotate(self, image, angle_deg):
+        """Замена pygame.transform.rotate с кэшем."""
+        return self.get(image, angle_deg)[0]
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.bytes_used,
+            "budget": self.budget_bytes,
+            "step_deg": self.step_deg,
+        }
+
+
+# общий кэш поворотов для верёвки с крюком и блоков башни
+rotation_cache = RotationCache()
@@ -1,26 +1,191 @@
+import copy
 import json
 import os
-from src.constants import DATA_PATH
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: без межпроцессной блокировки
+    fcntl = None
+
+from src.constants import (
+    DATA_PATH,
+    SAVE_WRITE_BEHIND,
+    SAVE_FLUSH_INTERVAL,
+    SAVE_FLUSH_MAX_PENDING,
+    SAVE_BACKEND,
+    SAVE_JOURNAL_COMPACT_RECORDS,
+)
+
+
+SAVE_BACKENDS = ("json", "journal")
+
+
+def _replay_record(data, op, args):
+    """Повторить одну запись журнала над словарём сохранения."""
+    if op == "add_coins":
+        data['coins'] += args[0]
+    elif op == "spend_coins":
+        data['coins'] -= args[0]
+    elif op == "unlock_tower":
+        if args[0] not in data['unlocked_towers']:
+            data['unlocked_towers'].append(args[0])
+    elif op == "purchase_tower":
+        _purchase(data, args[1], args[0])
+    elif op == "set_selected_tower":
+        data['selected_tower'] = args[0]
+    elif op == "update_high_score":
+        data['high_score'] = max(data['high_score'], args[0])
+    elif op == "add_game":
+        data['total_games'] = data.get('total_games', 0) + 1
+
+
+def _purchase(data, price, tower_id=None):
+    """
+    Списать price монет в data, для покупки — и открыть tower_id.
+    Уже открытую башню второй раз не оплачиваем.
+    Возвращает (удалось ли, изменились ли данные).
+    """
+    if tower_id is not None and tower_id in data['unlocked_towers']:
+        return True, False
+    if data['coins'] < price:
+        return False, False
+    data['coins'] -= price
+    if tower_id is not None:
+        data['unlocked_towers'].append(tower_id)
+    return True, True
+
+
+def merge_save(disk, base, local):
+    """
+    Слить наши изменения (local относительно base — того, что мы последний раз
+    видели на диске) с текущим содержимым диска:
+    монеты и число партий — разницей, открытые башни — объединением,
+    рекорд — максимумом, выбранная башня — наша, только если мы её меняли.
+    """
+    merged = {**local, **disk}
+    merged['coins'] = max(0, disk.get('coins', 0) + local['coins'] - base['coins'])
+    merged['total_games'] = (disk.get('total_games', 0)
+                             + local.get('total_games', 0) - base.get('total_games', 0))
+    unlocked = list(disk.get('unlocked_towers', local['unlocked_towers']))
+    for tower_id in local['unlocked_towers']:
+        if tower_id not in unlocked:
+            unlocked.append(tower_id)
+    merged['unlocked_towers'] = unlocked
+    merged['high_score'] = max(disk.get('high_score', 0), local['high_score'])
+    if local['selected_tower'] != base['selected_tower']:
+        merged['selected_tower'] = local['selected_tower']
+    return merged
 
 
 class SaveManager:
-    def __init__(self):
-        self.save_file = f"{DATA_PATH}save_data.json"
+    """
+    Сохранение прогресса.
+
+    backend="json": файл JSON переписывается целиком.
+    backend="journal": каждое изменение дописывается строкой в журнал
+    (save_data.journal), снимок save_data.json сжимается из него раз в
+    compact_records записей. При загрузке: снимок + хвост журнала.
+
+    write_behind=True: запись снимка идёт в фоновом потоке и собирает изменения
+    пачкой (json — через flush_interval секунд или flush_max_pending изменений;
+    journal — при сжатии). Снимок пишется атомарно: temp -> fsync -> rename.
+    flush() / close() — явная запись.
+
+    Несколько копий игры с общей папкой data/ (backend="json"): запись —
+    это транзакция под fcntl.flock на save_data.json.lock: перечитать файл,
+    слить с ним свои изменения (merge_save) и записать. Блокировка держится
+    только на чтение + запись маленького файла и берётся в фоновом потоке.
+    refresh() только читает файл под общей (shared) блокировкой. Трата монет и
+    покупка башни — своя транзакция: хватает ли монет и не открыта ли уже башня,
+    проверяется по только что прочитанному диску, списание и открытие — одна запись.
+    Журнал рассчитан на одну копию игры.
+    """
+
+    def __init__(self, save_file=None, write_behind=SAVE_WRITE_BEHIND,
+                 flush_interval=SAVE_FLUSH_INTERVAL, flush_max_pending=SAVE_FLUSH_MAX_PENDING,
+                 backend=SAVE_BACKEND, compact_records=SAVE_JOURNAL_COMPACT_RECORDS):
+        if backend not in SAVE_BACKENDS:
+            raise ValueError(f"Неизвестный способ сохранения: {backend}")
+        self.save_file = save_file or f"{DATA_PATH}save_data.json"
+        self.journal_file = os.path.splitext(self.save_file)[0] + ".journal"
+        self.lock_file = f"{self.save_file}.lock"
+        self.backend = backend
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_max_pending = flush_max_pending
+        self.compact_records = compact_records
+
+        # lock защищает self.data, журнал и счётчики; write_lock — запись снимка
+        self.lock = threading.RLock()
+        self.cond = threading.Condition(self.lock)
+        self.write_lock = threading.Lock()
+        self.thread = None
+        self.closing = False
+        self.flush_requested = False
+
+        self.pending = 0          # изменений с последнего снимка
+        self.dirty_since = None   # monotonic() первого из них
+        self.journal = None       # открытый на дозапись файл журнала
+        self.journal_seq = 0      # номер последней записи журнала
+        self.journal_bytes = 0
+
+        self.mutations = 0
+        self.writes = 0
+        self.writes_avoided = 0
+        self.replayed = 0
+        self.compactions = 0
+        self.last_compact_ms = 0.0
+        self.merges = 0
+        self.lock_hold_ms = 0.0   # максимум за время работы
+
+        self.base = None          # данные, какими мы их последний раз видели на диске
         self.data = self.load_data()
     
     def load_data(self):
-        """Загружает данные из файла"""
-        if not os.path.exists(DATA_PATH):
-            os.makedirs(DATA_PATH)
+        """Загружает данные из файла (и дописанный после него журнал)"""
+        data_dir = os.path.dirname(self.save_file)
+        if data_dir and not os.path.exists(data_dir):
+            os.makedirs(data_dir)
         
         if os.path.exists(self.save_file):
             try:
                 with open(self.save_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    data = json.load(f)
             except:
-                return self.create_default_data()
+                data = self.create_default_data()
         else:
-            return self.create_default_data()
+            data = self.create_default_data()
+
+        self.journal_seq = data.pop('journal_seq', 0)
+        self.base = copy.deepcopy(data)
+        self.replayed = self._replay_journal(data)
+        if self.replayed or os.path.exists(self.journal_file + ".old"):
+            # хвост уже в памяти: сразу сжимаем, чтобы следующая загрузка была короткой
+            self.data = data
+            self.pending = self.replayed
+            self._compact()
+        return data
+
+    def _replay_journal(self, data):
+        """Применить записи журнала новее снимка. Недописанную последнюю строку пропускаем."""
+        replayed = 0
+        for path in (self.journal_file + ".old", self.journal_file):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record['seq'] <= self.journal_seq:
+                        continue
+                    _replay_record(data, record['op'], record['args'])
+                    self.journal_seq = record['seq']
+                    replayed += 1
+        return replayed
     
     def create_default_data(self):
         """Создает данные по умолчанию"""
@@ -32,36 +197,331 @@ class SaveManager:
             'total_games': 0
         }
     
+    # ---------- ЗАПИСЬ ----------
     def save_data(self):
-        """Сохраняет данные в файл"""
+        """Сохраняет данные в файл прямо сейчас"""
+        return self.flush()
+
+    def _changed(self, op, *args):
+        """Данные изменились (вызывается под self.lock)."""
+        self.mutations += 1
+        self.pending += 1
+        if self.backend == "journal":
+            self._append(op, args)
+
+        if not self.write_behind:
+            # json — пишем каждое изменение, журнал — сжимаем по порогу
+            if self.backend == "json" or self.pending >= self.compact_records:
+                self._compact()
+            return
+
+        if self.dirty_since is None:
+            self.dirty_since = time.monotonic()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._flusher, name="save-flusher", daemon=True)
+            self.thread.start()
+        elif self.pending >= self._max_pending():
+            self.cond.notify()
+
+    def _append(self, op, args):
+        """Дописать изменение в журнал: одна короткая строка вместо всего файла."""
+        if self.journal is None:
+            self.journal = open(self.journal_file, 'a', encoding='utf-8')
+        self.journal_seq += 1
+        line = json.dumps({'seq': self.journal_seq, 'op': op, 'args': list(args)}) + "\n"
+        self.journal.write(line)
+        # до ОС сразу: падение процесса монеты не теряет
+        self.journal.flush()
+        self.journal_bytes += len(line.encode('utf-8'))
+
+    def _max_pending(self):
+        return self.compact_records if self.backend == "journal" else self.flush_max_pending
+
+    def _deadline(self):
+        """Когда фоновому потоку писать без дополнительных изменений (журналу не нужно)."""
+        if self.backend == "journal":
+            return None
+        return self.dirty_since + self.flush_interval
+
+    def _snapshot(self):
+        """Копия данных для записи; для журнала текущий файл уходит в .old. Вызывать под self.lock."""
+        data = copy.deepcopy(self.data)
+        # журнал может остаться и от прошлого запуска с backend="journal"
+        if self.backend == "journal" or os.path.exists(self.journal_file):
+            data['journal_seq'] = self.journal_seq
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            old_file = self.journal_file + ".old"
+            if os.path.exists(self.journal_file):
+                if os.path.exists(old_file):
+                    # прошлое сжатие не записалось: его .old ещё нужен, дописываем к нему
+                    with open(self.journal_file, 'r', encoding='utf-8') as src, \
+                            open(old_file, 'a', encoding='utf-8') as dst:
+                        dst.write(src.read())
+                    os.remove(self.journal_file)
+                else:
+                    os.replace(self.journal_file, old_file)
+            self.journal_bytes = 0
+        if self.pending > 1:
+            self.writes_avoided += self.pending - 1
+        self.pending = 0
+        self.dirty_since = None
+        return data
+
+    def _compact(self, force=False, purchase=None):
+        """
+        Снять снимок и записать его атомарно: temp-файл, fsync, rename.
+        json: под межпроцессной блокировкой, слив с тем, что записали другие копии игры.
+        force=True — перечитать диск, даже если у нас изменений нет.
+        purchase — json: (цена, башня или None) — в той же транзакции списать монеты
+        (и открыть башню), если после слива их хватает. Тогда возвращает, удалась ли покупка.
+        """
+        with self.write_lock:
+            with self.lock:
+                if not (self.pending or force or purchase
+                        or os.path.exists(self.journal_file + ".old")):
+                    return True
+                start = time.perf_counter()
+                pending = self.pending
+                local = self._snapshot()
+
+            done = changed = False
+            try:
+                if self.backend == "json":
+                    merged, done, changed = self._merge_to_disk(local, purchase)
+                else:
+                    self._write_file(json.dumps(local, indent=4, ensure_ascii=False))
+                if os.path.exists(self.journal_file + ".old"):
+                    os.remove(self.journal_file + ".old")
+            except Exception as e:
+                print(f"Ошибка сохранения: {e}")
+                with self.lock:
+                    # снимок не записан: его изменения снова ждут записи
+                    if pending:
+                        if pending > 1:
+                            self.writes_avoided -= pending - 1
+                        self.pending += pending
+                        self.dirty_since = time.monotonic()
+                return False
+
+            if self.backend == "json":
+                local.pop('journal_seq', None)
+                with self.lock:
+                    # изменения, сделанные пока мы писали, переносим поверх слитых данных
+                    self.data = merge_save(merged, local, self.data)
+                    self.base = merged
+                    if changed:
+                        self.mutations += 1
+
+            self.writes += 1
+            if self.backend == "journal":
+                self.compactions += 1
+                self.last_compact_ms = (time.perf_counter() - start) * 1000
+            return done if purchase else True
+
+    def _write_file(self, text):
+        tmp_file = f"{self.save_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.save_file)
+
+    def _read_disk(self):
+        """Содержимое файла сохранения или None (нет файла / битый). Вызывать под flock."""
+        if not os.path.exists(self.save_file):
+            return None
         try:
-            with open(self.save_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=4, ensure_ascii=False)
+            with open(self.save_file, 'r', encoding='utf-8') as f:
+                disk = json.load(f)
+        except ValueError:
+            return None
+        disk.pop('journal_seq', None)
+        return disk
+
+    def _merge_to_disk(self, local, purchase=None):
+        """
+        Транзакция под flock: прочитать файл, слить с local, записать.
+        purchase — (цена, башня или None): списать монеты, если их хватает в слитых
+        данных, и открыть башню; уже открытую (другой копией игры) не оплачиваем.
+        Возвращает (слитые данные, удалась ли покупка, изменила ли она данные).
+        """
+        with open(self.lock_file, 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            start = time.perf_counter()
+            try:
+                disk = self._read_disk()
+                if disk is None:
+                    merged = local
+                else:
+                    merged = merge_save(disk, self.base, local)
+                    self.merges += 1
+                done = changed = False
+                if purchase:
+                    done, changed = _purchase(merged, *purchase)
+                text = json.dumps(merged, indent=4, ensure_ascii=False)
+                self._write_file(text)
+            finally:
+                self.lock_hold_ms = max(self.lock_hold_ms, (time.perf_counter() - start) * 1000)
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        merged.pop('journal_seq', None)
+        return merged, done, changed
+
+    def _flusher(self):
+        """Фоновый поток: ждёт изменений и пишет их пачкой."""
+        while True:
+            with self.cond:
+                while not self.pending and not self.closing:
+                    self.cond.wait()
+                if not self.pending:
+                    return
+                while self.pending and not (self.closing or self.flush_requested
+                                            or self.pending >= self._max_pending()):
+                    deadline = self._deadline()
+                    if deadline is None:
+                        self.cond.wait()
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                self.flush_requested = False
+                if not self.pending:
+                    # пока ждали, всё уже записал flush()
+                    continue
+            if not self._compact():
+                # не записали: повторим через flush_interval, при закрытии — попробует flush()
+                with self.cond:
+                    if self.closing:
+                        return
+                    self.cond.wait(self.flush_interval)
+
+    def refresh(self):
+        """
+        Подтянуть то, что записали другие копии игры (json). Только чтение под
+        общей блокировкой: без записи и fsync, свои изменения допишет фоновый поток.
+        Если наша запись уже идёт, она сама сольёт диск — тогда не ждём её.
+        """
+        if self.backend != "json":
             return True
-        except Exception as e:
-            print(f"Ошибка сохранения: {e}")
+        if not self.write_lock.acquire(blocking=False):
+            return True
+        try:
+            with open(self.lock_file, 'a') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_SH)
+                try:
+                    disk = self._read_disk()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            if disk is None:
+                return True
+            with self.lock:
+                # наши незаписанные изменения (data относительно base) остаются поверх диска
+                self.data = merge_save(disk, self.base, self.data)
+                self.base = disk
+                self.merges += 1
+        except OSError as e:
+            print(f"Ошибка чтения сохранения: {e}")
             return False
+        finally:
+            self.write_lock.release()
+        return True
+
+    def flush(self, wait=True):
+        """
+        Записать накопленные изменения (для журнала — сжать его в снимок).
+        wait=False — только попросить фоновый поток записать их сейчас (не блокирует кадр).
+        False — изменения остались незаписанными (ошибка записи).
+        """
+        with self.cond:
+            if not wait and (not self.pending or self.thread is not None):
+                if self.pending:
+                    self.flush_requested = True
+                    self.cond.notify()
+                return True
+        # _compact дождётся записи фонового потока: если она не удалась, pending вернулся
+        return self._compact()
+
+    def close(self):
+        """Дописать всё и остановить фоновый поток (при выходе из игры). False — не всё записано."""
+        with self.cond:
+            self.closing = True
+            self.cond.notify()
+            thread = self.thread
+        if thread is not None:
+            thread.join()
+        result = self.flush()
+        with self.lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+        return result
+
+    def stats(self):
+        """Счётчики: изменения, реальные записи, сэкономленные записи и журнал."""
+        with self.lock:
+            return {
+                "backend": self.backend,
+                "mutations": self.mutations,
+                "writes": self.writes,
+                "writes_avoided": self.writes_avoided,
+                "pending": self.pending,
+                "journal_bytes": self.journal_bytes,
+                "replayed": self.replayed,
+                "compactions": self.compactions,
+                "last_compact_ms": self.last_compact_ms,
+                "merges": self.merges,
+                "lock_hold_ms": self.lock_hold_ms,
+            }
     
+    # ---------- ДАННЫЕ ----------
     def add_coins(self, amount):
         """Добавляет монеты"""
-        self.data['coins'] += amount
-        self.save_data()
+        with self.lock:
+            self.data['coins'] += amount
+            self._changed("add_coins", amount)
     
     def spend_coins(self, amount):
         """Тратит монеты"""
-        if self.data['coins'] >= amount:
-            self.data['coins'] -= amount
-            self.save_data()
-            return True
-        return False
+        if self.backend == "json":
+            # другая копия игры могла уже потратить общие монеты: проверка
+            # и списание — одной транзакцией под flock, по свежему диску
+            return self._compact(purchase=(amount, None))
+        with self.lock:
+            if self.data['coins'] >= amount:
+                self.data['coins'] -= amount
+                self._changed("spend_coins", amount)
+                return True
+            return False
     
+    def purchase_tower(self, tower_id, price):
+        """
+        Купить башню: списать монеты и открыть её одной операцией.
+        True — башня открыта (куплена сейчас или уже была), False — монет не хватает.
+        """
+        if self.backend == "json":
+            # json: одна транзакция под flock по свежему диску — две копии игры
+            # не оплатят одну башню дважды, а падение не оставит списание без башни
+            return self._compact(purchase=(price, tower_id))
+        with self.lock:
+            done, changed = _purchase(self.data, price, tower_id)
+            if changed:
+                self._changed("purchase_tower", tower_id, price)
+            return done
+
     def unlock_tower(self, tower_id):
         """Открывает башню"""
-        if tower_id not in self.data['unlocked_towers']:
-            self.data['unlocked_towers'].append(tower_id)
-            self.save_data()
-            return True
-        return False
+        with self.lock:
+            if tower_id not in self.data['unlocked_towers']:
+                self.data['unlocked_towers'].append(tower_id)
+                self._changed("unlock_tower", tower_id)
+                return True
+            return False
     
     def is_tower_unlocked(self, tower_id):
         """Проверяет, открыта ли башня"""
@@ -69,11 +529,12 @@ class SaveManager:
     
     def set_selected_tower(self, tower_id):
         """Устанавливает выбранную башню"""
-        if self.is_tower_unlocked(tower_id):
-            self.data['selected_tower'] = tower_id
-            self.save_data()
-            return True
-        return False
+        with self.lock:
+            if self.is_tower_unlocked(tower_id):
+                self.data['selected_tower'] = tower_id
+                self._changed("set_selected_tower", tower_id)
+                return True
+            return False
     
     def get_selected_tower(self):
         """Возвращает выбранную башню"""
@@ -81,11 +542,22 @@ class SaveManager:
     
     def update_high_score(self, score):
         """Обновляет рекорд"""
-        if score > self.data['high_score']:
-            self.data['high_score'] = score
-            self.save_data()
-            return True
-        return False
+        with self.lock:
+            if score > self.data['high_score']:
+                self.data['high_score'] = score
+                self._changed("update_high_score", score)
+                return True
+            return False
+    
+    def add_game(self):
+        """Засчитывает сыгранную партию"""
+        with self.lock:
+            self.data['total_games'] = self.data.get('total_games', 0) + 1
+            self._changed("add_game")
+
+    def get_total_games(self):
+        """Возвращает число сыгранных партий"""
+        return self.data.get('total_games', 0)
     
     def get_coins(self):
         """Возвращает количество монет"""
@@ -1,9 +1,10 @@
 import pygame
 
 
-from src.ui import Button, TowerCard
+from src.ui import Button, TowerCard, StaticLayer
 from src.constants import *
 from src.asset_loader import AssetLoader
+from src.fonts import get_font, text_cache
 
 
 
@@ -24,9 +25,12 @@ class Shop:
         self.error_sound = error_sound
         self.coin_sound = coin_sound  # ✅ ИСПРАВЛЕНО (было без self)
 
+        # монеты могли заработать другие копии игры с той же папкой data/
+        self.save_manager.refresh()
 
-        self.font_title = pygame.font.Font("freesansbold.ttf", 32)
-        self.font_coins = pygame.font.Font("freesansbold.ttf", 22)
+
+        self.font_title = get_font(32)
+        self.font_coins = get_font(22)
 
 
         btn_w, btn_h = 220, 55
@@ -36,7 +40,7 @@ class Shop:
             btn_w,
             btn_h,
             "Назад",
-            pygame.font.Font("freesansbold.ttf", 28),
+            get_font(28),
             click_sound=click_sound,
         )
 
@@ -44,6 +48,9 @@ class Shop:
         self.tower_cards = []
         self.create_tower_cards()
 
+        # заголовок, монеты и карточки без мигания — один закэшированный слой
+        self.static = StaticLayer(screen)
+
 
     def create_tower_cards(self):
         """Создание карточек башен: 2 в ширину, 4 в высоту, по центру экрана."""
@@ -91,13 +98,13 @@ class Shop:
             self.tower_cards.append(card)
 
 
-    def draw(self, background):
-        """Отрисовка магазина."""
-        self.screen.blit(background, (0, 0))
+    def _build_static(self, surface, background):
+        """Статика магазина: фон, заголовок, монеты, карточки и кнопка без подсветки."""
+        surface.blit(background, (0, 0))
 
 
         title_text = "Магазин башен"
-        title_surf = self.font_title.render(title_text, True, BLACK)
+        title_surf = text_cache.render(self.font_title, title_text, BLACK)
         title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, 70))
 
 
@@ -115,9 +122,9 @@ class Shop:
         border_color = (20, 20, 20)
 
 
-        pygame.draw.rect(self.screen, base_color, title_bg_rect, border_radius=12)
-        pygame.draw.rect(self.screen, border_color, title_bg_rect, 2, border_radius=12)
-        self.screen.blit(title_surf, title_rect)
+        pygame.draw.rect(surface, base_color, title_bg_rect, border_radius=12)
+        pygame.draw.rect(surface, border_color, title_bg_rect, 2, border_radius=12)
+        surface.blit(title_surf, title_rect)
 
 
         coins = self.save_manager.get_coins()
@@ -125,22 +132,50 @@ class Shop:
         coin_pos = (SCREEN_WIDTH - 90, 70)
 
 
-        pygame.draw.circle(self.screen, coin_color, coin_pos, 10)
-        pygame.draw.circle(self.screen, (180, 140, 0), coin_pos, 10, 2)
+        pygame.draw.circle(surface, coin_color, coin_pos, 10)
+        pygame.draw.circle(surface, (180, 140, 0), coin_pos, 10, 2)
 
 
-        coins_text = self.font_coins.render(str(coins), True, BLACK)
+        coins_text = text_cache.render(self.font_coins, str(coins), BLACK)
         coins_rect = coins_text.get_rect(midleft=(coin_pos[0] + 18, coin_pos[1]))
-        self.screen.blit(coins_text, coins_rect)
+        surface.blit(coins_text, coins_rect)
+
+
+        for card in self.tower_cards:
+            card.draw(surface, flash=False)
+
+
+        self.back_button.draw(surface, hovered=False)
+
+
+    def draw(self, background):
+        """Отрисовка магазина."""
+        key = (
+            background,
+            self.save_manager.get_coins(),
+            tuple((card.tower_id, card.is_unlocked, card.is_selected) for card in self.tower_cards),
+        )
+        layer = self.static.get(key, lambda surface: self._build_static(surface, background))
+        self.screen.blit(layer, (0, 0))
 
 
         # обновляем карточки перед рисованием (для мигания)
         for card in self.tower_cards:
             card.update()
-            card.draw(self.screen)
+            if card.error_flash:
+                card.draw(self.screen)
+
 
+        if self.back_button.is_hovered:
+            self.back_button.draw(self.screen)
 
-        self.back_button.draw(self.screen)
+
+    def track_dirty(self, tracker):
+        """Сообщить изменённые области (режим dirty-rect)."""
+        tracker.watch("shop", (self.save_manager.get_coins(), self.save_manager.get_selected_tower()))
+        for card in self.tower_cards:
+            card.track_dirty(tracker)
+        self.back_button.track_dirty(tracker)
 
 
     def handle_event(self, event):
@@ -169,12 +204,12 @@ class Shop:
 
 
         if not card.is_unlocked:
-            # сначала проверяем, хватает ли монет — без звука клика
-            if self.save_manager.spend_coins(card.price):
+            # сначала проверяем, хватает ли монет — без звука клика;
+            # списание и открытие башни — одна операция сохранения
+            if self.save_manager.purchase_tower(tower_id, card.price):
                 # 🪙 ПОКУПКА УСПЕШНА → ЗВУК МОНЕТЫ
                 if self.coin_sound:
                     self.coin_sound.play()
-                self.save_manager.unlock_tower(tower_id)
                 self.save_manager.set_selected_tower(tower_id)
                 self.create_tower_cards()
                 return "purchased"
@@ -0,0 +1,198 @@
+"""
+Прогон целых партий без отрисовки (--headless-sim): GameCore + игрок-автомат.
+
+Ни окна, ни звуков, ни сохранений — только шаги симуляции подряд, поэтому
+партии идут со скоростью процессора. Политика решает, когда отпустить блок.
+"""
+import random
+import statistics
+import time
+from math import sin
+
+from src.core import GameCore
+from src.constants import (
+    SCREEN_WIDTH,
+    BLOCK_WIDTH,
+    ROPE_ORIGIN_X,
+    ROPE_LENGTH,
+    HOOK_ATTACH_OFFSET_X,
+    MAX_MISSES,
+    HEADLESS_MAX_GAME_STEPS,
+    HEADLESS_FIXED_PERIOD,
+    HEADLESS_NOISE_SIGMA,
+)
+
+
+GOLDEN_PULL = 3  # px: насколько оракул смещает прицел к основанию башни
+
+
+# ---------- ПОЛИТИКИ ----------
+class FixedPolicy:
+    """Отпускает блок ровно через period шагов после его появления."""
+
+    def __init__(self, period=HEADLESS_FIXED_PERIOD, rng=None):
+        self.period = period
+        self.waited = 0
+        self.spawn = None
+
+    def should_drop(self, core):
+        # новый блок — новая партия (новый BlockCore) или респаун после постройки / промаха
+        spawn = (core.block, core.blocks_placed, core.misses)
+        if spawn != self.spawn:
+            self.spawn = spawn
+            self.waited = 0
+        self.waited += 1
+        return self.waited >= self.period
+
+
+class OraclePolicy:
+    """
+    Отпускает блок в шаг, ближе которого к верху башни он уже не подойдёт:
+    следующий x считается по текущему углу (так его поставит swing()).
+    aim — дополнительная ошибка прицела (у оракула 0).
+    """
+
+    def __init__(self, rng=None):
+        self.aim = 0.0
+
+    def target(self, core):
+        tower = core.tower
+        if tower.size:
+            # в пределах «золотого» окна (±5 px) тянем башню обратно к основанию,
+            # иначе мелкие промахи одного знака копятся и башня заваливается
+            top = tower.xlist[-1]
+            lean = max(-GOLDEN_PULL, min(GOLDEN_PULL, tower.xbase - top))
+            return top + lean + self.aim
+        # первый блок ставится куда угодно — целимся в центр
+        return (SCREEN_WIDTH - BLOCK_WIDTH) / 2 + self.aim
+
+    def should_drop(self, core):
+        block = core.block
+        target = self.target(core)
+        x_next = ROPE_ORIGIN_X + ROPE_LENGTH * sin(block.angle) - HOOK_ATTACH_OFFSET_X
+        distance = abs(block.x - target)
+        if distance < BLOCK_WIDTH * 0.5 and distance <= abs(x_next - target):
+            self.dropped()
+            return True
+        return False
+
+    def dropped(self):
+        pass
+
+
+class NoisyPolicy(OraclePolicy):
+    """Оракул с ошибкой прицела: на каждый блок — своё смещение N(0, sigma) px."""
+
+    def __init__(self, sigma=HEADLESS_NOISE_SIGMA, rng=None):
+        super().__init__()
+        self.sigma = sigma
+        self.rng = rng or random.Random()
+        self.dropped()
+
+    def dropped(self):
+        self.aim = self.rng.gauss(0.0, self.sigma)
+
+
+POLICIES = {
+    "fixed": FixedPolicy,
+    "noisy": NoisyPolicy,
+    "oracle": OraclePolicy,
+}
+
+
+# ---------- ПРОГОН ----------
+def play_game(policy, core=None, max_steps=HEADLESS_MAX_GAME_STEPS):
+    """
+    Одна партия до конца (или до max_steps шагов). Возвращает словарь итогов;
+    reason = "timeout", если партия не закончилась сама.
+    """
+    core = core or GameCore()
+    steps = 0
+    while not core.game_over and steps < max_steps:
+        if core.block.state == "ready" and policy.should_drop(core):
+            core.drop()
+        core.step()
+        steps += 1
+
+    return {
+        "score": core.score,
+        "blocks": core.blocks_placed,
+        "golden": core.golden_count,
+        "max_combo": core.max_combo,
+        "misses": core.misses,
+        "coins": core.coins_earned,
+        "reason": core.game_over_reason or "timeout",
+        "steps": steps,
+    }
+
+
+def run_games(policy_name, games, seed=0, max_steps=HEADLESS_MAX_GAME_STEPS, **policy_args):
+    """games партий подряд одной политикой; случайность — только из seed."""
+    rng = random.Random(seed)
+    policy = POLICIES[policy_name](rng=rng, **policy_args)
+    core = GameCore()
+    results = []
+    for _ in range(games):
+        core.new_game()
+        results.append(play_game(policy, core, max_steps))
+    return results
+
+
+def summarize(results, elapsed):
+    """Скорость прогона и распределения счёта, доли золотых и промахов."""
+    scores = [r["score"] for r in results]
+    blocks = sum(r["blocks"] for r in results)
+    golden = sum(r["golden"] for r in results)
+    steps = sum(r["steps"] for r in results)
+
+    misses = {n: 0 for n in range(MAX_MISSES + 1)}
+    reasons = {}
+    for r in results:
+        misses[r["misses"]] = misses.get(r["misses"], 0) + 1
+        reasons[r["reason"]] = reasons.get(r["reason"], 0) + 1
+
+    golden_rates = [r["golden"] / r["blocks"] for r in results if r["blocks"]]
+    if len(scores) >= 2:
+        p10, p50, p90 = (statistics.quantiles(scores, n=10, method="inclusive")[i] for i in (0, 4, 8))
+    else:
+        p10 = p50 = p90 = scores[0] if scores else 0
+
+    return {
+        "games": len(results),
+        "elapsed": elapsed,
+        "games_per_sec": len(results) / elapsed if elapsed else 0.0,
+        "steps_per_sec": steps / elapsed if elapsed else 0.0,
+        "score_mean": statistics.fmean(scores) if scores else 0.0,
+        "score_min": min(scores, default=0),
+        "score_p10": p10,
+        "score_p50": p50,
+        "score_p90": p90,
+        "score_max": max(scores, default=0),
+        "golden_rate": golden / blocks if blocks else 0.0,
+        "golden_rate_p50": statistics.median(golden_rates) if golden_rates else 0.0,
+        "misses": misses,
+        "reasons": reasons,
+    }
+
+
+def format_report(policy_name, summary):
+    s = summary
+    lines = [
+        f"policy: {policy_name}, games: {s['games']}, {s['elapsed']:.2f} s",
+        f"speed: {s['games_per_sec']:.1f} games/s, {s['steps_per_sec'] / 1000:.0f}k steps/s",
+        f"score: mean {s['score_mean']:.1f}, min {s['score_min']}, p10 {s['score_p10']:.0f}, "
+        f"p50 {s['score_p50']:.0f}, p90 {s['score_p90']:.0f}, max {s['score_max']}",
+        f"golden rate: {s['golden_rate']:.1%} of blocks (median per game {s['golden_rate_p50']:.1%})",
+        "misses: " + ", ".join(f"{n}: {count}" for n, count in sorted(s["misses"].items())),
+        "end: " + ", ".join(f"{reason}: {count}" for reason, count in sorted(s["reasons"].items())),
+    ]
+    return "\n".join(lines)
+
+
+def run(policy_name, games, seed=0, **policy_args):
+    """Прогнать партии и напечатать отчёт (точка входа --headless-sim)."""
+    start = time.perf_counter()
+    results = run_games(policy_name, games, seed, **policy_args)
+    summary = summarize(results, time.perf_counter() - start)
+    print(format_report(policy_name, summary))
+    return summary
@@ -0,0 +1,40 @@
+from src.constants import SIM_HZ, SIM_MAX_STEPS
+
+
+class FixedTimestep:
+    """
+    Аккумулятор фиксированного шага: реальное время кадра копится и
+    расходуется шагами по 1 / hz секунды. time_scale замедляет сами часы
+    (слоу-мо), alpha — доля следующего шага для интерполяции отрисовки.
+    """
+
+    def __init__(self, hz=SIM_HZ, max_steps=SIM_MAX_STEPS):
+        self.step = 1.0 / hz
+        self.max_steps = max_steps
+        self.time_scale = 1.0
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+        self.steps = 0
+        self.dropped = 0
+
+    def advance(self, dt):
+        """Добавить dt секунд реального времени, вернуть число шагов симуляции."""
+        self.accumulator += dt * self.time_scale
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            # не догоняем бесконечно: лишнее время просто теряем
+            self.dropped += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = self.step * steps + self.accumulator % self.step
+        self.accumulator -= steps * self.step
+        self.alpha = self.accumulator / self.step
+        self.steps += steps
+        return steps
+
+    def stats(self):
+        return {
+            "steps": self.steps,
+            "dropped": self.dropped,
+            "time_scale": self.time_scale,
+        }
@@ -1,157 +1,110 @@
 import pygame
 from src.constants import *
+from src.core import TowerCore
 
 
-class Tower(pygame.sprite.Sprite):
+class Tower(TowerCore, pygame.sprite.Sprite):
+    """Логика башни — в TowerCore, здесь кэшированный слой блоков и отрисовка."""
+
     def __init__(self, tower_sprites):
         pygame.sprite.Sprite.__init__(self)
+        TowerCore.__init__(self)
         self.tower_sprites = tower_sprites
 
-        self.size = 0
         self.image = tower_sprites['mid'][0]
         self.rect = self.image.get_rect()
-
-        self.xbase = 0
-        self.y = SCREEN_HEIGHT
-        self.x = 0
-        self.height = 0
-
-        self.xlist = []
-        self.sprite_list = []
-        self.golden_list = []
-
-        self.onscreen = 0
-        self.change = 0
-        self.speed = WOBBLE_SPEED
-        self.wobbling = False
-        self.scrolling = False
-        self.golden = False
         self.redraw = False
-        self.display_status = True
-        self.collapse_reason = None
-
-    def get_display(self):
-        return self.display_status
-
-    def is_scrolling(self):
-        return self.scrolling
 
-    def is_golden(self):
-        return self.golden
-
-    def get_top_y(self):
-        return self.y
-
-    def build(self, block):
-        # увеличиваем размер
-        self.size += 1
-        self.onscreen = self.size
-
-        if self.size == 1:
-            self.xbase = block.xlast
-            self.xlist = [self.xbase]
-            self.sprite_list = [('bot', 0)]
-            self.golden_list = [False]
-        else:
-            self.xlist.append(block.xlast)
-            self.sprite_list.append((block.sprite_type, block.sprite_index))
-            self.golden_list.append(self.golden)
-
-        # высота и позиция от земли, БЕЗ потолка по верёвке
-        self.height = self.size * BLOCK_HEIGHT
-        base_y = SCREEN_HEIGHT - BLOCK_HEIGHT
-        self.y = base_y - (self.height - BLOCK_HEIGHT)
-
-    def get_width(self):
-        width = BLOCK_WIDTH
-        if self.size <= 0:
-            return width
-
-        if self.xlist[-1] > self.xbase:
-            width = (self.xlist[-1] - self.xbase) + BLOCK_WIDTH
-        if self.xlist[-1] < self.xbase:
-            width = -((self.xbase - self.xlist[-1]) + BLOCK_WIDTH)
-
-        return width
+        # кэшированный слой с уже построенными блоками
+        self.layer = None
+        self.layer_capacity = 0
+        self.layer_count = 0
+        self.layer_views = {}
+        self.empty_surface = pygame.Surface((0, 0), pygame.SRCALPHA)
+
+    def _block_image(self, i):
+        sprite_type, sprite_index = self.sprite_list[i]
+        if sprite_type == 'bot':
+            return self.tower_sprites['bot']
+        return self.tower_sprites['mid'][sprite_index]
+
+    def _sync_layer(self):
+        """
+        Досинхронизировать кэшированный слой башни со списком блоков.
+        Блоки лежат снизу вверх от низа слоя (как раньше в draw),
+        новые блоки просто дорисовываются, полная перерисовка — только при redraw.
+        """
+        count = len(self.xlist)
+        if self.layer is None or count > self.layer_capacity:
+            capacity = max(MAX_ONSCREEN_BLOCKS, self.layer_capacity)
+            while capacity < count:
+                capacity *= 2
+            self.layer = pygame.Surface(
+                (TOWER_LAYER_WIDTH, capacity * BLOCK_HEIGHT), pygame.SRCALPHA
+            ).convert_alpha()
+            self.layer_capacity = capacity
+            self.layer_views = {}
+            self.redraw = True
+
+        if self.redraw:
+            self.layer.fill((0, 0, 0, 0))
+            self.layer_count = 0
+            self.redraw = False
+
+        layer_height = self.layer_capacity * BLOCK_HEIGHT
+        for i in range(self.layer_count, count):
+            y_pos = layer_height - BLOCK_HEIGHT * (i + 1)
+            self.layer.blit(self._block_image(i), (self.xlist[i], y_pos))
+        self.layer_count = count
+
+    def _layer_area(self, blocks):
+        """Прямоугольник нижних blocks блоков слоя."""
+        blocks = max(0, min(blocks, self.layer_capacity))
+        top = (self.layer_capacity - blocks) * BLOCK_HEIGHT
+        return pygame.Rect(0, top, TOWER_LAYER_WIDTH, blocks * BLOCK_HEIGHT)
+
+    def _layer_view(self, blocks):
+        """Subsurface нижних blocks блоков (без копирования пикселей)."""
+        view = self.layer_views.get(blocks)
+        if view is None:
+            view = self.layer.subsurface(self._layer_area(blocks))
+            self.layer_views[blocks] = view
+        return view
 
     def draw(self):
         if self.size >= 1:
-            surf = pygame.Surface((800, self.onscreen * BLOCK_HEIGHT), pygame.SRCALPHA)
-            surf = surf.convert_alpha()
-
-            buildlist = self.xlist
-            spritelist = self.sprite_list
-
-            for i in range(len(buildlist)):
-                sprite_type, sprite_index = spritelist[i]
-
-                if sprite_type == 'bot':
-                    block_img = self.tower_sprites['bot']
-                else:
-                    block_img = self.tower_sprites['mid'][sprite_index]
-
-                y_pos = self.onscreen * BLOCK_HEIGHT - BLOCK_HEIGHT * (i + 1)
-                surf.blit(block_img, (buildlist[i], y_pos))
+            self._sync_layer()
+            surf = self._layer_view(self.onscreen)
         else:
-            surf = pygame.Surface((0, 0), pygame.SRCALPHA)
+            surf = self.empty_surface
 
         self.rect = surf.get_rect()
         return surf
 
-    def unbuild(self, block):
-        self.display_status = False
-        if self.y > block.y:
-            block.y = self.y
-            self.size -= 1
-
-        surf = pygame.Surface((800, (self.onscreen - 1) * BLOCK_HEIGHT), pygame.SRCALPHA)
-        surf = surf.convert_alpha()
-
-        buildlist = self.xlist[-self.onscreen:-1]
-        spritelist = self.sprite_list[-self.onscreen:-1]
-
-        for i in range(len(buildlist)):
-            sprite_type, sprite_index = spritelist[i]
-
-            if sprite_type == 'bot':
-                block_img = self.tower_sprites['bot']
-            else:
-                block_img = self.tower_sprites['mid'][sprite_index]
-
-            y_pos = (self.onscreen - 1) * BLOCK_HEIGHT - BLOCK_HEIGHT * (i + 1)
-            surf.blit(block_img, (buildlist[i], y_pos))
-
-        self.rect = surf.get_rect()
-        return surf
+    def trim(self, keep):
+        TowerCore.trim(self, keep)
+        self.redraw = True
 
-    def collapse(self, direction):
-        self.y += 5
-        if direction == "l":
-            self.x -= 5
-        elif direction == "r":
-            self.x += 5
-
-    def wobble(self):
-        width = self.get_width()
-        if ((width > 100 or width < -100) and self.size >= 5) or self.size >= 20:
-            self.wobbling = True
-
-        if self.wobbling:
-            self.change += self.speed
-
-        if self.change > WOBBLE_LIMIT:
-            self.speed = -WOBBLE_SPEED
-        elif self.change < -WOBBLE_LIMIT:
-            self.speed = WOBBLE_SPEED
-
-    def display(self, screen, scroll_y=0):
-        surf = self.draw()
-        x = int(self.x + self.change)
+    def display(self, screen, scroll_y=0, alpha=1.0):
+        if self.size < 1:
+            return
+        self._sync_layer()
+        x = int(self.x + self.draw_change(alpha))
         y = int(self.y + scroll_y)
-        screen.blit(surf, (x, y))
-
-    def scroll(self):
-        self.scrolling = False
+        screen.blit(self.layer, (x, y), self._layer_area(self.onscreen))
+
+    def track_dirty(self, tracker, alpha=1.0):
+        if not self.display_status or self.size < 1:
+            tracker.track(self, None, None)
+            return
+        left = min(self.xlist)
+        width = max(self.xlist) - left + BLOCK_WIDTH
+        x = int(self.x + self.draw_change(alpha)) + left
+        rect = pygame.Rect(x, int(self.y), width, self.onscreen * BLOCK_HEIGHT)
+        state = (tuple(self.xlist), self.onscreen)
+        # запас по 2px с боков: край слоя и дробное смещение раскачки
+        tracker.track(self, state, rect.inflate(4, 0))
 
     def reset(self):
+        """Принудительно перерисовать слой башни при следующем draw."""
         self.redraw = True
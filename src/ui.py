@@ -1,8 +1,38 @@
 import pygame
 
+from src.asset_loader import AssetLoader
+from src.fonts import get_font, text_cache
+from src.presenter import PRESENT_MODE_LABELS
 from src.constants import ASSETS_PATH, UI_PATH, SCREEN_WIDTH, SCREEN_HEIGHT, BLACK
 
 
+class StaticLayer:
+    """
+    Закэшированный полноэкранный слой со статикой экрана (фон, панели, подписи).
+    Перестраивается только когда меняется key, в остальных кадрах — один blit.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.surface = None
+        self.key = None
+        self.rebuilds = 0
+
+    def get(self, key, build):
+        if self.surface is None:
+            self.surface = pygame.Surface(self.screen.get_size(), 0, self.screen)
+        elif key == self.key:
+            return self.surface
+        build(self.surface)
+        self.key = key
+        self.rebuilds += 1
+        return self.surface
+
+    def invalidate(self):
+        self.key = None
+        self.surface = None
+
+
 class Button:
     def __init__(
         self,
@@ -25,22 +55,45 @@ class Button:
         self.hover_color = hover_color
         self.is_hovered = False
         self.click_sound = click_sound
+        self.surfaces = {}
+
+    def _render(self, hovered):
+        """Готовая картинка кнопки (с тенью) для данного состояния, кэшируется."""
+        key = (hovered, self.text, self.color, self.hover_color, self.text_color)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            return surf
 
-    def draw(self, screen):
-        base_color = self.hover_color if self.is_hovered else self.color
+        base_color = self.hover_color if hovered else self.color
+        rect = pygame.Rect(0, 0, self.rect.width, self.rect.height)
+        surf = pygame.Surface((rect.width + 3, rect.height + 3), pygame.SRCALPHA)
 
-        shadow_rect = self.rect.copy()
+        # тень на экране без альфы всегда была сплошной чёрной
+        shadow_rect = rect.copy()
         shadow_rect.x += 3
         shadow_rect.y += 3
-        pygame.draw.rect(screen, (0, 0, 0, 80), shadow_rect, border_radius=10)
+        pygame.draw.rect(surf, (0, 0, 0), shadow_rect, border_radius=10)
 
-        pygame.draw.rect(screen, base_color, self.rect, border_radius=10)
-        pygame.draw.rect(screen, (20, 20, 20), self.rect, 2, border_radius=10)
+        pygame.draw.rect(surf, base_color, rect, border_radius=10)
+        pygame.draw.rect(surf, (20, 20, 20), rect, 2, border_radius=10)
 
         if self.text:
-            text_surf = self.font.render(self.text, True, self.text_color)
-            text_rect = text_surf.get_rect(center=self.rect.center)
-            screen.blit(text_surf, text_rect)
+            text_surf = text_cache.render(self.font, self.text, self.text_color)
+            text_rect = text_surf.get_rect(center=rect.center)
+            surf.blit(text_surf, text_rect)
+
+        self.surfaces[key] = surf
+        return surf
+
+    def draw(self, screen, hovered=None):
+        if hovered is None:
+            hovered = self.is_hovered
+        screen.blit(self._render(hovered), self.rect.topleft)
+
+    def track_dirty(self, tracker):
+        # с тенью (+3px) кнопка занимает чуть больше self.rect
+        area = self.rect.inflate(3, 3).move(1, 1)
+        tracker.track(self, (self.is_hovered, self.text), area, atomic=True)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -78,8 +131,8 @@ class TowerCard:
         self.is_hovered = False
         self.click_sound = click_sound
 
-        self.font = pygame.font.Font("freesansbold.ttf", 18)
-        self.small_font = pygame.font.Font("freesansbold.ttf", 14)
+        self.font = get_font(18)
+        self.small_font = get_font(14)
 
         self.button_rect = pygame.Rect(
             self.rect.x + 20,
@@ -92,6 +145,8 @@ class TowerCard:
         self.error_flash = False
         self.error_flash_timer = 0  # в кадрах
 
+        self.surfaces = {}
+
     def trigger_error_flash(self, frames=20):
         """Включить мигание красным на несколько кадров."""
         self.error_flash = True
@@ -104,43 +159,52 @@ class TowerCard:
             if self.error_flash_timer <= 0:
                 self.error_flash = False
 
-    def draw(self, screen):
-        base_color = (180, 200, 230)
-        border_color = (20, 20, 20)
-
+    def _card_color(self):
         # если ошибка активна — мигаем красным
         if self.error_flash and (self.error_flash_timer // 3) % 2 == 0:
-            card_color = (255, 120, 120)
-        else:
-            card_color = base_color
+            return (255, 120, 120)
+        return (180, 200, 230)
+
+    def _render(self, flash=True):
+        """Картинка карточки для текущего состояния (кэш по состоянию)."""
+        card_color = self._card_color() if flash else (180, 200, 230)
+        key = (self.is_selected, self.is_unlocked, card_color)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            return surf
+
+        surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        rect = surf.get_rect()
+        button_rect = self.button_rect.move(-self.rect.x, -self.rect.y)
+        border_color = (20, 20, 20)
 
         if self.is_selected:
-            pygame.draw.rect(screen, (144, 238, 144), self.rect, border_radius=8)
-            pygame.draw.rect(screen, border_color, self.rect, 4, border_radius=8)
+            pygame.draw.rect(surf, (144, 238, 144), rect, border_radius=8)
+            pygame.draw.rect(surf, border_color, rect, 4, border_radius=8)
         else:
-            pygame.draw.rect(screen, card_color, self.rect, border_radius=8)
-            pygame.draw.rect(screen, border_color, self.rect, 3, border_radius=8)
+            pygame.draw.rect(surf, card_color, rect, border_radius=8)
+            pygame.draw.rect(surf, border_color, rect, 3, border_radius=8)
 
         if self.preview_sprite:
             sprite_rect = self.preview_sprite.get_rect(
-                center=(self.rect.centerx, self.rect.y + 55)
+                center=(rect.centerx, rect.y + 55)
             )
-            screen.blit(self.preview_sprite, sprite_rect)
+            surf.blit(self.preview_sprite, sprite_rect)
 
-        name_surf = self.font.render(self.tower_name, True, BLACK)
+        name_surf = text_cache.render(self.font, self.tower_name, BLACK)
         name_rect = name_surf.get_rect(
-            center=(self.rect.centerx, self.rect.y + 105)
+            center=(rect.centerx, rect.y + 105)
         )
-        screen.blit(name_surf, name_rect)
+        surf.blit(name_surf, name_rect)
 
         if not self.is_unlocked:
-            price_surf = self.small_font.render(
-                f"{self.price} монет", True, BLACK
+            price_surf = text_cache.render(
+                self.small_font, f"{self.price} монет", BLACK
             )
             price_rect = price_surf.get_rect(
-                center=(self.rect.centerx, self.rect.y + 130)
+                center=(rect.centerx, rect.y + 130)
             )
-            screen.blit(price_surf, price_rect)
+            surf.blit(price_surf, price_rect)
 
         if not self.is_unlocked:
             btn_text = "Купить"
@@ -152,12 +216,22 @@ class TowerCard:
             btn_text = "Выбрать"
             btn_color = (180, 220, 255)
 
-        pygame.draw.rect(screen, btn_color, self.button_rect, border_radius=6)
-        pygame.draw.rect(screen, BLACK, self.button_rect, 2, border_radius=6)
+        pygame.draw.rect(surf, btn_color, button_rect, border_radius=6)
+        pygame.draw.rect(surf, BLACK, button_rect, 2, border_radius=6)
+
+        btn_surf = text_cache.render(self.small_font, btn_text, BLACK)
+        btn_rect = btn_surf.get_rect(center=button_rect.center)
+        surf.blit(btn_surf, btn_rect)
+
+        self.surfaces[key] = surf
+        return surf
 
-        btn_surf = self.small_font.render(btn_text, True, BLACK)
-        btn_rect = btn_surf.get_rect(center=self.button_rect.center)
-        screen.blit(btn_surf, btn_rect)
+    def draw(self, screen, flash=True):
+        screen.blit(self._render(flash), self.rect.topleft)
+
+    def track_dirty(self, tracker):
+        flash = self.error_flash_timer if self.error_flash else None
+        tracker.track(self, (self.is_selected, self.is_unlocked, flash), self.rect, atomic=True)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -175,9 +249,10 @@ class TowerCard:
 class MainMenu:
     def __init__(self, screen, click_sound=None):
         self.screen = screen
-        self.font_title = pygame.font.Font("freesansbold.ttf", 64)
-        self.font_button = pygame.font.Font("freesansbold.ttf", 32)
+        self.font_title = get_font(64)
+        self.font_button = get_font(32)
         self.click_sound = click_sound
+        self.static = StaticLayer(screen)
 
         btn_w, btn_h = 260, 70
         center_x = SCREEN_WIDTH // 2 - btn_w // 2
@@ -221,11 +296,11 @@ class MainMenu:
             ),
         }
 
-    def draw(self, background):
-        self.screen.blit(background, (0, 0))
+    def _build_static(self, surface, background):
+        surface.blit(background, (0, 0))
 
         title_text = "Tower Bloxx"
-        title_surf = self.font_title.render(title_text, True, BLACK)
+        title_surf = text_cache.render(self.font_title, title_text, BLACK)
         title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, 200))
 
         padding_x = 30
@@ -237,12 +312,24 @@ class MainMenu:
             title_rect.height + padding_y * 2,
         )
 
-        pygame.draw.rect(self.screen, (180, 200, 230), bg_rect, border_radius=12)
-        pygame.draw.rect(self.screen, (20, 20, 20), bg_rect, 2, border_radius=12)
-        self.screen.blit(title_surf, title_rect)
+        pygame.draw.rect(surface, (180, 200, 230), bg_rect, border_radius=12)
+        pygame.draw.rect(surface, (20, 20, 20), bg_rect, 2, border_radius=12)
+        surface.blit(title_surf, title_rect)
 
         for button in self.buttons.values():
-            button.draw(self.screen)
+            button.draw(surface, hovered=False)
+
+    def draw(self, background):
+        layer = self.static.get(background, lambda surface: self._build_static(surface, background))
+        self.screen.blit(layer, (0, 0))
+        # поверх статики — только кнопки под курсором
+        for button in self.buttons.values():
+            if button.is_hovered:
+                button.draw(self.screen)
+
+    def track_dirty(self, tracker):
+        for button in self.buttons.values():
+            button.track_dirty(tracker)
 
     def handle_event(self, event):
         for key, button in self.buttons.items():
@@ -252,46 +339,42 @@ class MainMenu:
 
 
 class SettingsMenu:
-    def __init__(self, screen, click_sound=None):
+    def __init__(self, screen, click_sound=None, asset_loader=None):
         self.screen = screen
-        self.font_title = pygame.font.Font("freesansbold.ttf", 48)
-        self.font_label = pygame.font.Font("freesansbold.ttf", 32)
-        self.font_button = pygame.font.Font("freesansbold.ttf", 28)
+        asset_loader = asset_loader or AssetLoader()
+        self.font_title = get_font(48)
+        self.font_label = get_font(32)
+        self.font_button = get_font(28)
         self.click_sound = click_sound
 
         self.music_muted = False
         self.sfx_muted = False
         self.bg_index = 0
         self.music_index = 0
+        self.present_mode = "smooth"
 
         # иконки громкости
-        raw_loud = pygame.image.load(f"{UI_PATH}loud.png").convert_alpha()
-        raw_silence = pygame.image.load(f"{UI_PATH}silence.png").convert_alpha()
         ICON_SIZE = (40, 40)
-        self.icon_loud = pygame.transform.smoothscale(raw_loud, ICON_SIZE)
-        self.icon_silence = pygame.transform.smoothscale(raw_silence, ICON_SIZE)
+        self.icon_loud = asset_loader.load_image(f"{UI_PATH}loud.png", size=ICON_SIZE)
+        self.icon_silence = asset_loader.load_image(f"{UI_PATH}silence.png", size=ICON_SIZE)
 
         # иконки фона
-        raw_dark = pygame.image.load(f"{UI_PATH}dark.png").convert_alpha()
-        raw_light = pygame.image.load(f"{UI_PATH}light.png").convert_alpha()
-        self.icon_dark = pygame.transform.smoothscale(raw_dark, ICON_SIZE)
-        self.icon_light = pygame.transform.smoothscale(raw_light, ICON_SIZE)
+        self.icon_dark = asset_loader.load_image(f"{UI_PATH}dark.png", size=ICON_SIZE)
+        self.icon_light = asset_loader.load_image(f"{UI_PATH}light.png", size=ICON_SIZE)
 
         # стрелки
-        raw_left = pygame.image.load(f"{UI_PATH}arrow_left.png").convert_alpha()
-        raw_right = pygame.image.load(f"{UI_PATH}arrow_right.png").convert_alpha()
         self.ARROW_SIZE = (32, 32)
-        self.icon_left = pygame.transform.smoothscale(raw_left, self.ARROW_SIZE)
-        self.icon_right = pygame.transform.smoothscale(raw_right, self.ARROW_SIZE)
+        self.icon_left = asset_loader.load_image(f"{UI_PATH}arrow_left.png", size=self.ARROW_SIZE)
+        self.icon_right = asset_loader.load_image(f"{UI_PATH}arrow_right.png", size=self.ARROW_SIZE)
 
         self.arrow_left_rect = pygame.Rect(0, 0, *self.ARROW_SIZE)
         self.arrow_right_rect = pygame.Rect(0, 0, *self.ARROW_SIZE)
 
         # геометрия блока настроек
-        labels_text = ["Музыка", "Звуки", "Фон меню/магазина"]
+        labels_text = ["Музыка", "Звуки", "Фон меню/магазина", "Экран"]
         max_label_width = 0
         for text in labels_text:
-            surf = self.font_label.render(text, True, BLACK)
+            surf = text_cache.render(self.font_label, text, BLACK)
             max_label_width = max(max_label_width, surf.get_width())
 
         label_bg_width = max_label_width + 40
@@ -326,8 +409,36 @@ class SettingsMenu:
             self.font_button,
             click_sound=click_sound,
         )
+        self.present_button = Button(
+            btn_x,
+            top_y + gap_y * 3,
+            btn_size,
+            btn_size,
+            PRESENT_MODE_LABELS[self.present_mode],
+            get_font(20),
+            click_sound=click_sound,
+        )
 
         self.label_bg_width = label_bg_width
+
+        # блок музыки "< Музыка 1/5 >" и стрелки в нём
+        self.music_block_rect = pygame.Rect(
+            self.label_x,
+            self.mute_music_button.rect.centery - 30,
+            self.label_bg_width,
+            60,
+        )
+        pad_side = 12
+        self.arrow_left_rect.center = (
+            self.music_block_rect.left + pad_side + self.ARROW_SIZE[0] // 2,
+            self.music_block_rect.centery,
+        )
+        self.arrow_right_rect.center = (
+            self.music_block_rect.right - pad_side - self.ARROW_SIZE[0] // 2,
+            self.music_block_rect.centery,
+        )
+
+        self.static = StaticLayer(screen)
         self.back_button = Button(
             20,
             SCREEN_HEIGHT - 80,
@@ -338,11 +449,28 @@ class SettingsMenu:
             click_sound=click_sound,
         )
 
-    def draw(self, background):
-        self.screen.blit(background, (0, 0))
+    def _buttons_with_icons(self):
+        icon_music = self.icon_silence if self.music_muted else self.icon_loud
+        icon_sfx = self.icon_silence if self.sfx_muted else self.icon_loud
+        icon_bg = self.icon_dark if self.bg_index == 0 else self.icon_light
+        return [
+            (self.mute_music_button, icon_music),
+            (self.mute_sfx_button, icon_sfx),
+            (self.bg_toggle_button, icon_bg),
+            (self.present_button, None),
+            (self.back_button, None),
+        ]
+
+    def _draw_button(self, surface, button, icon, hovered=None):
+        button.draw(surface, hovered=hovered)
+        if icon is not None:
+            surface.blit(icon, icon.get_rect(center=button.rect.center))
+
+    def _build_static(self, surface, background):
+        surface.blit(background, (0, 0))
 
         title_text = "Настройки"
-        title_surf = self.font_title.render(title_text, True, BLACK)
+        title_surf = text_cache.render(self.font_title, title_text, BLACK)
         title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, 120))
 
         padding_x = 20
@@ -354,35 +482,20 @@ class SettingsMenu:
             title_rect.height + padding_y * 2,
         )
 
-        pygame.draw.rect(self.screen, (180, 200, 230), bg_rect, border_radius=12)
-        pygame.draw.rect(self.screen, (20, 20, 20), bg_rect, 2, border_radius=12)
-        self.screen.blit(title_surf, title_rect)
+        pygame.draw.rect(surface, (180, 200, 230), bg_rect, border_radius=12)
+        pygame.draw.rect(surface, (20, 20, 20), bg_rect, 2, border_radius=12)
+        surface.blit(title_surf, title_rect)
 
         base_color = (180, 200, 230)
         border_color = (20, 20, 20)
 
         # --- Блок музыки: "< Музыка 1/5 >" ---
-        music_block_rect = pygame.Rect(
-            self.label_x,
-            self.mute_music_button.rect.centery - 30,
-            self.label_bg_width,
-            60,
-        )
+        music_block_rect = self.music_block_rect
 
-        pygame.draw.rect(self.screen, base_color, music_block_rect, border_radius=10)
-        pygame.draw.rect(self.screen, border_color, music_block_rect, 2, border_radius=10)
+        pygame.draw.rect(surface, base_color, music_block_rect, border_radius=10)
+        pygame.draw.rect(surface, border_color, music_block_rect, 2, border_radius=10)
 
         center_y = music_block_rect.centery
-        pad_side = 12
-
-        self.arrow_left_rect.center = (
-            music_block_rect.left + pad_side + self.ARROW_SIZE[0] // 2,
-            center_y,
-        )
-        self.arrow_right_rect.center = (
-            music_block_rect.right - pad_side - self.ARROW_SIZE[0] // 2,
-            center_y,
-        )
 
         for rect, icon in [(self.arrow_left_rect, self.icon_left),
                            (self.arrow_right_rect, self.icon_right)]:
@@ -393,12 +506,12 @@ class SettingsMenu:
                 rect.width + pad * 2,
                 rect.height + pad * 2,
             )
-            pygame.draw.rect(self.screen, base_color, bg_r, border_radius=8)
-            pygame.draw.rect(self.screen, border_color, bg_r, 2, border_radius=8)
-            self.screen.blit(icon, rect)
+            pygame.draw.rect(surface, base_color, bg_r, border_radius=8)
+            pygame.draw.rect(surface, border_color, bg_r, 2, border_radius=8)
+            surface.blit(icon, rect)
 
-        text_surf = self.font_label.render("Музыка", True, BLACK)
-        track_surf = self.font_label.render(f"{self.music_index + 1}/5", True, BLACK)
+        text_surf = text_cache.render(self.font_label, "Музыка", BLACK)
+        track_surf = text_cache.render(self.font_label, f"{self.music_index + 1}/5", BLACK)
 
         available_left = self.arrow_left_rect.right + 10
         available_right = self.arrow_right_rect.left - 10
@@ -412,50 +525,62 @@ class SettingsMenu:
         text_rect.centery = center_y
         text_rect.centerx = mid_x + 20
 
-        self.screen.blit(text_surf, text_rect)
-        self.screen.blit(track_surf, track_rect)
+        surface.blit(text_surf, text_rect)
+        surface.blit(track_surf, track_rect)
 
         # --- Остальные подписи (звук / фон) ---
         labels_rest = [
             ("Звуки", self.mute_sfx_button),
             ("Фон меню/магазина", self.bg_toggle_button),
+            ("Экран", self.present_button),
         ]
 
         for text, btn in labels_rest:
-            surf = self.font_label.render(text, True, BLACK)
+            surf = text_cache.render(self.font_label, text, BLACK)
             label_bg_rect = pygame.Rect(
                 self.label_x,
                 btn.rect.centery - 30,
                 self.label_bg_width,
                 60,
             )
-            pygame.draw.rect(self.screen, base_color, label_bg_rect, border_radius=10)
-            pygame.draw.rect(self.screen, border_color, label_bg_rect, 2, border_radius=10)
+            pygame.draw.rect(surface, base_color, label_bg_rect, border_radius=10)
+            pygame.draw.rect(surface, border_color, label_bg_rect, 2, border_radius=10)
             txt_rect = surf.get_rect(center=label_bg_rect.center)
-            self.screen.blit(surf, txt_rect)
+            surface.blit(surf, txt_rect)
 
-        self.mute_music_button.draw(self.screen)
-        self.mute_sfx_button.draw(self.screen)
-        self.bg_toggle_button.draw(self.screen)
+        self.present_button.text = PRESENT_MODE_LABELS[self.present_mode]
+        for button, icon in self._buttons_with_icons():
+            self._draw_button(surface, button, icon, hovered=False)
 
-        icon_music = self.icon_silence if self.music_muted else self.icon_loud
-        icon_sfx = self.icon_silence if self.sfx_muted else self.icon_loud
-        icon_bg = self.icon_dark if self.bg_index == 0 else self.icon_light
-
-        self.screen.blit(
-            icon_music,
-            icon_music.get_rect(center=self.mute_music_button.rect.center),
-        )
-        self.screen.blit(
-            icon_sfx,
-            icon_sfx.get_rect(center=self.mute_sfx_button.rect.center),
+    def draw(self, background):
+        key = (
+            background,
+            self.music_muted,
+            self.sfx_muted,
+            self.bg_index,
+            self.music_index,
+            self.present_mode,
         )
-        self.screen.blit(
-            icon_bg,
-            icon_bg.get_rect(center=self.bg_toggle_button.rect.center),
+        layer = self.static.get(key, lambda surface: self._build_static(surface, background))
+        self.screen.blit(layer, (0, 0))
+        # поверх статики — только кнопки под курсором
+        for button, icon in self._buttons_with_icons():
+            if button.is_hovered:
+                self._draw_button(self.screen, button, icon)
+
+    def track_dirty(self, tracker):
+        tracker.watch(
+            "settings",
+            (self.music_muted, self.sfx_muted, self.bg_index, self.music_index, self.present_mode),
         )
-
-        self.back_button.draw(self.screen)
+        for button in (
+            self.mute_music_button,
+            self.mute_sfx_button,
+            self.bg_toggle_button,
+            self.present_button,
+            self.back_button,
+        ):
+            button.track_dirty(tracker)
 
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -474,6 +599,9 @@ class SettingsMenu:
             self.bg_index = 1 - self.bg_index
             return "toggle_bg"
 
+        if self.present_button.handle_event(event):
+            return "present_mode"
+
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.arrow_left_rect.collidepoint(event.pos):
                 if self.click_sound:
@@ -0,0 +1,386 @@
+"""
+Ядро симуляции (src/core.py) против поведения игры до выделения ядра:
+маятник и падение, попадание и «золотое» окно ±5 px, порог обрушения,
+возрождение блока, счёт / монеты / комбо и слоу-мо.
+"""
+import os
+import subprocess
+import sys
+from math import sin, cos
+
+import pytest
+
+from src.constants import (
+    SCREEN_HEIGHT,
+    BLOCK_WIDTH,
+    BLOCK_HEIGHT,
+    ROPE_LENGTH,
+    ROPE_ORIGIN_X,
+    ROPE_ORIGIN_Y,
+    HOOK_BOTTOM_OFFSET,
+    HOOK_ATTACH_OFFSET_X,
+    HOOK_ATTACH_OFFSET_Y,
+    GRAVITY,
+    INITIAL_FORCE,
+    FORCE_ACCELERATION,
+    COLLAPSE_THRESHOLD,
+    MAX_MISSES,
+    COMBO_TIER_1,
+    COMBO_TIER_2,
+    COMBO_TIER_3,
+    SLOWMO_DURATION,
+    SLOWMO_FACTOR,
+    SLOWMO_MEGA_DURATION,
+    SLOWMO_MEGA_FACTOR,
+)
+from src.core import BlockCore, TowerCore, GameCore
+
+
+def hook_position(angle):
+    """Где висит блок при угле верёвки angle (как считает игра)."""
+    hook_x = ROPE_ORIGIN_X + ROPE_LENGTH * sin(angle)
+    hook_y = ROPE_ORIGIN_Y + ROPE_LENGTH * cos(angle)
+    return hook_x - HOOK_ATTACH_OFFSET_X, hook_y + HOOK_BOTTOM_OFFSET - HOOK_ATTACH_OFFSET_Y
+
+
+def make_tower(*xs):
+    """Башня из блоков, поставленных в точках xs."""
+    tower = TowerCore()
+    block = BlockCore()
+    for i, x in enumerate(xs):
+        block.set_sprite_for_block_number(i)
+        block.xlast = x
+        tower.build(block)
+    return tower
+
+
+def block_over(tower, xlast):
+    """Блок, отпущенный в xlast и долетевший до верха башни."""
+    block = BlockCore()
+    block.state = "dropped"
+    block.xlast = xlast
+    block.y = tower.y - BLOCK_HEIGHT
+    return block
+
+
+class RecordingCore(GameCore):
+    __slots__ = ("builds", "missed", "collapses")
+
+    def new_game(self, block=None, tower=None):
+        super().new_game(block, tower)
+        self.builds = []
+        self.missed = 0
+        self.collapses = []
+
+    def on_build(self, golden, x, y, coins):
+        self.builds.append((golden, coins))
+
+    def on_miss(self):
+        self.missed += 1
+
+    def on_collapse(self, falling):
+        self.collapses.append(falling)
+
+
+def land(core, offset):
+    """Следующий блок садится на верх башни со смещением offset и ставится за один шаг."""
+    tower = core.tower
+    block = core.block
+    block.state = "landed"
+    block.xlast = tower.xlist[-1] + offset
+    block.y = tower.y - BLOCK_HEIGHT
+    core.step()
+
+
+def started_core(x=200):
+    """Партия с одним (нижним) блоком в x."""
+    core = RecordingCore()
+    core.tower.build(block_over(core.tower, x))
+    return core
+
+
+# ---------- МАЯТНИК И ПАДЕНИЕ ----------
+def test_swing_positions_and_speed():
+    block = BlockCore()
+    assert (block.angle, block.speed, block.game_force) == (45, 0, INITIAL_FORCE)
+
+    block.swing()
+    assert (block.x, block.y) == hook_position(45)
+    assert block.angle == 45
+    assert block.speed == sin(45) * INITIAL_FORCE
+
+    speed = block.speed
+    block.swing()
+    assert (block.x, block.y) == hook_position(45)   # позиция — по углу до шага
+    assert block.angle == 45 + speed
+    assert block.speed == speed + sin(45 + speed) * INITIAL_FORCE
+
+    block.swing()
+    assert (block.x, block.y) == hook_position(45 + speed)
+
+
+def test_swing_uses_game_force():
+    block = BlockCore()
+    block.game_force = INITIAL_FORCE * 2.5
+    block.swing()
+    assert block.acceleration == sin(45) * (INITIAL_FORCE * 2.5)
+
+
+def test_swing_does_not_move_dropped_block():
+    block = BlockCore()
+    block.swing()
+    block.state = "dropped"
+    x, y = block.x, block.y
+    block.swing()
+    assert (block.x, block.y) == (x, y)
+
+
+def test_drop_falls_with_gravity_and_lands_on_ground():
+    tower = TowerCore()
+    block = BlockCore()
+    block.swing()
+    x, y = block.x, block.y
+
+    block.drop(tower)
+    assert block.state == "dropped"
+    assert block.xlast == x
+    assert block.speed == GRAVITY
+    assert block.y == y + GRAVITY
+
+    steps = 1
+    while block.state == "dropped":
+        block.drop(tower)
+        steps += 1
+        assert steps < 1000
+    assert block.state == "landed"
+    assert block.y >= SCREEN_HEIGHT - 424
+    assert block.y - block.speed < SCREEN_HEIGHT - 424
+
+
+def test_drop_past_tower_is_a_miss():
+    tower = make_tower(200)
+    block = block_over(tower, 200 + BLOCK_WIDTH)
+    while block.state == "dropped":
+        block.drop(tower)
+    assert block.state == "miss"
+    assert block.y >= SCREEN_HEIGHT + 100
+
+
+# ---------- ПОПАДАНИЕ И «ЗОЛОТО» ----------
+@pytest.mark.parametrize("offset, hit, golden", [
+    (0, True, True),
+    (4.9, True, True),
+    (-4.9, True, True),
+    (5, True, False),
+    (-5, True, False),
+    (BLOCK_WIDTH * 0.5 - 0.1, True, False),
+    (-BLOCK_WIDTH * 0.5 + 0.1, True, False),
+    (BLOCK_WIDTH * 0.5, False, False),
+    (-BLOCK_WIDTH * 0.5, False, False),
+])
+def test_collided_and_golden_window(offset, hit, golden):
+    tower = make_tower(200)
+    tower.golden = not golden
+    block = block_over(tower, 200 + offset)
+    assert block.collided(tower) is hit
+    assert tower.golden is golden
+
+
+def test_collided_needs_block_at_tower_top():
+    tower = make_tower(200, 200)
+    block = block_over(tower, 200)
+    block.y = tower.y - (BLOCK_HEIGHT + 10)
+    assert block.collided(tower)
+    block.y -= 1
+    assert not block.collided(tower)
+    assert not tower.golden
+
+
+def test_collided_with_empty_tower():
+    assert not block_over(TowerCore(), 0).collided(TowerCore())
+
+
+# ---------- ОБРУШЕНИЕ ----------
+THRESHOLD = BLOCK_WIDTH * COLLAPSE_THRESHOLD
+
+
+@pytest.mark.parametrize("offset, over", [(THRESHOLD - 0.5, False), (THRESHOLD, True), (-THRESHOLD, True)])
+def test_collapse_threshold_size_2_uses_base(offset, over):
+    tower = make_tower(200, 210)
+    block = BlockCore()
+    block.state = "landed"
+    block.xlast = 200 + offset
+    block.collapse(tower)
+    assert (block.state == "over") is over
+    assert (tower.collapse_reason == "offset") is over
+
+
+@pytest.mark.parametrize("offset, over", [(THRESHOLD - 0.5, False), (THRESHOLD, True), (-THRESHOLD, True)])
+def test_collapse_threshold_above_2_uses_block_below(offset, over):
+    tower = make_tower(200, 230, 240)
+    block = BlockCore()
+    block.state = "landed"
+    block.xlast = 230 + offset
+    block.collapse(tower)
+    assert (block.state == "over") is over
+
+
+def test_collapse_ignored_for_small_tower():
+    tower = make_tower(200)
+    block = BlockCore()
+    block.state = "landed"
+    block.xlast = 200 + BLOCK_WIDTH * 10
+    block.collapse(tower)
+    assert block.state == "landed"
+
+
+def test_tower_too_wide_collapses_game():
+    core = started_core()
+    land(core, 20)
+    land(core, 20)
+    assert not core.game_over
+    land(core, 20)   # ширина 96 + 60 > 140
+    assert core.game_over
+    assert core.game_over_reason == "collapse"
+    assert core.collapses == [False]
+    assert core.tower.x == 5
+
+
+# ---------- ВОЗРОЖДЕНИЕ ----------
+@pytest.mark.parametrize("size, angle", [(0, -45), (1, 45), (2, -45), (3, 45), (8, -45)])
+def test_respawn_angle_parity(size, angle):
+    tower = make_tower(*([200] * size))
+    block = BlockCore()
+    block.state = "scroll"
+    block.speed = 0.3
+    block.respawn(tower)
+    assert block.angle == angle
+    assert block.speed == 0
+    assert block.state == "ready"
+    assert (block.x, block.y) == hook_position(angle)
+    assert (block.prev_x, block.prev_y, block.prev_angle) == (block.x, block.y, angle)
+    assert block.block_number == size
+    expected_sprite = ('bot', 0) if size == 0 else ('mid', (size - 1) % 4)
+    assert (block.sprite_type, block.sprite_index) == expected_sprite
+
+
+# ---------- СЧЁТ, МОНЕТЫ, КОМБО ----------
+def test_normal_build_scores_one_and_five_coins():
+    core = started_core()
+    land(core, 20)
+    assert core.tower.size == 2
+    assert core.block.state == "scroll"
+    assert (core.score, core.coins_earned, core.combo) == (1, 5, 0)
+    assert core.builds == [(False, 5)]
+    assert core.force == INITIAL_FORCE * FORCE_ACCELERATION
+    assert not core.slowmo_active
+
+
+def test_golden_builds_multiply_score_and_coins():
+    core = started_core()
+    score = coins = 0
+    for combo in range(1, 12):
+        land(core, 0)
+        mult = 1 + min(combo * 0.3, 2.5)
+        score += int(2 * mult)
+        coins += int(10 * mult)
+        assert core.combo == combo
+        assert core.combo_timer == 180 - 1   # в конце того же шага уже убывает
+        assert (core.score, core.coins_earned) == (score, coins)
+        assert core.builds[-1] == (True, int(10 * mult))
+        core.tower.trim(2)   # без скролла фона: проверяем только счёт
+    assert core.golden_count == 11
+    assert core.max_combo == 11
+    # потолок множителя: 1 + 2.5
+    assert core.builds[-1] == (True, 35)
+
+
+def test_normal_build_resets_combo():
+    core = started_core()
+    land(core, 0)
+    land(core, 0)
+    assert core.combo == 2
+    land(core, 10)
+    assert core.combo == 0
+    assert core.max_combo == 2
+    assert core.combo_timer == 180 - 2   # обычный блок таймер не сбрасывает
+
+
+@pytest.mark.parametrize("combo, boost", [
+    (0, 1.0),
+    (COMBO_TIER_1 - 1, 1.0),
+    (COMBO_TIER_1, 1.5),
+    (COMBO_TIER_2, 2.0),
+    (COMBO_TIER_3, 2.5),
+    (COMBO_TIER_3 + 5, 2.5),
+])
+def test_combo_speed_boost(combo, boost):
+    core = GameCore()
+    core.combo = combo
+    assert core.combo_speed_boost() == boost
+    core.step()
+    assert core.block.game_force == core.force * boost
+
+
+def test_slowmo_triggers_at_combo_tiers():
+    core = started_core()
+    for _ in range(COMBO_TIER_2 - 1):
+        land(core, 0)
+        core.tower.trim(2)
+    assert not core.slowmo_active
+
+    land(core, 0)
+    assert core.combo == COMBO_TIER_2
+    assert core.slowmo_active
+    assert core.slowmo_intensity == SLOWMO_FACTOR
+    assert core.slowmo_timer == SLOWMO_DURATION
+    core.tower.trim(2)
+
+    for _ in range(COMBO_TIER_3 - COMBO_TIER_2):
+        land(core, 0)
+        core.tower.trim(2)
+    assert core.combo == COMBO_TIER_3
+    assert core.slowmo_intensity == SLOWMO_MEGA_FACTOR
+    assert core.slowmo_timer == SLOWMO_MEGA_DURATION
+
+
+def test_slowmo_timer_counts_real_time():
+    core = GameCore()
+    core.activate_slowmo(duration=SLOWMO_DURATION, factor=SLOWMO_FACTOR)
+    assert core.time_scale() == SLOWMO_FACTOR
+    steps = 0
+    while core.slowmo_active:
+        core.step()
+        steps += 1
+    # шаг при замедлении — 1 / factor реальных шагов
+    assert steps == int(SLOWMO_DURATION * SLOWMO_FACTOR) + 1
+    assert core.time_scale() == 1.0
+
+
+# ---------- ПРОМАХИ ----------
+def test_misses_end_game():
+    core = started_core()
+    for miss in range(1, MAX_MISSES + 1):
+        core.block.state = "miss"
+        core.step()
+        assert core.misses == miss
+    assert core.missed == MAX_MISSES
+    assert core.game_over
+    assert core.game_over_reason == "misses"
+
+
+def test_miss_respawns_block():
+    core = started_core()
+    core.block.state = "miss"
+    core.step()
+    assert not core.game_over
+    assert core.block.state == "ready"
+    assert core.block.angle == 45
+
+
+def test_core_does_not_import_pygame():
+    code = "import sys; import src.core; print('pygame' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,49 @@
+"""Частицы (src/particles.py): поток rng не зависит от уровня качества."""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+
+from src.particles import ParticleSystem
+from src.quality import QUALITY_LEVELS
+
+
+def play(system, spawns=40):
+    for i in range(spawns):
+        if i % 3 == 0:
+            system.add_explosion(200, 300, count=50)
+        else:
+            system.add_build_particles(200, 300, count=30)
+        system.update()
+
+
+def test_rng_stream_is_the_same_on_every_quality_level():
+    states = []
+    for level in QUALITY_LEVELS:
+        system = ParticleSystem(seed=7)
+        system.set_quality(level.particle_cap, level.particle_scale)
+        play(system)
+        states.append(system.rng.bit_generator.state)
+    assert all(state == states[0] for state in states)
+
+
+def test_low_quality_keeps_a_prefix_of_the_full_burst():
+    full = ParticleSystem(seed=3)
+    low = ParticleSystem(seed=3)
+    low.set_quality(120, 0.25)
+    full.add_build_particles(100, 100, count=40)
+    low.add_build_particles(100, 100, count=40)
+    assert low.count == 10
+    assert np.array_equal(low.vel[:low.count], full.vel[:low.count])
+    assert np.array_equal(low.size[:low.count], full.size[:low.count])
+
+
+def test_full_cap_still_consumes_rng():
+    capped = ParticleSystem(max_particles=10, seed=5)
+    free = ParticleSystem(seed=5)
+    for system in (capped, free):
+        system.add_explosion(0, 0, count=20)
+        system.add_explosion(0, 0, count=20)
+    assert capped.count == 10
+    assert capped.rng.bit_generator.state == free.rng.bit_generator.state
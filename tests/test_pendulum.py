@@ -0,0 +1,23 @@
+"""Векторный маятник (src/pendulum.py) против скалярного BlockCore.swing/drop."""
+import numpy as np
+
+from src import pendulum
+from src.pendulum_reference import X_TOLERANCE, make_inputs, mismatches, scalar_swing_and_drop
+
+
+def test_swing_and_drop_matches_block_core():
+    args = make_inputs(500, seed=1)
+    ref = scalar_swing_and_drop(*args)
+    got = pendulum.swing_and_drop(*args)
+    dx, landed_diff, golden_diff, fall_diff = mismatches(ref, got)
+    assert dx <= X_TOLERANCE
+    assert (landed_diff, golden_diff, fall_diff) == (0, 0, 0)
+    # в наборе есть все исходы — сверка не вырожденная
+    assert ref["landed"].any() and not ref["landed"].all()
+    assert ref["golden"].any()
+
+
+def test_swing_without_steps_is_hook_position():
+    angle = np.array([-45.0, 45.0])
+    _, _, x, y = pendulum.swing(angle, np.zeros(2), np.full(2, -0.0015), 0)
+    assert np.array_equal((x, y), pendulum.hook_position(angle))
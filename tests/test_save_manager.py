@@ -0,0 +1,202 @@
+"""
+Общая папка сохранений из нескольких процессов (SaveManager, backend="json"):
+начисления не теряются, башни объединяются, рекорд — максимум, а общие
+монеты не тратятся дважды.
+"""
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from src.save_manager import SaveManager
+from tools.save_stress import worker
+
+PROCS = 6
+OPS = 200
+
+
+def spend_worker(save_file, attempts, write_behind):
+    """Киоск тратит по монете, пока хватает; возвращает число удачных покупок."""
+    manager = SaveManager(save_file=save_file, write_behind=write_behind, flush_interval=0.01)
+    spent = 0
+    for _ in range(attempts):
+        if manager.spend_coins(1):
+            spent += 1
+        manager.add_game()
+    manager.close()
+    return spent
+
+
+def purchase_worker(save_file, barrier, results, write_behind):
+    """Киоск покупает башню 3, видя её закрытой (как и все остальные киоски)."""
+    manager = SaveManager(save_file=save_file, write_behind=write_behind, flush_interval=0.01)
+    barrier.wait()
+    assert not manager.is_tower_unlocked(3)
+    results.put(manager.purchase_tower(3, 300))
+    manager.close()
+
+
+def read_save(save_file):
+    with open(save_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def save_file(tmp_path):
+    path = os.path.join(tmp_path, "save_data.json")
+    SaveManager(save_file=path, write_behind=False).close()
+    return path
+
+
+@pytest.mark.parametrize("write_behind", [True, False], ids=["write_behind", "sync"])
+def test_add_coins_from_many_processes(save_file, write_behind):
+    with multiprocessing.Pool(PROCS) as pool:
+        pool.starmap(worker, [(save_file, i, OPS, write_behind, 0.01) for i in range(PROCS)])
+
+    data = read_save(save_file)
+    assert data['coins'] == PROCS * OPS
+    assert set(data['unlocked_towers']) == {1} | {i + 2 for i in range(PROCS)}
+    assert data['high_score'] == 100 + PROCS - 1
+
+
+@pytest.mark.parametrize("write_behind", [True, False], ids=["write_behind", "sync"])
+def test_spend_coins_is_not_double_spent(save_file, write_behind):
+    coins = 50
+    manager = SaveManager(save_file=save_file, write_behind=False)
+    manager.add_coins(coins)
+    manager.close()
+
+    attempts = 20
+    with multiprocessing.Pool(PROCS) as pool:
+        spent = pool.starmap(spend_worker, [(save_file, attempts, write_behind)] * PROCS)
+
+    data = read_save(save_file)
+    assert sum(spent) == coins
+    assert data['coins'] == 0
+    assert data['total_games'] == PROCS * attempts
+
+
+def test_refresh_merges_without_writing(save_file):
+    ours = SaveManager(save_file=save_file, write_behind=True, flush_interval=10 ** 6)
+    other = SaveManager(save_file=save_file, write_behind=False)
+    ours.add_coins(3)
+    other.add_coins(10)
+    other.unlock_tower(4)
+    mtime = os.stat(save_file).st_mtime_ns
+
+    assert ours.refresh()
+    assert os.stat(save_file).st_mtime_ns == mtime
+    assert ours.get_coins() == 13
+    assert ours.is_tower_unlocked(4)
+
+    ours.close()
+    other.close()
+    assert read_save(save_file)['coins'] == 13
+
+
+@pytest.mark.parametrize("write_behind", [True, False], ids=["write_behind", "sync"])
+def test_same_tower_is_paid_once(save_file, write_behind):
+    manager = SaveManager(save_file=save_file, write_behind=False)
+    manager.add_coins(1000)
+    manager.close()
+
+    barrier = multiprocessing.Barrier(PROCS)
+    results = multiprocessing.Queue()
+    kiosks = [multiprocessing.Process(target=purchase_worker,
+                                      args=(save_file, barrier, results, write_behind))
+              for _ in range(PROCS)]
+    for kiosk in kiosks:
+        kiosk.start()
+    bought = [results.get(timeout=30) for _ in kiosks]
+    for kiosk in kiosks:
+        kiosk.join()
+        assert kiosk.exitcode == 0
+
+    data = read_save(save_file)
+    assert all(bought)
+    assert data['coins'] == 700
+    assert data['unlocked_towers'].count(3) == 1
+
+
+def test_purchase_is_written_in_one_step(save_file):
+    manager = SaveManager(save_file=save_file, write_behind=True, flush_interval=10 ** 6)
+    manager.add_coins(500)
+    assert not manager.purchase_tower(2, 600)
+    assert manager.purchase_tower(2, 300)
+
+    # фоновая запись ещё не случилась, а покупка уже на диске целиком
+    data = read_save(save_file)
+    assert data['coins'] == 200
+    assert 2 in data['unlocked_towers']
+    assert manager.get_coins() == 200
+    assert manager.is_tower_unlocked(2)
+    manager.close()
+
+
+def test_journal_purchase_survives_reload(tmp_path):
+    save_file = os.path.join(tmp_path, "save_data.json")
+    manager = SaveManager(save_file=save_file, backend="journal", write_behind=False)
+    manager.add_coins(400)
+    assert manager.purchase_tower(5, 300)
+    assert manager.purchase_tower(5, 300)
+    assert not manager.purchase_tower(6, 300)
+
+    reloaded = SaveManager(save_file=save_file, backend="journal", write_behind=False)
+    assert reloaded.get_coins() == 100
+    assert reloaded.is_tower_unlocked(5)
+    manager.close()
+    reloaded.close()
+
+
+def failing_writes(monkeypatch, manager, failures):
+    """Первые failures вызовов _write_file падают с OSError."""
+    write = manager._write_file
+    left = [failures]
+
+    def flaky(text):
+        if left[0]:
+            left[0] -= 1
+            raise OSError("диск недоступен")
+        write(text)
+
+    monkeypatch.setattr(manager, "_write_file", flaky)
+
+
+@pytest.mark.parametrize("write_behind", [True, False], ids=["write_behind", "sync"])
+def test_failed_write_is_retried(save_file, monkeypatch, write_behind):
+    manager = SaveManager(save_file=save_file, write_behind=write_behind, flush_interval=0.01)
+    failing_writes(monkeypatch, manager, 1)
+    manager.add_coins(42)
+
+    assert manager.close()
+    assert manager.stats()["pending"] == 0
+    assert read_save(save_file)['coins'] == 42
+
+
+def test_close_reports_unwritten_changes(save_file, monkeypatch):
+    manager = SaveManager(save_file=save_file, write_behind=True, flush_interval=0.01)
+    failing_writes(monkeypatch, manager, 10 ** 6)
+    manager.add_coins(42)
+
+    assert not manager.flush()
+    assert not manager.close()
+    assert manager.stats()["pending"] == 1
+    assert not os.path.exists(save_file)
+
+
+def test_journal_keeps_records_across_failed_compactions(tmp_path, monkeypatch):
+    save_file = os.path.join(tmp_path, "save_data.json")
+    manager = SaveManager(save_file=save_file, backend="journal", write_behind=False,
+                          compact_records=10 ** 6)
+    failing_writes(monkeypatch, manager, 2)
+    manager.add_coins(5)
+    assert not manager.flush()
+    manager.add_coins(7)
+    assert not manager.flush()
+    manager.add_coins(11)
+
+    # процесс упал, так и не записав снимок: всё восстанавливается из журналов
+    reloaded = SaveManager(save_file=save_file, backend="journal", write_behind=False)
+    assert reloaded.get_coins() == 23
+    reloaded.close()
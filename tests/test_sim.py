@@ -0,0 +1,29 @@
+"""Игроки-автоматы headless-прогона (src/sim.py)."""
+from src.core import GameCore
+from src.sim import FixedPolicy, play_game, run_games
+
+
+def test_fixed_policy_counts_from_block_spawn():
+    policy = FixedPolicy(period=3)
+    core = GameCore()
+    assert [policy.should_drop(core) for _ in range(3)] == [False, False, True]
+
+    core.misses += 1   # промах: респаун того же BlockCore
+    assert [policy.should_drop(core) for _ in range(3)] == [False, False, True]
+
+    core.new_game()    # новая партия посреди ожидания
+    policy.should_drop(core)
+    core.new_game()
+    assert [policy.should_drop(core) for _ in range(3)] == [False, False, True]
+
+
+def test_fixed_policy_is_the_same_every_game():
+    results = run_games("fixed", 5)
+    assert len({(r["score"], r["blocks"], r["steps"]) for r in results}) == 1
+
+
+def test_default_fixed_policy_lands_blocks():
+    # прежний период 50 ставил только нижний блок и проигрывал тремя промахами
+    result = play_game(FixedPolicy())
+    assert result["blocks"] >= 5
+    assert result["golden"] > 0
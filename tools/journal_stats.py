@@ -0,0 +1,98 @@
+"""
+Отчёт по журналу сохранений: размер снимка и журнала, число записей в хвосте,
+время загрузки (снимок + хвост) и время сжатия журнала в снимок.
+Сжатие делается на копии в временной папке — настоящие файлы не меняются.
+
+Запуск из корня репозитория:
+    python -m tools.journal_stats                     # data/save_data.json
+    python -m tools.journal_stats --save-file path.json
+    python -m tools.journal_stats --simulate 5000     # синтетический журнал на N изменений
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from src.constants import DATA_PATH
+from src.save_manager import SaveManager
+
+
+def file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def count_lines(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for _ in f)
+
+
+def measure(save_file):
+    """Размеры файлов и время загрузки/сжатия для копии save_file."""
+    journal_file = os.path.splitext(save_file)[0] + ".journal"
+    report = {
+        "snapshot_bytes": file_size(save_file),
+        "journal_bytes": file_size(journal_file) + file_size(journal_file + ".old"),
+        "journal_records": count_lines(journal_file) + count_lines(journal_file + ".old"),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = os.path.join(tmp, os.path.basename(save_file))
+        for src in (save_file, journal_file, journal_file + ".old"):
+            if os.path.exists(src):
+                shutil.copy(src, os.path.join(tmp, os.path.basename(src)))
+
+        # загрузка сама сжимает хвост журнала: её время и есть снимок + хвост + сжатие
+        start = time.perf_counter()
+        manager = SaveManager(save_file=copy, write_behind=False, backend="journal")
+        report["load_ms"] = (time.perf_counter() - start) * 1000
+        report["replayed"] = manager.replayed
+        report["compact_ms"] = manager.last_compact_ms
+        manager.close()
+    return report
+
+
+def simulate(records):
+    """Синтетика: records изменений журналом против перезаписи JSON на каждое."""
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = SaveManager(save_file=os.path.join(tmp, "journal.json"), write_behind=False,
+                              backend="journal", compact_records=records + 1)
+        start = time.perf_counter()
+        for i in range(records):
+            journal.add_coins(1)
+        append_us = (time.perf_counter() - start) / records * 1e6
+        # бросаем без close(): как после падения, хвост остаётся в журнале
+        journal.journal.close()
+        journal.journal = None
+
+        rewrite = SaveManager(save_file=os.path.join(tmp, "rewrite.json"), write_behind=False)
+        rounds = min(records, 200)
+        start = time.perf_counter()
+        for i in range(rounds):
+            rewrite.add_coins(1)
+        rewrite_us = (time.perf_counter() - start) / rounds * 1e6
+
+        report = measure(os.path.join(tmp, "journal.json"))
+        report["append_us"] = append_us
+        report["rewrite_us"] = rewrite_us
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Размер журнала сохранений и время его сжатия")
+    parser.add_argument("--save-file", default=f"{DATA_PATH}save_data.json")
+    parser.add_argument("--simulate", type=int, metavar="N",
+                        help="измерить на синтетическом журнале из N изменений")
+    args = parser.parse_args(argv)
+
+    report = simulate(args.simulate) if args.simulate else measure(args.save_file)
+    for key, value in report.items():
+        if isinstance(value, float):
+            value = f"{value:.3f}"
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Стресс-проверка общей папки сохранений: N процессов одновременно вызывают
+add_coins (и открывают башни / ставят рекорды), затем итог сверяется:
+монеты — сумма всех начислений, башни — объединение, рекорд — максимум.
+
+Запуск из корня репозитория:
+    python -m tools.save_stress --procs 8 --ops 500
+    python -m tools.save_stress --sync          # без write-behind: запись на каждое изменение
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.save_manager import SaveManager
+
+
+def worker(save_file, index, ops, write_behind, flush_interval):
+    """Один "киоск": ops начислений по 1 монете, одна своя башня и свой рекорд."""
+    manager = SaveManager(save_file=save_file, write_behind=write_behind,
+                          flush_interval=flush_interval)
+    rng = random.Random(index)
+    for i in range(ops):
+        manager.add_coins(1)
+        if i == ops // 2:
+            manager.unlock_tower(index + 2)
+            manager.update_high_score(100 + index)
+        if rng.random() < 0.01:
+            time.sleep(0.001)
+    manager.close()
+    return manager.stats()
+
+
+def run(procs, ops, write_behind, flush_interval):
+    with tempfile.TemporaryDirectory() as tmp:
+        save_file = os.path.join(tmp, "save_data.json")
+        SaveManager(save_file=save_file, write_behind=False).close()
+
+        start = time.perf_counter()
+        with multiprocessing.Pool(procs) as pool:
+            stats = pool.starmap(
+                worker,
+                [(save_file, i, ops, write_behind, flush_interval) for i in range(procs)],
+            )
+        elapsed = time.perf_counter() - start
+
+        with open(save_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    expected_towers = {1} | {i + 2 for i in range(procs)}
+    checks = {
+        "coins": (data['coins'], procs * ops),
+        "unlocked_towers": (set(data['unlocked_towers']), expected_towers),
+        "high_score": (data['high_score'], 100 + procs - 1),
+    }
+    ok = all(got == want for got, want in checks.values())
+
+    print(f"{procs} процессов x {ops} add_coins, write_behind={write_behind}: {elapsed:.2f} с")
+    for name, (got, want) in checks.items():
+        mark = "ok" if got == want else "FAIL"
+        print(f"  {name:>16}: {got} (ожидалось {want}) {mark}")
+    print(f"  {'writes':>16}: {sum(s['writes'] for s in stats)}")
+    print(f"  {'merges':>16}: {sum(s['merges'] for s in stats)}")
+    print(f"  {'max lock hold':>16}: {max(s['lock_hold_ms'] for s in stats):.2f} мс")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Одновременная запись сохранения из нескольких процессов")
+    parser.add_argument("--procs", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("--sync", action="store_true", help="писать на каждое изменение")
+    parser.add_argument("--flush-interval", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    ok = run(args.procs, args.ops, not args.sync, args.flush_interval)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Перебор игровых констант на headless-партиях: сетка или случайный поиск,
+партии раскладываются по всем ядрам (ProcessPoolExecutor).
+
+Каждая конфигурация режется на задачи по --chunk партий, у задачи свой seed
+из (--seed, номер конфигурации, номер задачи), поэтому результат не зависит
+от числа процессов. Строки (одна партия — одна строка) дописываются по мере
+готовности задач в колоночный формат: папка --out, в ней по файлу на колонку
+(сырые numpy-массивы) и columns.json со схемой и списком конфигураций.
+
+Запуск из корня репозитория:
+    python -m tools.sweep --grid INITIAL_FORCE=-0.001,-0.0015,-0.002 --grid COMBO_TIER_1=2,3
+    python -m tools.sweep --random 20 --range FORCE_ACCELERATION=1.005:1.03 --games 500
+    python -m tools.sweep --summary sweep_out     # только сводка по готовой папке
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import src.core
+from src.sim import POLICIES, play_game
+from src.constants import HEADLESS_MAX_GAME_STEPS
+
+
+# константы, которые читает src/core.py (в воркере подменяются на время задачи)
+SWEEP_PARAMS = (
+    "INITIAL_FORCE",
+    "FORCE_ACCELERATION",
+    "COMBO_TIER_1",
+    "COMBO_TIER_2",
+    "COMBO_TIER_3",
+    "SLOWMO_DURATION",
+    "SLOWMO_FACTOR",
+    "SLOWMO_MEGA_DURATION",
+    "SLOWMO_MEGA_FACTOR",
+    "WOBBLE_SPEED",
+    "WOBBLE_LIMIT",
+    "COLLAPSE_THRESHOLD",
+)
+
+REASONS = ("collapse", "misses", "timeout")
+
+RESULT_COLUMNS = (
+    ("config", "int32"),
+    ("job", "int32"),
+    ("game", "int32"),
+    ("score", "int32"),
+    ("blocks", "int32"),
+    ("golden", "int32"),
+    ("max_combo", "int32"),
+    ("misses", "int8"),
+    ("steps", "int32"),
+    ("reason", "uint8"),
+)
+
+SCORE_MARKS = (5, 10, 25, 50, 100)
+
+
+# ---------- КОНФИГУРАЦИИ ----------
+def parse_value(text):
+    value = float(text)
+    return int(value) if value.is_integer() and "." not in text and "e" not in text.lower() else value
+
+
+def parse_assignment(text, sep):
+    name, _, values = text.partition("=")
+    if name not in SWEEP_PARAMS:
+        raise argparse.ArgumentTypeError(f"{name}: можно перебирать только {', '.join(SWEEP_PARAMS)}")
+    return name, [parse_value(v) for v in values.split(sep)]
+
+
+def build_configs(grid, ranges, samples, seed):
+    """Декартово произведение --grid, на каждую точку — samples случайных точек из --range."""
+    names = [name for name, _ in grid]
+    configs = [dict(zip(names, values)) for values in itertools.product(*(v for _, v in grid))]
+    if samples:
+        rng = random.Random(seed)
+        sampled = []
+        for base in configs:
+            for _ in range(samples):
+                config = dict(base)
+                for name, (lo, hi) in ranges:
+                    if isinstance(lo, int) and isinstance(hi, int):
+                        config[name] = rng.randint(lo, hi)
+                    else:
+                        config[name] = rng.uniform(lo, hi)
+                sampled.append(config)
+        configs = sampled
+    return configs
+
+
+def job_seed(base_seed, config_id, job):
+    return (base_seed * 1_000_003 + config_id) * 1_000_003 + job
+
+
+def make_jobs(configs, games, chunk, base_seed, policy, policy_args, max_steps):
+    jobs = []
+    for config_id, params in enumerate(configs):
+        for job, first in enumerate(range(0, games, chunk)):
+            jobs.append((config_id, job, first, min(chunk, games - first), params,
+                         job_seed(base_seed, config_id, job), policy, policy_args, max_steps))
+    return jobs
+
+
+# ---------- ВОРКЕР ----------
+def run_job(args):
+    """Партии одной задачи; константы src.core подменяются и возвращаются обратно."""
+    config_id, job, first, games, params, seed, policy, policy_args, max_steps = args
+    saved = {name: getattr(src.core, name) for name in params}
+    for name, value in params.items():
+        setattr(src.core, name, value)
+    try:
+        rng = random.Random(seed)
+        player = POLICIES[policy](rng=rng, **policy_args)
+        core = src.core.GameCore()
+        columns = {name: [] for name, _ in RESULT_COLUMNS}
+        for game in range(first, first + games):
+            core.new_game()
+            result = play_game(player, core, max_steps)
+            columns["config"].append(config_id)
+            columns["job"].append(job)
+            columns["game"].append(game)
+            columns["reason"].append(REASONS.index(result["reason"]))
+            for name in ("score", "blocks", "golden", "max_combo", "misses", "steps"):
+                columns[name].append(result[name])
+        return columns
+    finally:
+        for name, value in saved.items():
+            setattr(src.core, name, value)
+
+
+# ---------- КОЛОНОЧНЫЙ ВЫВОД ----------
+class ColumnWriter:
+    """Папка с файлом на колонку: новые строки дописываются в конец каждого файла."""
+
+    def __init__(self, path, configs, meta):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        schema = {
+            "columns": dict(RESULT_COLUMNS),
+            "reasons": list(REASONS),
+            "configs": configs,
+            **meta,
+        }
+        with open(os.path.join(path, "columns.json"), "w", encoding="utf-8") as f:
+            json.dump(schema, f, ensure_ascii=False, indent=2)
+        self.files = {name: open(os.path.join(path, f"{name}.bin"), "wb") for name, _ in RESULT_COLUMNS}
+        self.rows = 0
+
+    def append(self, columns):
+        for name, dtype in RESULT_COLUMNS:
+            np.asarray(columns[name], dtype=dtype).tofile(self.files[name])
+        self.rows += len(columns["config"])
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+
+def load_columns(path):
+    """(схема, {колонка: numpy-массив}) из папки ColumnWriter."""
+    with open(os.path.join(path, "columns.json"), "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    columns = {
+        name: np.fromfile(os.path.join(path, f"{name}.bin"), dtype=dtype)
+        for name, dtype in schema["columns"].items()
+    }
+    return schema, columns
+
+
+# ---------- СВОДКА ----------
+def summarize(schema, columns):
+    """Строка на конфигурацию: кривая счёта (квантили и доля партий выше отметок)."""
+    rows = []
+    collapse = schema["reasons"].index("collapse")
+    for config_id, params in enumerate(schema["configs"]):
+        mask = columns["config"] == config_id
+        scores = columns["score"][mask]
+        if scores.size == 0:
+            continue
+        blocks = int(columns["blocks"][mask].sum())
+        rows.append({
+            "config": config_id,
+            "params": params,
+            "games": int(scores.size),
+            "mean": float(scores.mean()),
+            "quantiles": np.percentile(scores, (10, 50, 90)).tolist(),
+            "reach": [float((scores >= mark).mean()) for mark in SCORE_MARKS],
+            "golden_rate": columns["golden"][mask].sum() / blocks if blocks else 0.0,
+            "collapse": float((columns["reason"][mask] == collapse).mean()),
+        })
+    rows.sort(key=lambda r: r["mean"], reverse=True)
+    return rows
+
+
+def format_summary(rows):
+    marks = " ".join(f"{'>=' + str(m):>5}" for m in SCORE_MARKS)
+    lines = [f"{'cfg':>4} {'games':>6} {'mean':>7} {'p10':>5} {'p50':>5} {'p90':>5} "
+             f"{marks} {'gold':>5} {'fall':>5}  params"]
+    for r in rows:
+        p10, p50, p90 = r["quantiles"]
+        reach = " ".join(f"{share:>5.0%}" for share in r["reach"])
+        params = ", ".join(f"{k}={v:.6g}" for k, v in r["params"].items()) or "(по умолчанию)"
+        lines.append(f"{r['config']:>4} {r['games']:>6} {r['mean']:>7.1f} {p10:>5.0f} {p50:>5.0f} "
+                     f"{p90:>5.0f} {reach} {r['golden_rate']:>5.0%} {r['collapse']:>5.0%}  {params}")
+    return "\n".join(lines)
+
+
+# ---------- ЗАПУСК ----------
+def sweep(configs, games, out, policy="noisy", policy_args=None, seed=0, jobs=None,
+          chunk=50, max_steps=HEADLESS_MAX_GAME_STEPS):
+    policy_args = policy_args or {}
+    tasks = make_jobs(configs, games, chunk, seed, policy, policy_args, max_steps)
+    writer = ColumnWriter(out, configs, {
+        "policy": policy, "policy_args": policy_args, "seed": seed,
+        "games": games, "chunk": chunk, "max_steps": max_steps,
+    })
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # map отдаёт результаты по порядку задач — файл одинаковый при любом --jobs
+            for columns in pool.map(run_job, tasks):
+                writer.append(columns)
+    finally:
+        writer.close()
+    return writer.rows, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+                        type=lambda t: parse_assignment(t, ","), help="значения для перебора сеткой")
+    parser.add_argument("--range", action="append", default=[], metavar="NAME=LO:HI", dest="ranges",
+                        type=lambda t: parse_assignment(t, ":"), help="диапазон для --random")
+    parser.add_argument("--random", type=int, default=0, metavar="N",
+                        help="N случайных точек из --range на каждую точку сетки")
+    parser.add_argument("--games", type=int, default=200, help="партий на конфигурацию")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="noisy")
+    parser.add_argument("--period", type=int, help="fixed: шагов до броска")
+    parser.add_argument("--noise", type=float, help="noisy: разброс прицела, px")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="процессов (по умолчанию все ядра)")
+    parser.add_argument("--chunk", type=int, default=50, help="партий в одной задаче")
+    parser.add_argument("--max-steps", type=int, default=HEADLESS_MAX_GAME_STEPS)
+    parser.add_argument("--out", default="sweep_out", help="папка для колонок")
+    parser.add_argument("--summary", metavar="DIR", help="только напечатать сводку по готовой папке")
+    args = parser.parse_args()
+
+    if args.summary:
+        print(format_summary(summarize(*load_columns(args.summary))))
+        return
+
+    for name, values in args.ranges:
+        if len(values) != 2:
+            parser.error(f"--range {name}: нужно LO:HI")
+    if args.ranges and not args.random:
+        parser.error("--range работает только вместе с --random N")
+
+    policy_args = {}
+    if args.policy == "fixed" and args.period is not None:
+        policy_args["period"] = args.period
+    if args.policy == "noisy" and args.noise is not None:
+        policy_args["sigma"] = args.noise
+
+    configs = build_configs(args.grid, args.ranges, args.random, args.seed)
+    rows, elapsed = sweep(configs, args.games, args.out, args.policy, policy_args,
+                          args.seed, args.jobs, args.chunk, args.max_steps)
+
+    print(f"{len(configs)} конфигураций, {rows} партий за {elapsed:.1f} с "
+          f"({rows / elapsed:.0f} партий/с, процессов: {args.jobs}) -> {args.out}/")
+    print(format_summary(summarize(*load_columns(args.out))))
+
+
+if __name__ == "__main__":
+    main()